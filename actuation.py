@@ -0,0 +1,402 @@
+"""
+actuation.py - Fila de atuação do mouse/teclado 🖱️
+--------------------------------------------------
+As ações de GESTURE_ACTIONS não chamam mais o pyautogui direto no
+pipeline: viram eventos numa fila consumida por uma thread própria.
+
+  - movimentos consecutivos são fundidos (só o alvo mais recente é aplicado)
+  - click / arrastar / scroll / teclas / atalhos mantêm a ordem de chegada
+  - `stats()` expõe profundidade da fila e latência de atuação
+
+Backends (ACTUATION_BACKEND / --backend):
+  pyautogui -> padrão, multiplataforma (PAUSE zerado)
+  x11       -> XTest direto via python-xlib (Linux/X11)
+  uinput    -> /dev/uinput via python-evdev (Linux, inclusive Wayland)
+  null      -> não mexe no mouse, só grava os eventos (testes/benchmark)
+"""
+
+import string
+import threading
+import time
+from collections import Counter, deque
+
+from config import ACTUATION_BACKEND, MOVE_DURATION
+from metrics import REGISTRY
+
+
+# === BACKENDS ===
+class PyAutoGUIBackend:
+    def __init__(self, move_duration=MOVE_DURATION):
+        import pyautogui
+
+        # PAUSE padrão (0.1s) dorme depois de *cada* chamada
+        pyautogui.PAUSE = 0
+        self.pg = pyautogui
+        self.move_duration = move_duration
+
+    def size(self):
+        return self.pg.size()
+
+    def move(self, x, y):
+        self.pg.moveTo(x, y, duration=self.move_duration)
+
+    def down(self, button):
+        self.pg.mouseDown(button=button)
+
+    def up(self, button):
+        self.pg.mouseUp(button=button)
+
+    def click(self, button, clicks=1):
+        self.pg.click(button=button, clicks=clicks)
+
+    def scroll(self, dy):
+        self.pg.scroll(dy)
+
+    def press(self, key):
+        self.pg.press(key)
+
+    def hotkey(self, *keys):
+        self.pg.hotkey(*keys)
+
+
+class X11Backend:
+    """Injeta eventos pela extensão XTest (requer python-xlib)."""
+
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    KEYS = {
+        "win": "Super_L", "shift": "Shift_L", "ctrl": "Control_L", "alt": "Alt_L",
+        "left": "Left", "right": "Right", "up": "Up", "down": "Down", "tab": "Tab",
+    }
+
+    def __init__(self):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self.X, self.XK, self.xtest = X, XK, xtest
+        self.display = display.Display()
+        self.screen = self.display.screen()
+
+    def size(self):
+        return self.screen.width_in_pixels, self.screen.height_in_pixels
+
+    def _button(self, button, event):
+        self.xtest.fake_input(self.display, event, self.BUTTONS[button])
+
+    def move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=int(x), y=int(y))
+        self.display.flush()
+
+    def down(self, button):
+        self._button(button, self.X.ButtonPress)
+        self.display.flush()
+
+    def up(self, button):
+        self._button(button, self.X.ButtonRelease)
+        self.display.flush()
+
+    def click(self, button, clicks=1):
+        for _ in range(clicks):
+            self._button(button, self.X.ButtonPress)
+            self._button(button, self.X.ButtonRelease)
+        self.display.flush()
+
+    def scroll(self, dy):
+        # botões 4/5 = roda para cima/baixo
+        button = 4 if dy > 0 else 5
+        for _ in range(abs(int(dy))):
+            self.xtest.fake_input(self.display, self.X.ButtonPress, button)
+            self.xtest.fake_input(self.display, self.X.ButtonRelease, button)
+        self.display.flush()
+
+    def _keycode(self, key):
+        return self.display.keysym_to_keycode(self.XK.string_to_keysym(self.KEYS.get(key, key)))
+
+    def press(self, key):
+        self.hotkey(key)
+
+    def hotkey(self, *keys):
+        # pressiona na ordem e solta na ordem inversa (ex.: win+shift+left)
+        codes = [self._keycode(k) for k in keys]
+        for code in codes:
+            self.xtest.fake_input(self.display, self.X.KeyPress, code)
+        for code in reversed(codes):
+            self.xtest.fake_input(self.display, self.X.KeyRelease, code)
+        self.display.flush()
+
+
+class UinputBackend:
+    """Dispositivo virtual em /dev/uinput (requer python-evdev e permissão)."""
+
+    def __init__(self, screen_size=(1920, 1080)):
+        from evdev import AbsInfo, UInput, ecodes
+
+        self.e = ecodes
+        self._size = screen_size
+        w, h = screen_size
+        self.KEYS = {
+            "win": ecodes.KEY_LEFTMETA, "shift": ecodes.KEY_LEFTSHIFT, "ctrl": ecodes.KEY_LEFTCTRL,
+            "alt": ecodes.KEY_LEFTALT, "left": ecodes.KEY_LEFT, "right": ecodes.KEY_RIGHT,
+            "up": ecodes.KEY_UP, "down": ecodes.KEY_DOWN, "tab": ecodes.KEY_TAB,
+        }
+        self.KEYS.update({c: getattr(ecodes, f"KEY_{c.upper()}") for c in string.ascii_lowercase})
+        caps = {
+            ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE, *self.KEYS.values()],
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(0, 0, w - 1, 0, 0, 0)),
+                (ecodes.ABS_Y, AbsInfo(0, 0, h - 1, 0, 0, 0)),
+            ],
+            ecodes.EV_REL: [ecodes.REL_WHEEL],
+        }
+        self.ui = UInput(caps, name="gesture-mouse-controller")
+        self.BUTTONS = {"left": ecodes.BTN_LEFT, "middle": ecodes.BTN_MIDDLE, "right": ecodes.BTN_RIGHT}
+
+    def size(self):
+        return self._size
+
+    def move(self, x, y):
+        self.ui.write(self.e.EV_ABS, self.e.ABS_X, int(x))
+        self.ui.write(self.e.EV_ABS, self.e.ABS_Y, int(y))
+        self.ui.syn()
+
+    def _key(self, code, value):
+        self.ui.write(self.e.EV_KEY, code, value)
+        self.ui.syn()
+
+    def down(self, button):
+        self._key(self.BUTTONS[button], 1)
+
+    def up(self, button):
+        self._key(self.BUTTONS[button], 0)
+
+    def click(self, button, clicks=1):
+        for _ in range(clicks):
+            self._key(self.BUTTONS[button], 1)
+            self._key(self.BUTTONS[button], 0)
+
+    def scroll(self, dy):
+        self.ui.write(self.e.EV_REL, self.e.REL_WHEEL, int(dy))
+        self.ui.syn()
+
+    def press(self, key):
+        self.hotkey(key)
+
+    def hotkey(self, *keys):
+        for key in keys:
+            self._key(self.KEYS[key], 1)
+        for key in reversed(keys):
+            self._key(self.KEYS[key], 0)
+
+
+class NullBackend:
+    """Não mexe no mouse: grava os eventos e conta por tipo."""
+
+    def __init__(self, screen_size=(1920, 1080), keep=True):
+        self._size = screen_size
+        self.keep = keep
+        self.events = []
+        self.counts = Counter()
+
+    def size(self):
+        return self._size
+
+    def _record(self, kind, *args):
+        self.counts[kind] += 1
+        if self.keep:
+            self.events.append((kind,) + args)
+
+    def move(self, x, y):
+        self._record("move", x, y)
+
+    def down(self, button):
+        self._record("down", button)
+
+    def up(self, button):
+        self._record("up", button)
+
+    def click(self, button, clicks=1):
+        self._record("click", button, clicks)
+
+    def scroll(self, dy):
+        self._record("scroll", dy)
+
+    def press(self, key):
+        self._record("press", key)
+
+    def hotkey(self, *keys):
+        self._record("hotkey", *keys)
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "x11": X11Backend,
+    "uinput": UinputBackend,
+    "null": NullBackend,
+}
+
+
+def create_backend(name=ACTUATION_BACKEND, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Backend inválido: {name} (use {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+# === FILA DE ATUAÇÃO ===
+class Actuator:
+    """
+    Consome eventos (tipo, args, t_submit) numa thread própria. Com
+    `threaded=False` aplica tudo na hora (replay/benchmark).
+    """
+
+    def __init__(self, backend, threaded=True, latency_window=256):
+        self.backend = backend
+        self.threaded = threaded
+        self._events = deque()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self.error = None
+
+        # contadores
+        self.submitted = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.max_depth = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    def start(self):
+        if self.threaded and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="actuation", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, kind, *args):
+        event = (kind, args, time.perf_counter())
+        self.submitted += 1
+        if not self.threaded:
+            self._apply(event)
+            return
+        with self._cond:
+            # move seguido de move: só o alvo mais novo importa
+            if kind == "move" and self._events and self._events[-1][0] == "move":
+                self._events[-1] = event
+                self.coalesced += 1
+            else:
+                self._events.append(event)
+            self.max_depth = max(self.max_depth, len(self._events))
+            self._cond.notify()
+
+    def move(self, x, y):
+        self.submit("move", x, y)
+
+    def _apply(self, event):
+        kind, args, t_submit = event
+        try:
+            getattr(self.backend, kind)(*args)
+        except Exception as e:
+            self.failed += 1
+            # o fail-safe do pyautogui (mouse no canto) deve encerrar o programa
+            if type(e).__name__ == "FailSafeException":
+                self.error = e
+        self.applied += 1
+        latency = time.perf_counter() - t_submit
+        self._latencies.append(latency)
+        REGISTRY.observe("actuation", latency)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events and not self._stop:
+                    self._cond.wait()
+                if not self._events:
+                    return   # parada: só depois de esvaziar a fila (um "up" pendente não fica preso)
+                event = self._events.popleft()
+            self._apply(event)
+
+    @property
+    def depth(self):
+        return len(self._events)
+
+    def stats(self):
+        lat = sorted(self._latencies) or [0.0]
+        p50 = lat[len(lat) // 2] * 1000
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "latency_p50_ms": p50,
+            "latency_p95_ms": p95,
+        }
+
+
+# Mapeamento de gestos -> ações (padrões)
+# Você pode alterar: 'five_open' por qualquer função que enfileire eventos no actuator
+def default_gesture_actions(actuator):
+    return {
+        "move": actuator.move,
+        "pinch_left": lambda: actuator.submit("down", "left"),              # começar arrastar / clicar
+        "pinch_left_up": lambda: actuator.submit("up", "left"),             # soltar arrastar
+        "pinch_left_click": lambda: actuator.submit("click", "left"),       # click simples
+        "pinch_left_double": lambda: actuator.submit("click", "left", 2),   # duplo click
+        "pinch_right_click": lambda: actuator.submit("click", "right"),
+        "three_fingers": lambda: actuator.submit("click", "middle"),
+        "five_open": lambda: actuator.submit("press", "win"),               # abrir menu iniciar no Windows
+        "scroll": lambda dx, dy: actuator.submit("scroll", int(dy)),       # dy positivo = scroll up
+        # gestos dinâmicos (trajectory.py); atalhos do Windows
+        "swipe_left": lambda: actuator.submit("hotkey", "win", "shift", "left"),    # janela p/ monitor da esquerda
+        "swipe_right": lambda: actuator.submit("hotkey", "win", "shift", "right"),  # janela p/ monitor da direita
+        "swipe_up": lambda: actuator.submit("hotkey", "win", "up"),                 # maximizar
+        "swipe_down": lambda: actuator.submit("hotkey", "win", "down"),             # restaurar/minimizar
+        "circle_cw": lambda: actuator.submit("hotkey", "alt", "tab"),               # alternar janela
+        "circle_ccw": lambda: actuator.submit("hotkey", "win", "d"),                # mostrar área de trabalho
+    }
+
+
+def left_hand_actions(actuator):
+    """Ações da mão esquerda com --hands 2 (hands.HAND_ROLES): atalhos, sem cursor."""
+    def noop(*args):
+        pass
+
+    return {
+        "move": noop,                                                           # cursor fica com a direita
+        "pinch_left": lambda: actuator.submit("hotkey", "alt", "left"),         # voltar
+        "pinch_left_up": noop,
+        "pinch_left_double": lambda: actuator.submit("hotkey", "alt", "left"),
+        "pinch_right_click": lambda: actuator.submit("hotkey", "ctrl", "c"),    # copiar
+        "three_fingers": lambda: actuator.submit("hotkey", "ctrl", "v"),        # colar
+        "five_open": lambda: actuator.submit("hotkey", "win", "tab"),           # visão de tarefas
+        "scroll": lambda dx, dy: actuator.submit("scroll", int(dy)),
+        "swipe_left": lambda: actuator.submit("hotkey", "ctrl", "shift", "tab"),  # aba anterior
+        "swipe_right": lambda: actuator.submit("hotkey", "ctrl", "tab"),          # próxima aba
+    }
+
+
+def launcher_actions(gesture_commands):
+    """
+    Gesto -> comando do serviço de lançamento (commands.py, GESTURE_COMMANDS).
+    A ida ao socket roda numa thread: o estágio de gestos não espera.
+    """
+    from commands import run_command
+
+    def action(command):
+        return lambda *args: threading.Thread(target=run_command, args=(command,), daemon=True).start()
+
+    return {gesture: action(command) for gesture, command in gesture_commands.items()}
+
+
+def null_gesture_actions(screen_size=(1920, 1080)):
+    """GESTURE_ACTIONS síncrono sobre NullBackend. Retorna (actions, backend)."""
+    backend = NullBackend(screen_size, keep=False)
+    return default_gesture_actions(Actuator(backend, threaded=False)), backend
@@ -0,0 +1,222 @@
+"""
+bench.py - Benchmark offline do pipeline de gestos ⏱️
+----------------------------------------------------
+Roda a lógica de gestos sobre uma gravação de landmarks (recorder.py)
+ou sobre um vídeo passado pelo detector, com atuação no-op, e reporta
+frames/s e latência p50/p95/p99 por estágio.
+
+Uso:
+  python bench.py gravacao.npy
+  python bench.py gravacao.npy --filters average,one_euro,kalman [--lead 40]
+  python bench.py --video mao.mp4 [--mode video]
+  python bench.py --dtw 48   # reconhecedor de trajetórias: matches/s com 48 templates
+  python main.py --record gravacao.npy   # para gravar
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from actuation import null_gesture_actions
+from calibration import CalibrationMap
+from config import RUNNING_MODE
+from features import HandFeatures, INDEX
+from filters import FILTERS, create_filter
+from gestures import GestureController
+from recorder import replay_landmarks, replay_video
+from trajectory import TemplateLibrary, builtin_templates, dtw_distance, normalize
+
+SCREEN_SIZE = (1920, 1080)
+
+
+class StageTimer:
+    """Acumula durações (s) por estágio."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def add(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def summary(self):
+        out = {}
+        for stage, values in self.samples.items():
+            arr = np.asarray(values) * 1000
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+            out[stage] = {
+                "n": len(arr),
+                "fps": 1000.0 / arr.mean() if arr.mean() > 0 else float("inf"),
+                "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+            }
+        return out
+
+    def report(self, title="Benchmark"):
+        print(f"📊 {title}")
+        print(f"{'estágio':<12}{'frames':>8}{'fps':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, s in self.summary().items():
+            print(f"{stage:<12}{s['n']:>8}{s['fps']:>12.1f}{s['p50_ms']:>10.3f}"
+                  f"{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+
+
+def run(frames, timer, actions=None):
+    """Alimenta o GestureController com (t, w, h, hands) e mede o estágio de gestos."""
+    actions = null_gesture_actions(SCREEN_SIZE)[0] if actions is None else actions
+    controller = GestureController(actions, SCREEN_SIZE, calibration=CalibrationMap([(0, 0, *SCREEN_SIZE)]))
+    n = 0
+    t_start = time.perf_counter()
+    for t, w, h, hands in frames:
+        t0 = time.perf_counter()
+        controller.update(hands, w, h, t)
+        timer.add("gesture", time.perf_counter() - t0)
+        n += 1
+    elapsed = time.perf_counter() - t_start
+    return n, elapsed, controller
+
+
+def filter_report(path, names, lead=0.0):
+    """
+    Compara filtros do cursor sobre a ponta do indicador gravada:
+    lag = distância média (px) entre saída e posição bruta;
+    jitter = RMS (px) da segunda diferença da saída (tremor frame a frame).
+    """
+    features = HandFeatures()
+    mapper = GestureController(null_gesture_actions(SCREEN_SIZE)[0], SCREEN_SIZE,
+                               calibration=CalibrationMap([(0, 0, *SCREEN_SIZE)]))
+    raw, ts = [], []
+    for t, w, h, hands in replay_landmarks(path):
+        if not hands:
+            continue
+        f = features.compute(hands[0], w, h)
+        raw.append(mapper.map_to_screen(*f.tip_px(INDEX), w, h))
+        ts.append(t)
+    if len(raw) < 3:
+        print("⚠️ Poucos frames com mão para comparar filtros.")
+        return {}
+
+    raw = np.asarray(raw, dtype=np.float64)
+
+    def jitter(xy):
+        return float(np.sqrt(np.mean(np.sum(np.diff(xy, 2, axis=0) ** 2, axis=1))))
+
+    out = {"raw": {"lag_px": 0.0, "jitter_px": jitter(raw), "us_per_frame": 0.0}}
+    for name in names:
+        flt = create_filter(name)
+        t0 = time.perf_counter()
+        smooth = np.asarray([flt.update(x, y, t, lead) for (x, y), t in zip(raw, ts)])
+        us = (time.perf_counter() - t0) / len(raw) * 1e6
+        lag = float(np.mean(np.linalg.norm(smooth - raw, axis=1)))
+        out[name] = {"lag_px": lag, "jitter_px": jitter(smooth), "us_per_frame": us}
+
+    print(f"🎚️ Filtros ({len(raw)} frames, lead={lead * 1000:.0f}ms)")
+    print(f"{'filtro':<12}{'lag px':>10}{'jitter px':>12}{'µs/frame':>10}")
+    for name, s in out.items():
+        print(f"{name:<12}{s['lag_px']:>10.2f}{s['jitter_px']:>12.2f}{s['us_per_frame']:>10.2f}")
+    return out
+
+
+def dtw_report(n_templates, n_queries=300, seed=0):
+    """
+    Matches/s do TemplateLibrary com `n_templates` (variações ruidosas dos
+    sintéticos), comparando LB_Keogh + early abandoning com o DTW completo.
+    Queries: gestos conhecidos distorcidos no tempo + passeios aleatórios
+    (devem ser rejeitados).
+    """
+    rng = np.random.default_rng(seed)
+    base = builtin_templates()
+    names = list(base)
+    lib = TemplateLibrary()
+    for i in range(n_templates):
+        name = names[i % len(names)]
+        lib.add(name, base[name] + rng.normal(0, 0.02, base[name].shape) * (i >= len(names)))
+
+    queries = []
+    for _ in range(n_queries):
+        if rng.random() < 0.8:
+            name = names[rng.integers(len(names))]
+            warp = np.sort(rng.random(rng.integers(20, 60))) ** rng.uniform(0.7, 1.4)
+            src = np.linspace(0, 1, len(base[name]))
+            pts = np.column_stack([np.interp(warp, src, base[name][:, k]) for k in range(2)])
+            pts += rng.normal(0, 0.02, pts.shape)
+        else:
+            name, pts = None, np.cumsum(rng.normal(0, 1, (40, 2)), axis=0)
+        queries.append((name, normalize(pts, lib.points)[0]))
+
+    totals = {"pruned": 0, "abandoned": 0, "full": 0}
+    correct = 0
+    t0 = time.perf_counter()
+    for name, q in queries:
+        got, _, stats = lib.match(q)
+        correct += got == name
+        for k, v in stats.items():
+            totals[k] += v
+    pruned_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _, q in queries:
+        min(dtw_distance(q, c, lib.r) for c in lib.templates)
+    brute_s = time.perf_counter() - t0
+
+    comparisons = n_queries * len(lib)
+    print(f"〰️ DTW: {len(lib)} templates x {n_queries} queries ({lib.points} pontos, banda {lib.r})")
+    print(f"   LB_Keogh + abandono: {n_queries / pruned_s:>9.0f} matches/s "
+          f"({pruned_s / n_queries * 1000:.3f} ms/match)")
+    print(f"   DTW completo:        {n_queries / brute_s:>9.0f} matches/s "
+          f"({brute_s / n_queries * 1000:.3f} ms/match)")
+    print(f"   descartados por LB: {totals['pruned'] / comparisons:.0%}  "
+          f"abandonados: {totals['abandoned'] / comparisons:.0%}  "
+          f"DTW até o fim: {totals['full'] / comparisons:.0%}")
+    print(f"   acerto: {correct / n_queries:.0%}")
+    return {"matches_per_s": n_queries / pruned_s, "brute_matches_per_s": n_queries / brute_s,
+            "accuracy": correct / n_queries, **totals}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do controlador de gestos")
+    parser.add_argument("recording", nargs="?", help="gravação .npy de landmarks")
+    parser.add_argument("--video", help="arquivo de vídeo para passar pelo detector")
+    parser.add_argument("--mode", default=RUNNING_MODE, help="modo do detector para --video")
+    parser.add_argument("--no-roi", dest="roi", action="store_false", help="desliga o recorte da mão (--video)")
+    parser.add_argument("--repeat", type=int, default=1, help="repetir a gravação N vezes")
+    parser.add_argument("--filters", help=f"compara filtros do cursor ({','.join(FILTERS)})")
+    parser.add_argument("--lead", type=float, default=0.0, help="extrapolação dos filtros (ms)")
+    parser.add_argument("--dtw", type=int, metavar="N", help="benchmark do DTW com N templates")
+    args = parser.parse_args(argv)
+
+    if args.dtw:
+        dtw_report(args.dtw)
+        return
+
+    if not args.recording and not args.video:
+        parser.error("informe uma gravação .npy ou --video")
+
+    if args.filters:
+        if not args.recording:
+            parser.error("--filters precisa de uma gravação .npy")
+        filter_report(args.recording, args.filters.split(","), args.lead / 1000.0)
+        return
+
+    timer = StageTimer()
+    actions, backend = null_gesture_actions(SCREEN_SIZE)
+    total, elapsed = 0, 0.0
+    for _ in range(args.repeat):
+        if args.video:
+            # mediapipe só é necessário para vídeo; replay de .npy roda sem ele
+            from detector import HandDetector
+
+            detector = HandDetector(mode=args.mode if args.mode != "live_stream" else "video", roi=args.roi)
+            frames = replay_video(args.video, detector, timer)
+        else:
+            frames = replay_landmarks(args.recording)
+        n, dt, _ = run(frames, timer, actions)
+        total += n
+        elapsed += dt
+
+    timer.report(args.video or args.recording)
+    print(f"\n🏁 {total} frames em {elapsed:.2f}s -> {total / elapsed if elapsed else 0:.1f} fps fim a fim")
+    print(f"🖱️ Eventos de atuação: {dict(backend.counts)}")
+
+
+if __name__ == "__main__":
+    main()
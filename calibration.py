@@ -0,0 +1,255 @@
+"""
+calibration.py - Calibração câmera -> área de trabalho 🎯
+--------------------------------------------------------
+O cursor é mapeado do ponto da mão (coordenadas normalizadas do frame)
+para a área de trabalho virtual inteira — todos os monitores, inclusive
+com origem negativa ou tamanhos diferentes.
+
+Calibração (tecla c / comando recalibrate): o cursor vai para cada canto
+de cada monitor e o usuário aponta o indicador para lá e segura parado
+por CALIB_DWELL s. Com os pontos é ajustada uma homografia
+(cv2.findHomography), e a partir dela uma LUT densa (CALIB_LUT_SIZE²)
+já com:
+  - zona morta nas bordas (CALIB_DEAD_ZONE): a borda da tela é alcançada
+    um pouco antes do ponto calibrado, sem esticar a mão até o limite;
+  - pontos que caem fora de qualquer monitor (vãos entre telas de
+    tamanhos diferentes) presos ao monitor mais próximo.
+
+Por frame o mapeamento é só uma consulta bilinear na LUT. Homografia,
+monitores e LUT ficam em CALIB_PATH (.npz); ao iniciar, se os monitores
+forem os mesmos, a calibração é reaproveitada.
+
+  python calibration.py          # monitores detectados e calibração salva
+  python calibration.py --reset  # apaga a calibração
+"""
+
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+from config import CALIB_PATH, CALIB_LUT_SIZE, CALIB_DEAD_ZONE, CALIB_DWELL, CALIB_STILL, CALIB_INSET, MONITORS
+
+CORNERS = ("superior esquerdo", "superior direito", "inferior direito", "inferior esquerdo")
+
+
+def desktop_monitors(fallback_size=(1920, 1080)):
+    """
+    Monitores (x, y, w, h) da área de trabalho virtual: MONITORS do
+    config, senão `screeninfo` (se instalado), senão uma tela do tamanho
+    informado pelo backend de atuação.
+    """
+    if MONITORS:
+        return [tuple(m) for m in MONITORS]
+    try:
+        from screeninfo import get_monitors
+    except ImportError:
+        pass
+    else:
+        try:
+            found = [(m.x, m.y, m.width, m.height) for m in get_monitors()]
+        except Exception:
+            found = []
+        if found:
+            return sorted(found)
+    return [(0, 0, int(fallback_size[0]), int(fallback_size[1]))]
+
+
+def monitor_corners(monitors, inset=CALIB_INSET):
+    """
+    Cantos de cada monitor (px da área de trabalho), na ordem de CORNERS,
+    `inset` px para dentro: o cursor no canto exato dispara o fail-safe
+    do pyautogui (FailSafeException) no meio da calibração.
+    """
+    pts = []
+    for x, y, w, h in monitors:
+        x0, y0, x1, y1 = x + inset, y + inset, x + w - 1 - inset, y + h - 1 - inset
+        pts += [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    return np.asarray(pts, dtype=np.float64)
+
+
+def fit_homography(camera_pts, desktop_pts, monitors, dead_zone=CALIB_DEAD_ZONE):
+    """
+    Homografia câmera (0-1) -> área de trabalho (px). Os alvos são
+    afastados do centro da área de trabalho por `dead_zone` para que a
+    borda seja atingida antes do ponto calibrado.
+    """
+    x0, y0, x1, y1 = bounds(monitors)
+    center = np.array([(x0 + x1) / 2, (y0 + y1) / 2])
+    targets = center + (np.asarray(desktop_pts, dtype=np.float64) - center) * (1.0 + 2.0 * dead_zone)
+    H, _ = cv2.findHomography(np.asarray(camera_pts, dtype=np.float64), targets, 0)
+    if H is None or not np.all(np.isfinite(H)) or abs(np.linalg.det(H)) < 1e-12:
+        raise ValueError("pontos de calibração degenerados (mão parada no mesmo lugar?)")
+    return H
+
+
+def bounds(monitors):
+    """Retângulo (x0, y0, x1, y1) que envolve todos os monitores (x1/y1 inclusivos)."""
+    m = np.asarray(monitors, dtype=np.float64)
+    return m[:, 0].min(), m[:, 1].min(), (m[:, 0] + m[:, 2]).max() - 1, (m[:, 1] + m[:, 3]).max() - 1
+
+
+def snap_to_monitors(points, monitors):
+    """Prende cada ponto (N, 2) ao monitor mais próximo (vetorizado)."""
+    m = np.asarray(monitors, dtype=np.float64)
+    lo, hi = m[:, :2], m[:, :2] + m[:, 2:] - 1                             # (M, 2)
+    clamped = np.clip(points[:, None, :], lo[None], hi[None])              # (N, M, 2)
+    d = ((clamped - points[:, None, :]) ** 2).sum(axis=-1)                 # (N, M)
+    return clamped[np.arange(len(points)), d.argmin(axis=1)]
+
+
+def build_lut(H, monitors, size=CALIB_LUT_SIZE):
+    """LUT (size, size, 2) float32: célula (i, j) = ponto da tela para (x, y) = (j, i) / (size - 1)."""
+    g = np.linspace(0.0, 1.0, size)
+    grid = np.stack(np.meshgrid(g, g), axis=-1).reshape(-1, 1, 2)
+    pts = cv2.perspectiveTransform(grid, H).reshape(-1, 2)
+    return snap_to_monitors(pts, monitors).reshape(size, size, 2).astype(np.float32)
+
+
+class CalibrationMap:
+    """Mapeamento câmera (0-1) -> área de trabalho (px) por LUT pré-calculada."""
+
+    def __init__(self, monitors, H=None, lut=None, lut_size=CALIB_LUT_SIZE, calibrated=False):
+        self.monitors = [tuple(int(v) for v in m) for m in monitors]
+        self.x0, self.y0, self.x1, self.y1 = bounds(self.monitors)
+        if H is None:
+            # sem calibração: frame inteiro -> retângulo da área de trabalho
+            H = cv2.getPerspectiveTransform(
+                np.float32([(0, 0), (1, 0), (1, 1), (0, 1)]),
+                np.float32([(self.x0, self.y0), (self.x1, self.y0), (self.x1, self.y1), (self.x0, self.y1)]))
+        self.H = np.asarray(H, dtype=np.float64)
+        self.calibrated = calibrated
+        self.lut = build_lut(self.H, self.monitors, lut_size) if lut is None else lut
+        self._last = len(self.lut) - 1
+        self._rows = self.lut.tolist()   # floats Python: consulta escalar sem overhead do NumPy
+        # centro (na câmera) da área calibrada: a sensibilidade amplia em volta dele
+        c = cv2.perspectiveTransform(
+            np.array([[[(self.x0 + self.x1) / 2, (self.y0 + self.y1) / 2]]]), np.linalg.inv(self.H))
+        self.center = (float(c[0, 0, 0]), float(c[0, 0, 1]))
+
+    @classmethod
+    def fit(cls, camera_pts, monitors, dead_zone=CALIB_DEAD_ZONE, lut_size=CALIB_LUT_SIZE, targets=None):
+        """Ajusta a partir dos pontos capturados sobre `targets` (padrão: monitor_corners)."""
+        targets = monitor_corners(monitors) if targets is None else targets
+        H = fit_homography(camera_pts, targets, monitors, dead_zone)
+        return cls(monitors, H, lut_size=lut_size, calibrated=True)
+
+    def save(self, path=CALIB_PATH):
+        np.savez(path, H=self.H, monitors=np.asarray(self.monitors), lut=self.lut)
+
+    @classmethod
+    def load(cls, path=CALIB_PATH, monitors=None, lut_size=CALIB_LUT_SIZE):
+        """
+        Calibração salva, se foi feita para os mesmos monitores; senão o
+        mapeamento padrão (frame inteiro -> área de trabalho).
+        """
+        monitors = desktop_monitors() if monitors is None else monitors
+        if path and os.path.exists(path):
+            data = np.load(path)
+            saved = [tuple(int(v) for v in m) for m in data["monitors"]]
+            if saved == [tuple(int(v) for v in m) for m in monitors]:
+                lut = data["lut"] if data["lut"].shape[0] == lut_size else None
+                return cls(saved, data["H"], lut, lut_size, calibrated=True)
+            print(f"⚠️ Monitores mudaram desde a calibração ({path}) — pressione 'c' para recalibrar.")
+        return cls(monitors, lut_size=lut_size)
+
+    def map(self, x, y, gain=1.0):
+        """Ponto normalizado da câmera -> (x, y) na área de trabalho (bilinear na LUT)."""
+        if gain != 1.0:
+            cx, cy = self.center
+            x, y = cx + (x - cx) * gain, cy + (y - cy) * gain
+        n = self._last
+        fx = min(max(x * n, 0.0), n)
+        fy = min(max(y * n, 0.0), n)
+        i, j = min(int(fy), n - 1), min(int(fx), n - 1)
+        ty, tx = fy - i, fx - j
+        r0, r1 = self._rows[i], self._rows[i + 1]
+        a, b, c, d = r0[j], r0[j + 1], r1[j], r1[j + 1]
+        top_x = a[0] + (b[0] - a[0]) * tx
+        top_y = a[1] + (b[1] - a[1]) * tx
+        bot_x = c[0] + (d[0] - c[0]) * tx
+        bot_y = c[1] + (d[1] - c[1]) * tx
+        return top_x + (bot_x - top_x) * ty, top_y + (bot_y - top_y) * ty
+
+    def clamp(self, x, y):
+        return min(max(x, self.x0), self.x1), min(max(y, self.y0), self.y1)
+
+
+class Calibrator:
+    """
+    Rotina interativa: um alvo por canto de monitor; o ponto é capturado
+    quando o indicador fica parado (CALIB_STILL) por CALIB_DWELL s.
+    """
+
+    def __init__(self, monitors, dwell=CALIB_DWELL, still=CALIB_STILL):
+        self.monitors = monitors
+        self.targets = monitor_corners(monitors)
+        self.dwell = dwell
+        self.still = still
+        self.points = []
+        self._anchor = None
+        self._since = 0.0
+        self._samples = []
+
+    @property
+    def done(self):
+        return len(self.points) == len(self.targets)
+
+    @property
+    def target(self):
+        """Alvo atual (px da área de trabalho)."""
+        return tuple(self.targets[len(self.points)])
+
+    def describe(self):
+        k = len(self.points)
+        monitor = f" do monitor {k // 4 + 1}" if len(self.monitors) > 1 else ""
+        return f"{k + 1}/{len(self.targets)}: canto {CORNERS[k % 4]}{monitor}"
+
+    def progress(self, now):
+        return 0.0 if self._anchor is None else min((now - self._since) / self.dwell, 1.0)
+
+    def step(self, x, y, now):
+        """Ponto normalizado do indicador. Retorna True quando um canto é capturado."""
+        if self._anchor is None or np.hypot(x - self._anchor[0], y - self._anchor[1]) > self.still:
+            self._anchor, self._since, self._samples = (x, y), now, []
+        self._samples.append((x, y))
+        if now - self._since < self.dwell:
+            return False
+        self.points.append(np.mean(self._samples, axis=0))
+        self._anchor = None
+        return True
+
+    def lost(self):
+        """Mão sumiu: recomeça a espera do canto atual."""
+        self._anchor = None
+
+    def result(self, dead_zone=CALIB_DEAD_ZONE):
+        # ajuste contra os pontos realmente mostrados (com o recuo dos cantos)
+        return CalibrationMap.fit(np.asarray(self.points), self.monitors, dead_zone, targets=self.targets)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibração câmera -> monitores")
+    parser.add_argument("--calibration", default=CALIB_PATH, help="arquivo de calibração (.npz)")
+    parser.add_argument("--reset", action="store_true", help="apaga a calibração salva")
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        if os.path.exists(args.calibration):
+            os.remove(args.calibration)
+        print(f"🗑️ Calibração removida ({args.calibration})")
+        return
+    monitors = desktop_monitors()
+    for i, (x, y, w, h) in enumerate(monitors, 1):
+        print(f"🖥️ Monitor {i}: {w}x{h} em ({x}, {y})")
+    calib = CalibrationMap.load(args.calibration, monitors)
+    if calib.calibrated:
+        print(f"🎯 Calibração em {args.calibration}; centro na câmera: "
+              f"({calib.center[0]:.2f}, {calib.center[1]:.2f})")
+    else:
+        print("🎯 Sem calibração: frame inteiro -> área de trabalho (pressione 'c' no main.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,416 @@
+"""
+commands.py - Serviço de lançamento de aplicativos 🚀
+----------------------------------------------------
+Um único serviço atende a GUI (main_gui.py), o ouvinte de palmas
+(vshandle.py) e os gestos (GESTURE_COMMANDS em config.py) por um socket
+TCP local (LAUNCHER_PORT), uma linha de texto por comando:
+
+  - comandos em linguagem livre ("abre o vscode", "fechar bloco de notas")
+    passam por um índice de tokens pré-compilado, com correspondência
+    aproximada (difflib) para erros de digitação/reconhecimento de voz;
+  - o serviço guarda os processos que abriu; se o app já está aberto, a
+    janela é trazida para frente em vez de abrir outra instância;
+  - abrir é assíncrono (thread do serviço): quem pede nunca bloqueia;
+  - fechar encerra só os PIDs abertos pelo serviço. Apps cujo lançador
+    sai na hora (atalho `code`, os.startfile, xdg-open) têm os processos
+    novos com o nome do app registrados logo depois de abrir (psutil);
+    instâncias abertas por fora (ex.: o navegador do usuário) nunca são
+    encerradas.
+
+O primeiro processo que precisar do serviço passa a hospedá-lo; os outros
+viram clientes.
+
+  python commands.py --serve          # hospeda o serviço em primeiro plano
+  python commands.py abrir vscode     # envia um comando
+  echo "fechar tudo" | nc 127.0.0.1 8766
+"""
+
+import argparse
+import difflib
 import os
-import subprocess
 import platform
+import shutil
+import socket
+import socketserver
+import subprocess
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
-def run_command(command: str):
-    command = command.lower().strip()
-
-    if "vscode" in command:
-        return open_vscode()
-    elif "navegador" in command or "chrome" in command:
-        return open_browser()
-    elif "bloco" in command or "notas" in command:
-        return open_notepad()
-    elif "fechar" in command:
-        return close_all()
-    else:
-        return f"❓ Comando não reconhecido: {command}"
+# === CONFIGURAÇÕES ===
+LAUNCHER_PORT = 8766     # porta local do serviço (127.0.0.1)
+FUZZY_CUTOFF = 0.75      # similaridade mínima (difflib) para aceitar uma palavra aproximada
+CLOSE_TIMEOUT = 2.0      # segundos entre terminate() e kill()
+HANDOFF_WAIT = 5.0       # segundos procurando os processos de um app cujo lançador sai na hora
+BROWSER_URL = "https://www.google.com"
+VSCODE_PATHS = [
+    r"C:\Users\dippf\AppData\Local\Programs\Microsoft VS Code\Code.exe",
+    r"C:\Program Files\Microsoft VS Code\Code.exe",
+]
+WINDOWS = platform.system() == "Windows"
+
+
+@dataclass(frozen=True)
+class App:
+    name: str
+    label: str                               # texto das respostas
+    aliases: tuple                           # frases que identificam o app
+    process_names: frozenset = field(default_factory=frozenset)   # para achar instâncias já abertas
+    opened: str = "✅ {label} aberto!"
+    handoff: bool = False                    # o processo lançado sai e entrega a janela a outro
+
+
+APPS = {
+    "vscode": App("vscode", "VSCode", ("vscode", "vs code", "code", "visual studio code", "editor"),
+                  frozenset({"code.exe", "code"}), "🧠 VSCode aberto com sucesso!", handoff=True),
+    "browser": App("browser", "Navegador", ("navegador", "chrome", "browser", "internet", "google"),
+                   frozenset({"chrome.exe", "chrome", "msedge.exe", "firefox.exe", "firefox"}), "🌐 Navegador aberto!",
+                   handoff=True),
+    "notepad": App("notepad", "Bloco de notas", ("bloco de notas", "notas", "notepad", "bloco", "gedit"),
+                   frozenset({"notepad.exe", "gedit"}), "📝 Bloco de notas aberto!"),
+}
+VERBS = {
+    "open": ("abrir", "abre", "abra", "open", "iniciar", "inicia", "executar", "rodar", "lancar"),
+    "close": ("fechar", "fecha", "feche", "encerrar", "encerra", "close", "matar", "sair"),
+}
+ALL_WORDS = ("tudo", "todos", "todas", "all")
+STOPWORDS = {"o", "a", "os", "as", "de", "do", "da", "the", "e", "um", "uma", "por", "favor", "meu"}
+
+
+def normalize(text):
+    """Minúsculas, sem acentos, só letras/números/espaços."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return "".join(c if c.isalnum() else " " for c in text).split()
+
+
+# === ÍNDICE DE TOKENS ===
+class CommandIndex:
+    """
+    Palavra -> [(tipo, valor, peso)], montado uma vez. Frases de várias
+    palavras dividem o peso entre elas ("visual studio code" = 1/3 cada).
+    Palavras fora do vocabulário passam por difflib uma vez e o resultado
+    fica em cache.
+    """
+
+    def __init__(self, apps=APPS, verbs=VERBS, cutoff=FUZZY_CUTOFF):
+        self.cutoff = cutoff
+        self.index = {}
+        for app in apps.values():
+            for phrase in app.aliases:
+                words = [w for w in normalize(phrase) if w not in STOPWORDS]
+                for w in words:
+                    self.index.setdefault(w, []).append(("app", app.name, 1.0 / len(words)))
+        for verb, words in verbs.items():
+            for w in words:
+                self.index.setdefault(w, []).append(("verb", verb, 1.0))
+        for w in ALL_WORDS:
+            self.index.setdefault(w, []).append(("all", True, 1.0))
+        self.vocabulary = sorted(self.index)
+        self._fuzzy = {}
 
-def open_vscode():
+    def lookup(self, word):
+        hits = self.index.get(word)
+        if hits is not None:
+            return hits
+        if word not in self._fuzzy:
+            close = difflib.get_close_matches(word, self.vocabulary, n=1, cutoff=self.cutoff)
+            self._fuzzy[word] = self.index[close[0]] if close else []
+        return self._fuzzy[word]
+
+    def parse(self, command):
+        """'abre o crome' -> ('open', 'browser', False). App None se nada casar."""
+        verb, everything, scores = None, False, {}
+        for word in normalize(command):
+            if word in STOPWORDS:
+                continue
+            for kind, value, weight in self.lookup(word):
+                if kind == "verb":
+                    verb = verb or value
+                elif kind == "all":
+                    everything = True
+                else:
+                    scores[value] = scores.get(value, 0.0) + weight
+        app = max(scores, key=scores.get) if scores else None
+        if app is not None and scores[app] < 0.5:
+            app = None     # só uma palavra fraca de uma frase longa ("studio")
+        return verb, app, everything
+
+
+# === JANELAS ===
+def focus_pid(pid):
+    """Traz para frente uma janela do processo `pid` (melhor esforço)."""
     try:
-        if platform.system() == "Windows":
-            subprocess.Popen(["code"])
-        else:
-            subprocess.Popen(["code"])
-        return "🧠 VSCode aberto com sucesso!"
-    except Exception as e:
-        return f"❌ Erro ao abrir VSCode: {e}"
-
-def open_browser():
+        if WINDOWS:
+            import win32con
+            import win32gui
+            import win32process
+
+            found = []
+
+            def visit(hwnd, _):
+                if win32gui.IsWindowVisible(hwnd) and win32process.GetWindowThreadProcessId(hwnd)[1] == pid:
+                    found.append(hwnd)
+
+            win32gui.EnumWindows(visit, None)
+            if found:
+                win32gui.ShowWindow(found[0], win32con.SW_RESTORE)
+                win32gui.SetForegroundWindow(found[0])
+                return True
+        elif shutil.which("xdotool"):
+            return subprocess.run(["xdotool", "search", "--onlyvisible", "--pid", str(pid), "windowactivate"],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2).returncode == 0
+    except Exception:
+        pass
+    return False
+
+
+def find_processes(app):
+    """Processos com nome em `app.process_names` (psutil, se instalado; senão [])."""
     try:
-        if platform.system() == "Windows":
-            os.startfile("https://www.google.com")
-        else:
-            subprocess.Popen(["xdg-open", "https://www.google.com"])
-        return "🌐 Navegador aberto!"
-    except Exception as e:
-        return f"❌ Erro ao abrir navegador: {e}"
-
-def open_notepad():
+        import psutil
+    except ImportError:
+        return []
+    return [proc for proc in psutil.process_iter(attrs=["pid", "name"])
+            if (proc.info.get("name") or "").lower() in app.process_names]
+
+
+def _running(proc):
+    """Popen ou psutil.Process ainda vivo?"""
+    if isinstance(proc, subprocess.Popen):
+        return proc.poll() is None
     try:
-        if platform.system() == "Windows":
-            subprocess.Popen(["notepad.exe"])
-        else:
-            subprocess.Popen(["gedit"])
-        return "📝 Bloco de notas aberto!"
-    except Exception as e:
-        return f"❌ Erro ao abrir bloco de notas: {e}"
-
-def close_all():
+        return proc.is_running() and proc.status() != "zombie"
+    except Exception:
+        return False
+
+
+def find_running(app):
+    """PID de uma instância já aberta fora do serviço."""
+    procs = find_processes(app)
+    return procs[0].pid if procs else None
+
+
+def _spawn(app):
+    """Abre o app. Retorna o Popen (None se o SO abriu sem processo nosso)."""
+    if app.name == "vscode":
+        # Code.exe antes do atalho `code`: o atalho sai logo e o Popen não serviria para fechar
+        exe = next((p for p in VSCODE_PATHS if os.path.exists(p)), None) or shutil.which("code")
+        if exe is None:
+            raise FileNotFoundError("VSCode não encontrado")
+        return subprocess.Popen([exe])
+    if app.name == "browser":
+        if WINDOWS:
+            os.startfile(BROWSER_URL)
+            return None
+        return subprocess.Popen(["xdg-open", BROWSER_URL])
+    if app.name == "notepad":
+        return subprocess.Popen(["notepad.exe" if WINDOWS else "gedit"])
+    raise ValueError(f"App desconhecido: {app.name}")
+
+
+# === SERVIÇO ===
+class LauncherService:
+    """Registro de processos abertos + ações (abrir/focar/fechar) fora da thread de quem pede."""
+
+    def __init__(self, apps=APPS):
+        self.apps = apps
+        self.index = CommandIndex(apps)
+        self.procs = {name: [] for name in apps}    # app -> [Popen] abertos por nós
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="launcher")
+
+    def _alive(self, name):
+        with self._lock:
+            self.procs[name] = [p for p in self.procs[name] if _running(p)]
+            return list(self.procs[name])
+
+    def run(self, command):
+        """Interpreta e agenda o comando. Retorna a resposta na hora."""
+        verb, app, everything = self.index.parse(command)
+        if verb == "close":
+            # só "tudo"/"todos" fecha tudo: alvo não reconhecido ("fechar spotify") não fecha nada
+            if everything:
+                n = self.close_all()
+                return "🧹 Aplicações encerradas!" if n else "🧹 Nada aberto pelo assistente."
+            if app is None:
+                return f"❓ Comando não reconhecido: {command.strip()}"
+            n = self.close(app)
+            return f"🧹 {self.apps[app].label} fechado!" if n else f"🧹 {self.apps[app].label} não foi aberto pelo assistente."
+        if app is None:
+            return f"❓ Comando não reconhecido: {command.strip()}"
+        self._pool.submit(self._open, app)
+        return self.apps[app].opened.format(label=self.apps[app].label)
+
+    def _open(self, name):
+        app = self.apps[name]
+        # já aberto: foca a janela existente em vez de abrir outra instância
+        for proc in self._alive(name):
+            if focus_pid(proc.pid):
+                return
+        pid = find_running(app)
+        if pid is not None and focus_pid(pid):
+            return
+        before = {p.pid for p in find_processes(app)} if app.handoff else set()
+        try:
+            proc = _spawn(app)
+        except Exception as e:
+            print(f"❌ Erro ao abrir {app.label}: {e}")
+            return
+        if proc is not None:
+            with self._lock:
+                self.procs[name].append(proc)
+        if app.handoff and not before:
+            self._adopt(name, proc)
+
+    def _adopt(self, name, launcher):
+        """
+        Registra os processos do app que surgirem em HANDOFF_WAIT s (o
+        lançador já saiu). Só roda se nenhuma instância existia antes:
+        processos novos de um navegador já aberto (abas) não são nossos.
+        """
+        app = self.apps[name]
+        deadline = time.monotonic() + HANDOFF_WAIT
+        while time.monotonic() < deadline:
+            found = [p for p in find_processes(app) if launcher is None or p.pid != launcher.pid]
+            if found:
+                with self._lock:
+                    self.procs[name].extend(found)
+                return
+            time.sleep(0.25)
+
+    def close(self, name):
+        """Encerra os processos do app abertos pelo serviço. Retorna quantos."""
+        procs = self._alive(name)
+        for proc in procs:
+            try:
+                proc.terminate()
+            except Exception:
+                pass    # psutil.NoSuchProcess: saiu entre a busca e o terminate
+        if procs:
+            self._pool.submit(self._reap, procs)
+        return len(procs)
+
+    def close_all(self):
+        return sum(self.close(name) for name in self.apps)
+
+    @staticmethod
+    def _reap(procs):
+        """Popen ou psutil.Process: espera até CLOSE_TIMEOUT e mata quem sobrou."""
+        deadline = time.monotonic() + CLOSE_TIMEOUT
+        for proc in procs:
+            try:
+                proc.wait(max(0.0, deadline - time.monotonic()))
+            except Exception:
+                # subprocess.TimeoutExpired / psutil.TimeoutExpired (classes diferentes)
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+
+
+class LauncherServer:
+    """Socket local: uma linha de comando -> uma linha de resposta."""
+
+    def __init__(self, service, port=LAUNCHER_PORT):
+        self.service = service
+        self.port = port
+        self._server = self._make_server()
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="launcher-socket", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_server(self):
+        service = self.service
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    line = raw.decode("utf-8", "ignore").strip()
+                    if line:
+                        self.wfile.write((service.run(line) + "\n").encode("utf-8"))
+
+        # sem allow_reuse_address: se a porta está em uso, outro processo já hospeda o serviço
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", self.port), Handler)
+        server.daemon_threads = True
+        return server
+
+
+_service = None
+_server = None
+_host_lock = threading.Lock()
+
+
+def serve(port=LAUNCHER_PORT):
+    """Hospeda o serviço neste processo. Retorna False se outro processo já hospeda."""
+    global _service, _server
+    with _host_lock:
+        if _server is not None:
+            return True
+        try:
+            service = _service or LauncherService()
+            _server = LauncherServer(service, port).start()
+        except OSError:
+            return False
+        _service = service
+        return True
+
+
+def send(command, port=LAUNCHER_PORT, timeout=2.0):
+    """Envia um comando ao serviço (outro processo). OSError se ninguém hospeda."""
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall(command.strip().encode("utf-8") + b"\n")
+        reply = sock.makefile("rb").readline()
+    return reply.decode("utf-8").strip()
+
+
+def run_command(command: str, port=LAUNCHER_PORT):
+    """Executa um comando no serviço compartilhado (hospedando-o se ninguém hospeda)."""
+    if _server is not None:
+        return _service.run(command)
     try:
-        if platform.system() == "Windows":
-            os.system("taskkill /f /im code.exe")
-            os.system("taskkill /f /im notepad.exe")
-        return "🧹 Aplicações encerradas!"
-    except Exception as e:
-        return f"❌ Erro ao fechar: {e}"
+        return send(command, port)
+    except OSError:
+        pass
+    if serve(port):
+        return _service.run(command)
+    try:
+        return send(command, port)   # outro processo começou a hospedar no meio do caminho
+    except OSError as e:
+        return f"❌ Serviço de lançamento indisponível: {e}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço de lançamento de aplicativos")
+    parser.add_argument("--serve", action="store_true", help="hospeda o serviço em primeiro plano")
+    parser.add_argument("--port", type=int, default=LAUNCHER_PORT)
+    parser.add_argument("command", nargs="*", help="comando a enviar (ex.: abrir vscode)")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        if not serve(args.port):
+            print(f"⚠️ Já existe um serviço em 127.0.0.1:{args.port}")
+            return
+        print(f"🔌 Serviço de lançamento em 127.0.0.1:{args.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    elif args.command:
+        print(run_command(" ".join(args.command), args.port))
+        if _server is not None:
+            time.sleep(0.5)   # hospedou só para este comando: deixa o lançamento terminar
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
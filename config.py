@@ -0,0 +1,106 @@
+# config.py
+# Bloco CONFIG compartilhado entre main.py e os módulos do pipeline.
+# Ajuste as constantes aqui conforme preferir.
+
+# === CONFIGURAÇÕES ===
+DEBUG = False
+SMOOTHING_FRAMES = 6     # janela do filtro "average"
+CLICK_DIST = 35          # distancia (px) para considerar pinch = click
+RELEASE_DIST = 55        # distancia para soltar clique
+RIGHT_CLICK_DIST = 40    # distancia (px) indicador+médio para clique direito
+RIGHT_RELEASE_DIST = 55  # distancia indicador+médio para soltar o clique direito
+NORMALIZE_BY_HAND = True # escala as distâncias acima pelo tamanho da mão
+PALM_REF_PX = 100        # tamanho da palma (px, pulso->base do médio) em que as distâncias valem
+MOVE_DURATION = 0        # 0 para mover instantâneo
+INACTIVITY_TIMEOUT = 8   # segundos sem mão para mensagem "pausado" e modo econômico
+SENSITIVITY = 1.6        # multiplicador da posição do cursor
+DOUBLE_CLICK_MAX_INTERVAL = 0.35  # segundos
+SCROLL_SENSITIVITY = 8   # quanto rola por unidade de movimento
+MODEL_PATH = "hand_landmarker.task"  # seu modelo
+RUNNING_MODE = "video"   # image | video (tracking) | live_stream (async)
+
+# === MOTOR DE GESTOS (gesture_engine.py) ===
+GESTURE_DEBOUNCE = 2     # frames seguidos com a pose para disparar um gesto discreto
+GESTURE_RELEASE = 2      # frames seguidos sem a pose para encerrar um gesto
+
+# === GESTOS DINÂMICOS (trajectory.py) ===
+TRAJECTORY_BUFFER = 64          # frames guardados no anel de trajetória
+TRAJECTORY_POINTS = 32          # pontos após reamostragem (tamanho dos templates)
+TRAJECTORY_MIN_FRAMES = 6       # trajetória mais curta que isso é ignorada
+TRAJECTORY_MIN_EXTENT = 0.08    # deslocamento mínimo (fração da largura do frame)
+DTW_WINDOW = 0.15               # banda de Sakoe-Chiba (fração do comprimento)
+DTW_THRESHOLD = 0.12            # distância RMS máxima (trajetória normalizada) para aceitar
+TEMPLATES_PATH = "trajectories.npz"  # templates gravados (trajectory.py add)
+
+# === POSES TREINÁVEIS (poses.py) ===
+POSES_PATH = "poses.npz"        # amostras gravadas (python poses.py add ...)
+POSE_K = 5                      # vizinhos consultados no k-NN
+POSE_MAX_DIST = 0.6             # distância máxima (vetor de pose) ao vizinho mais próximo
+POSE_MIN_VOTES = 0.6            # fração dos k vizinhos com o mesmo rótulo para disparar
+POSE_TREE_MIN_SAMPLES = 20000   # a partir daqui usa scipy.spatial.cKDTree (se instalado)
+
+# === CALIBRAÇÃO (calibration.py) ===
+CALIB_PATH = "calibration.npz"  # homografia + LUT salvas (reaproveitadas ao iniciar)
+CALIB_LUT_SIZE = 128     # LUT câmera -> área de trabalho (células por lado)
+CALIB_DEAD_ZONE = 0.03   # fração: a borda da tela é atingida antes do ponto calibrado
+CALIB_DWELL = 1.0        # segundos parado sobre o alvo para capturar um canto
+CALIB_STILL = 0.02       # movimento máximo (fração do frame) para contar como parado
+CALIB_INSET = 20         # px: alvos afastados dos cantos (os cantos exatos são o fail-safe do pyautogui)
+MONITORS = None          # [(x, y, w, h), ...]; None = screeninfo (se instalado) ou tela do backend
+
+# === ROI (recorte da mão) ===
+ROI_ENABLED = True       # recorta a mão do frame anterior antes da inferência
+ROI_MARGIN = 0.25        # margem em volta da mão (fração do tamanho da mão, por lado)
+ROI_INPUT_SIZE = 256     # lado máximo (px) do recorte enviado ao detector
+ROI_MIN_SIZE = 96        # lado mínimo (px) do recorte no frame
+SEARCH_WIDTH = 320       # lado máximo (px) do frame inteiro quando a mão some
+ROI_SEARCH_EVERY = 10    # com menos mãos que NUM_HANDS/--hands: 1 frame inteiro a cada N (acha a 2ª mão)
+
+# === MODO ECONÔMICO (sem mão por INACTIVITY_TIMEOUT) ===
+IDLE_ENABLED = True
+IDLE_FPS = 5                    # taxa de captura em idle
+IDLE_CAPTURE_SIZE = (320, 240)  # resolução da câmera em idle
+MOTION_GRID = (64, 48)          # tamanho da imagem cinza usada no gate de movimento
+MOTION_PIXEL_THRESHOLD = 18     # diferença (0-255) para contar um pixel como movimento
+MOTION_MIN_AREA = 0.01          # fração mínima de pixels em movimento para rodar o detector
+
+# === FILTRO DO CURSOR ===
+CURSOR_FILTER = "one_euro"      # average | one_euro | kalman
+ONE_EURO_MIN_CUTOFF = 1.0       # Hz - suavização com a mão parada (menor = mais suave)
+ONE_EURO_BETA = 0.005           # quanto o corte sobe com a velocidade (px/s)
+ONE_EURO_D_CUTOFF = 1.0         # Hz - corte da derivada
+KALMAN_PROCESS_NOISE = 1e6      # variância da aceleração (px²/s⁴)
+KALMAN_MEASUREMENT_NOISE = 50   # variância do ruído do landmark (px²)
+PREDICT_LATENCY = True          # extrapola o cursor pela latência medida do pipeline
+MAX_PREDICTION = 0.1            # segundos - limite da extrapolação
+
+# === ATUAÇÃO ===
+ACTUATION_BACKEND = "pyautogui"  # pyautogui | x11 | uinput | null
+
+# gesto/pose -> comando do serviço de lançamento (commands.py), ex.: {"thumbs_up": "abrir vscode"}
+GESTURE_COMMANDS = {}
+
+# === HUD / CONTROLE ===
+HUD_FPS = 15             # taxa de atualização da janela (independente da câmera)
+CONTROL_PORT = 0         # porta TCP local para comandos (0 = desligado)
+
+# === VÁRIAS MÃOS / CÂMERAS (hands.py, farm.py) ===
+NUM_HANDS = 1            # mãos detectadas por frame (--hands); > 1 ativa o MultiHandController
+HAND_ROLES = {"Right": "right", "Left": "left"}  # lado detectado -> papel (conjunto de ações)
+HAND_MATCH_DIST = 0.25   # distância máxima (fração do frame) para manter a identidade da mão
+HAND_TRACK_TIMEOUT = 0.5 # segundos sem ver uma mão antes de descartar a trilha
+FARM_SLOTS = 2           # frames por câmera na memória compartilhada
+FARM_SYNC_WINDOW = 0.05  # segundos: resultados de câmeras diferentes juntados no mesmo pacote
+
+# === PIPELINE ===
+QUEUE_DEPTH = 1          # profundidade das filas entre estágios (1 = só o frame mais novo)
+CAMERA_INDEX = 0         # índice passado para cv2.VideoCapture
+CAMERA_CACHE_PATH = "camera_cache.json"  # backend/resolução/FPS negociados por câmera ("" = sem cache)
+MIRROR_LANDMARKS = True  # espelha os landmarks em vez de flipar a imagem (flip só no HUD)
+FRAME_POOL_SIZE = 8      # buffers reutilizados por formato de frame (> pacotes em voo)
+
+# === MÉTRICAS ===
+METRICS_INTERVAL = 10    # segundos entre exportações (JSONL / resumo no terminal com DEBUG)
+METRICS_WINDOW = 60      # segundos cobertos pelos percentis (janela deslizante)
+METRICS_PORT = 0         # porta local do endpoint Prometheus /metrics (0 = desligado)
+FLICKER_FRAMES = 2       # gesto disparado que dura <= N frames conta como falso positivo
@@ -0,0 +1,119 @@
+"""
+control.py - Comandos de controle (teclado, stdin, socket local) ⌨️
+------------------------------------------------------------------
+Os mesmos comandos valem para as teclas da janela, linhas no stdin e
+linhas enviadas para um socket TCP local (--control-port):
+
+  pause / p          pausar/resumir detecção
+  recalibrate / c    recalibrar
+  sens+ / +          aumentar sensibilidade
+  sens- / -          diminuir sensibilidade
+  sens <valor>       definir sensibilidade
+  quit / q           sair
+
+Ex.: echo "sens 1.8" | nc 127.0.0.1 8765
+"""
+
+import queue
+import socketserver
+import sys
+import threading
+
+ALIASES = {
+    "p": "pause", "pausar": "pause",
+    "c": "recalibrate", "recalibrar": "recalibrate",
+    "+": "sens+", "=": "sens+",
+    "-": "sens-", "_": "sens-",
+    "q": "quit", "esc": "quit", "exit": "quit", "sair": "quit",
+}
+COMMANDS = {"pause", "recalibrate", "sens+", "sens-", "sens", "quit"}
+
+# teclas do cv2.waitKey -> comando
+KEY_COMMANDS = {
+    27: "quit",  # ESC
+    ord("p"): "pause",
+    ord("c"): "recalibrate",
+    ord("+"): "sens+", ord("="): "sens+",
+    ord("-"): "sens-", ord("_"): "sens-",
+}
+
+
+def parse_command(line):
+    """'sens 1.8' -> ('sens', 1.8). Retorna None se não reconhecer."""
+    parts = line.strip().lower().split()
+    if not parts:
+        return None
+    name = ALIASES.get(parts[0], parts[0])
+    if name not in COMMANDS:
+        return None
+    arg = None
+    if name == "sens":
+        try:
+            arg = float(parts[1])
+        except (IndexError, ValueError):
+            return None
+    return name, arg
+
+
+class ControlInput:
+    """Fila de comandos alimentada por stdin, socket local e teclas do HUD."""
+
+    def __init__(self, stdin=True, port=None):
+        self.commands = queue.Queue()
+        self.stdin = stdin
+        self.port = port
+        self._server = None
+
+    def start(self):
+        if self.stdin:
+            threading.Thread(target=self._read_stdin, name="control-stdin", daemon=True).start()
+        if self.port:
+            self._server = self._make_server()
+            threading.Thread(target=self._server.serve_forever, name="control-socket", daemon=True).start()
+            print(f"🔌 Controle em 127.0.0.1:{self.port}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def put(self, name, arg=None):
+        self.commands.put((name, arg))
+
+    def put_line(self, line):
+        cmd = parse_command(line)
+        if cmd is not None:
+            self.commands.put(cmd)
+        return cmd
+
+    def poll(self):
+        """Comandos pendentes, sem bloquear."""
+        while True:
+            try:
+                yield self.commands.get_nowait()
+            except queue.Empty:
+                return
+
+    def _read_stdin(self):
+        for line in sys.stdin:
+            if self.put_line(line) is None and line.strip():
+                print(f"❓ Comando não reconhecido: {line.strip()}")
+
+    def _make_server(self):
+        control = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    line = raw.decode("utf-8", "ignore")
+                    reply = b"ok\n" if control.put_line(line) is not None else b"?\n"
+                    self.wfile.write(reply)
+
+        # subclasse local: mudar a classe base ligaria SO_REUSEADDR também no
+        # serviço de lançamento (commands.py), que depende dele desligado
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        return Server(("127.0.0.1", self.port), Handler)
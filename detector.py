@@ -0,0 +1,163 @@
+"""
+detector.py - HandLandmarker do MediaPipe com modos de execução 🎯
+------------------------------------------------------------------
+  image       -> detect() a cada frame (detecção de palma completa sempre)
+  video       -> detect_for_video() com timestamps monotônicos; o modelo
+                 reaproveita o tracking do frame anterior
+  live_stream -> detect_async(); o resultado chega por callback e segue
+                 para o estágio de gestos sem bloquear a inferência
+
+Com `roi=True` a imagem enviada ao modelo é o recorte da mão do frame
+anterior (roi.py), reduzido; os landmarks voltam em coordenadas do frame.
+Pacotes com `mirrored=True` (imagem não flipada) têm o x dos landmarks
+espelhado aqui. Recorte e conversão de cor usam buffers reutilizados.
+"""
+
+import threading
+import time
+
+import cv2
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from mediapipe import Image, ImageFormat
+
+from config import MODEL_PATH, RUNNING_MODE, ROI_ENABLED, NUM_HANDS
+from frames import BufferPool, mirror_landmarks
+from metrics import REGISTRY
+from roi import RoiTracker
+
+# === SETUP MEDIAPIPE ===
+BaseOptions = python.BaseOptions
+VisionRunningMode = vision.RunningMode
+HandLandmarker = vision.HandLandmarker
+HandLandmarkerOptions = vision.HandLandmarkerOptions
+
+RUNNING_MODES = {
+    "image": VisionRunningMode.IMAGE,
+    "video": VisionRunningMode.VIDEO,
+    "live_stream": VisionRunningMode.LIVE_STREAM,
+}
+
+
+class HandDetector:
+    """
+    Estágio de inferência do pipeline. `process(pkt)` preenche
+    `pkt.result`, `pkt.t_infer` e `pkt.latency` e devolve o pacote; no
+    modo live_stream devolve None e entrega o pacote em `on_result`
+    quando o callback do MediaPipe disparar.
+    """
+
+    def __init__(self, mode=RUNNING_MODE, model_path=MODEL_PATH, num_hands=NUM_HANDS, on_result=None,
+                 roi=ROI_ENABLED):
+        if mode not in RUNNING_MODES:
+            raise ValueError(f"Modo inválido: {mode} (use {', '.join(RUNNING_MODES)})")
+        self.mode = mode
+        self.on_result = on_result
+        # várias mãos: a ROI faz buscas periódicas no frame inteiro (roi.py)
+        self.roi = RoiTracker(num_hands=num_hands) if roi else None
+        self.pool = BufferPool()
+        self._last_ts = -1
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        kwargs = {}
+        if mode == "live_stream":
+            kwargs["result_callback"] = self._on_async_result
+        options = HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=RUNNING_MODES[mode],
+            num_hands=num_hands,
+            **kwargs,
+        )
+        self.landmarker = HandLandmarker.create_from_options(options)
+
+    def _next_timestamp(self):
+        # VIDEO/LIVE_STREAM exigem timestamps (ms) estritamente crescentes
+        ts = int(time.monotonic() * 1000)
+        if ts <= self._last_ts:
+            ts = self._last_ts + 1
+        self._last_ts = ts
+        return ts
+
+    def detect(self, rgb):
+        """Detecção síncrona de um frame RGB (modos image/video)."""
+        mp_image = Image(image_format=ImageFormat.SRGB, data=rgb)
+        if self.mode == "video":
+            return self.landmarker.detect_for_video(mp_image, self._next_timestamp())
+        return self.landmarker.detect(mp_image)
+
+    def warmup(self, shape=(480, 640, 3)):
+        """
+        Inferência num frame preto: a primeira chamada do MediaPipe paga a
+        inicialização do grafo/delegate, melhor pagar antes do primeiro frame real.
+        """
+        rgb = self.pool.get(tuple(shape))
+        rgb[:] = 0
+        if self.mode == "live_stream":
+            # resultado sem pacote pendente: o callback só descarta
+            self.landmarker.detect_async(Image(image_format=ImageFormat.SRGB, data=rgb), self._next_timestamp())
+        else:
+            self.detect(rgb)
+
+    def preprocess(self, frame):
+        """Frame BGR -> (RGB para o modelo, roi usada ou None)."""
+        roi = None
+        if self.roi is not None:
+            frame, roi = self.roi.prepare(frame, self.pool)
+        # o mediapipe.Image copia os dados, então o buffer RGB pode ser reusado logo
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.pool.get(frame.shape))
+        return rgb, roi
+
+    def postprocess(self, result, roi, frame_w, frame_h, mirror=False):
+        """Leva os landmarks do recorte para o frame, atualiza a ROI e espelha se preciso."""
+        hands = result.hand_landmarks
+        if self.roi is not None:
+            RoiTracker.remap(hands, roi, frame_w, frame_h)
+            self.roi.update(hands, frame_w, frame_h)
+        if mirror:
+            mirror_landmarks(hands)
+        return result
+
+    def process(self, pkt):
+        t0 = time.perf_counter()
+        rgb, pkt.roi = self.preprocess(pkt.frame)
+        t1 = REGISTRY.timed("preprocess", t0)
+        if self.mode == "live_stream":
+            ts = self._next_timestamp()
+            with self._lock:
+                self._pending[ts] = (pkt, t1)
+            self.landmarker.detect_async(Image(image_format=ImageFormat.SRGB, data=rgb), ts)
+            return None
+        pkt.result = self.detect(rgb)
+        REGISTRY.timed("inference", t1)
+        self._finish(pkt)
+        return pkt
+
+    def _finish(self, pkt):
+        h, w = pkt.frame.shape[:2]
+        self.postprocess(pkt.result, pkt.roi, w, h, pkt.mirrored)
+        for categories in getattr(pkt.result, "handedness", None) or []:
+            if categories:
+                # score da classificação Left/Right (o HandLandmarker não expõe o score da detecção)
+                REGISTRY.observe("handedness_score", categories[0].score, scale=1000)
+        pkt.t_infer = time.time()
+        pkt.latency = pkt.t_infer - pkt.t_capture
+
+    def _on_async_result(self, result, output_image, timestamp_ms):
+        with self._lock:
+            pending = self._pending.pop(timestamp_ms, None)
+            # o MediaPipe pode pular frames quando ocupado: descarta pendentes mais velhos
+            for ts in [t for t in self._pending if t < timestamp_ms]:
+                del self._pending[ts]
+                REGISTRY.inc("detector_skipped")
+        if pending is None:
+            return
+        pkt, t_submit = pending
+        REGISTRY.timed("inference", t_submit)
+        pkt.result = result
+        self._finish(pkt)
+        if self.on_result is not None:
+            self.on_result(pkt)
+
+    def close(self):
+        self.landmarker.close()
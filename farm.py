@@ -0,0 +1,236 @@
+"""
+farm.py - Várias câmeras, um HandLandmarker por processo 🎥🎥
+-----------------------------------------------------------
+Com --cameras 0,1 cada câmera tem:
+  - uma thread de captura no processo principal, que lê direto num anel
+    de FARM_SLOTS frames em memória compartilhada (multiprocessing.shared_memory);
+  - um processo worker com o próprio HandDetector, que recebe só
+    (slot, seq, t) pela fila e lê o frame da memória compartilhada (sem pickle).
+
+Os workers devolvem landmarks (arrays pequenos). `DetectorFarm` junta os
+resultados das câmeras por timestamp (FARM_SYNC_WINDOW) num único
+FramePacket: as câmeras ficam lado a lado num frame composto, na ordem
+de --cameras (na visão espelhada do HUD a ordem aparece invertida), e
+os landmarks são convertidos para esse frame. Para o resto do pipeline
+é uma câmera larga com inferência já feita.
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from config import FARM_SLOTS, FARM_SYNC_WINDOW, RUNNING_MODE, ROI_ENABLED, NUM_HANDS
+from frames import BufferPool
+from metrics import REGISTRY
+from pipeline import FramePacket
+
+
+class SharedFrames:
+    """Anel de `slots` frames (h, w, 3) uint8 num bloco de memória compartilhada."""
+
+    def __init__(self, shape, slots=FARM_SLOTS, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = int(np.prod(self.shape)) * slots
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def slot(self, i):
+        return self.array[i]
+
+    def close(self, unlink=False):
+        del self.array
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker(cam, shm_name, shape, slots, jobs, results, mode, roi, num_hands):
+    """Processo worker: HandDetector próprio, frames lidos da memória compartilhada."""
+    from detector import HandDetector   # mediapipe só é importado nos workers
+
+    frames = SharedFrames(shape, slots, name=shm_name)
+    # live_stream não faz sentido aqui: o worker já é assíncrono para o processo principal
+    detector = HandDetector(mode="video" if mode == "live_stream" else mode, roi=roi, num_hands=num_hands)
+    detector.warmup(shape)   # primeira inferência fora do caminho do primeiro frame
+    h, w = shape[:2]
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            slot, seq, t_capture = job
+            t0 = time.perf_counter()
+            rgb, box = detector.preprocess(frames.slot(slot))
+            result = detector.postprocess(detector.detect(rgb), box, w, h)
+            hands = np.array([[(p.x, p.y, p.z) for p in lm] for lm in result.hand_landmarks],
+                             dtype=np.float32).reshape(-1, 21, 3)
+            handed = [(c[0].category_name, c[0].score) if c else None for c in result.handedness]
+            results.put((cam, slot, seq, t_capture, time.perf_counter() - t0, hands, handed))
+    finally:
+        detector.close()
+        frames.close()
+
+
+class _Camera:
+    """Captura de uma câmera para o anel compartilhado (thread no processo principal)."""
+
+    def __init__(self, index, cap, frames, jobs):
+        self.index = index
+        self.cap = cap
+        self.frames = frames
+        self.jobs = jobs
+        self.in_flight = None      # slot sendo processado pelo worker
+        self.dropped = 0
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def release(self, slot):
+        with self._lock:
+            if self.in_flight == slot:
+                self.in_flight = None
+
+    def run(self, stop_event):
+        write = 0
+        while not stop_event.is_set():
+            with self._lock:
+                if write == self.in_flight:
+                    write = (write + 1) % self.frames.slots
+            ret, _ = self.cap.read(self.frames.slot(write))
+            if not ret:
+                time.sleep(0.005)
+                continue
+            t = time.time()
+            self.seq += 1
+            with self._lock:
+                if self.in_flight is not None:
+                    self.dropped += 1   # worker ocupado: o próximo frame sobrescreve este slot
+                    continue
+                self.in_flight = write
+            self.jobs.put((write, self.seq, t))
+
+
+class DetectorFarm:
+    """
+    Fonte para o Pipeline (`farm()` -> FramePacket já com `result`).
+    O estágio de inferência do pipeline só repassa o pacote.
+    """
+
+    def __init__(self, cameras, mode=RUNNING_MODE, roi=ROI_ENABLED, num_hands=NUM_HANDS,
+                 sync_window=FARM_SYNC_WINDOW):
+        self.sync_window = sync_window
+        self.pool = BufferPool()
+        self._stop_event = threading.Event()
+        self._ctx = mp.get_context("spawn")   # fork + threads/MediaPipe não é seguro
+        self.results = self._ctx.Queue()
+        self.cameras, self.procs, self._threads = [], [], []
+
+        offsets, x = [], 0
+        for index in cameras:
+            cap = cv2.VideoCapture(index)
+            ret, frame = cap.read() if cap.isOpened() else (False, None)
+            if not ret:
+                self.close()
+                raise RuntimeError(f"Não foi possível acessar a câmera {index}")
+            frames = SharedFrames(frame.shape)
+            jobs = self._ctx.Queue()
+            self.cameras.append(_Camera(index, cap, frames, jobs))
+            self.procs.append(self._ctx.Process(
+                target=_worker, name=f"detector-{index}", daemon=True,
+                args=(len(self.cameras) - 1, frames.name, frame.shape, frames.slots, jobs,
+                      self.results, mode, roi, num_hands)))
+            offsets.append(x)
+            x += frame.shape[1]
+
+        # frame composto: câmeras lado a lado (altura = maior altura)
+        height = max(c.frames.shape[0] for c in self.cameras)
+        self.size = (x, height)
+        self.offsets = offsets
+        self._composite = np.zeros((height, x, 3), dtype=np.uint8)
+        self._latest = [None] * len(self.cameras)   # (t_capture, hands, handed) por câmera
+        self._seq = 0
+
+    def start(self):
+        for proc in self.procs:
+            proc.start()
+        for cam in self.cameras:
+            t = threading.Thread(target=cam.run, args=(self._stop_event,), name=f"capture-{cam.index}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    @property
+    def dropped(self):
+        return sum(c.dropped for c in self.cameras)
+
+    def _to_composite(self, cam, hands):
+        """Landmarks normalizados da câmera -> frame composto (in-place)."""
+        w_total, h_total = self.size
+        fh, fw = self.cameras[cam].frames.shape[:2]
+        hands[..., 0] = (self.offsets[cam] + hands[..., 0] * fw) / w_total
+        hands[..., 1] *= fh / h_total
+        hands[..., 2] *= fw / w_total
+        return hands
+
+    def __call__(self):
+        try:
+            cam, slot, seq, t_capture, infer_s, hands, handed = self.results.get(timeout=0.1)
+        except queue.Empty:
+            return None
+        REGISTRY.observe("inference", infer_s)
+
+        # copia o frame antes de liberar o slot para a captura
+        c = self.cameras[cam]
+        fh, fw = c.frames.shape[:2]
+        x0 = self.offsets[cam]
+        np.copyto(self._composite[:fh, x0:x0 + fw], c.frames.slot(slot))
+        c.release(slot)
+        self._latest[cam] = (t_capture, self._to_composite(cam, hands), handed)
+
+        # junta as câmeras cujo último resultado está dentro da janela de sincronia
+        hand_list, handedness, t_min = [], [], t_capture
+        for latest in self._latest:
+            if latest is None or abs(latest[0] - t_capture) > self.sync_window:
+                continue
+            t_min = min(t_min, latest[0])
+            for lm, hd in zip(latest[1], latest[2]):
+                hand_list.append(lm.copy())
+                handedness.append([SimpleNamespace(category_name=hd[0], score=hd[1])] if hd else [])
+        for lm in hand_list:
+            lm[:, 0] = 1.0 - lm[:, 0]   # visão espelhada: frames não são flipados, landmarks sim
+
+        frame = self.pool.get(self._composite.shape)
+        np.copyto(frame, self._composite)
+        self._seq += 1
+        now = time.time()
+        return FramePacket(
+            seq=self._seq, t_capture=t_min, frame=frame, t_infer=now, latency=now - t_min,
+            result=SimpleNamespace(hand_landmarks=hand_list, handedness=handedness),
+            mirrored=True,
+        )
+
+    def close(self):
+        self._stop_event.set()
+        for t in self._threads:
+            t.join(1.0)
+        for cam in self.cameras:
+            cam.jobs.put(None)
+        for proc in self.procs:
+            if proc.pid is None:
+                continue   # não chegou a iniciar
+            proc.join(2.0)
+            if proc.is_alive():
+                proc.terminate()
+        for cam in self.cameras:
+            cam.cap.release()
+            cam.frames.close(unlink=True)
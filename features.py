@@ -0,0 +1,109 @@
+"""
+features.py - Extração vetorizada de features da mão 📐
+------------------------------------------------------
+Converte os 21 landmarks uma única vez para um array (21, 3) float32
+pré-alocado (coordenadas em pixels) e calcula, com poucas operações
+NumPy em buffers reutilizados:
+  - estados dos dedos (up/down)
+  - distâncias entre todas as pontas dos dedos
+  - escala da palma (pulso -> base do dedo médio)
+  - ângulo da palma e de cada dedo
+
+`vector` expõe tudo como um vetor compacto (float32), na ordem de
+FEATURE_SLICES.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+TIPS = np.array([4, 8, 12, 16, 20])      # polegar, indicador, médio, anelar, mínimo
+PIPS = np.array([3, 6, 10, 14, 18])      # articulação usada para decidir "up"
+MCPS = np.array([2, 5, 9, 13, 17])       # base de cada dedo
+
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+
+# pares (i < j) de pontas -> índice no vetor de distâncias
+_PAIRS_I, _PAIRS_J = np.triu_indices(5, k=1)
+
+FEATURE_SLICES = {
+    "states": slice(0, 5),
+    "tip_dists": slice(5, 15),   # distâncias / escala da palma, pares de _PAIRS_I/_PAIRS_J
+    "palm_scale": slice(15, 16),
+    "palm_angle": slice(16, 17),
+    "finger_angles": slice(17, 22),
+}
+FEATURE_SIZE = 22
+
+
+class HandFeatures:
+    """Features de uma mão, recalculadas in-place a cada `compute()`."""
+
+    def __init__(self):
+        self.norm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)   # coordenadas normalizadas
+        self.pts = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)    # pixels
+        self.states = np.zeros(5, dtype=bool)
+        self.tip_dists = np.zeros((5, 5), dtype=np.float32)          # pixels
+        self.palm_scale = 0.0
+        self.palm_angle = 0.0
+        self.finger_angles = np.zeros(5, dtype=np.float32)
+        self.vector = np.zeros(FEATURE_SIZE, dtype=np.float32)
+
+        self._scale = np.ones(3, dtype=np.float32)
+        self._tips = np.zeros((5, 2), dtype=np.float32)
+        self._diff = np.zeros((5, 5, 2), dtype=np.float32)
+        self._dirs = np.zeros((5, 2), dtype=np.float32)
+
+    def load(self, landmarks):
+        """Copia landmarks (objetos .x/.y/.z do MediaPipe ou array (21, 3)) para o buffer."""
+        if isinstance(landmarks, np.ndarray):
+            np.copyto(self.norm, landmarks, casting="same_kind")
+        else:
+            self.norm[:] = [(p.x, p.y, p.z) for p in landmarks]
+
+    def compute(self, landmarks, w, h):
+        self.load(landmarks)
+        self._scale[0] = w
+        self._scale[1] = h
+        self._scale[2] = w  # z do MediaPipe tem a mesma escala de x
+        np.multiply(self.norm, self._scale, out=self.pts)
+        pts = self.pts
+
+        # dedos "up": polegar compara x (abre lateralmente), demais comparam y
+        np.less(pts[TIPS, 1], pts[PIPS, 1], out=self.states)
+        self.states[THUMB] = pts[TIPS[THUMB], 0] < pts[PIPS[THUMB], 0]
+
+        # distâncias entre pontas (matriz 5x5)
+        self._tips[:] = pts[TIPS, :2]
+        np.subtract(self._tips[:, None, :], self._tips[None, :, :], out=self._diff)
+        np.hypot(self._diff[..., 0], self._diff[..., 1], out=self.tip_dists)
+
+        # escala e orientação da palma
+        dx = pts[MIDDLE_MCP, 0] - pts[WRIST, 0]
+        dy = pts[MIDDLE_MCP, 1] - pts[WRIST, 1]
+        self.palm_scale = float(np.hypot(dx, dy))
+        self.palm_angle = float(np.arctan2(dy, dx))
+
+        # ângulo de cada dedo (base -> ponta)
+        np.subtract(self._tips, pts[MCPS, :2], out=self._dirs)
+        np.arctan2(self._dirs[:, 1], self._dirs[:, 0], out=self.finger_angles)
+
+        v = self.vector
+        v[FEATURE_SLICES["states"]] = self.states
+        v[FEATURE_SLICES["tip_dists"]] = self.tip_dists[_PAIRS_I, _PAIRS_J]
+        if self.palm_scale > 0:
+            v[FEATURE_SLICES["tip_dists"]] /= self.palm_scale
+        v[FEATURE_SLICES["palm_scale"]] = self.palm_scale
+        v[FEATURE_SLICES["palm_angle"]] = self.palm_angle
+        v[FEATURE_SLICES["finger_angles"]] = self.finger_angles
+        return self
+
+    def dist(self, a, b):
+        """Distância (px) entre as pontas dos dedos `a` e `b` (THUMB..PINKY)."""
+        return float(self.tip_dists[a, b])
+
+    def tip_px(self, finger):
+        """Ponta do dedo em pixels inteiros (para HUD/cursor)."""
+        p = self.pts[TIPS[finger]]
+        return int(p[0]), int(p[1])
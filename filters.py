@@ -0,0 +1,195 @@
+"""
+filters.py - Filtros de suavização do cursor 🎚️
+-----------------------------------------------
+Todos os filtros têm a mesma interface:
+  update(x, y, t, lead=0.0) -> (x, y)   # lead = segundos para extrapolar
+  reset()
+São O(1) por frame e só usam floats (sem alocar arrays).
+
+  average   -> média móvel de N frames (comportamento original)
+  one_euro  -> One Euro Filter: suaviza forte parado, pouco em movimento
+  kalman    -> Kalman de velocidade constante (por eixo)
+
+Com `lead` > 0 o filtro projeta a posição para frente usando a
+velocidade estimada, compensando a latência do pipeline.
+"""
+
+import math
+from collections import deque
+
+from config import (
+    SMOOTHING_FRAMES, ONE_EURO_MIN_CUTOFF, ONE_EURO_BETA, ONE_EURO_D_CUTOFF,
+    KALMAN_PROCESS_NOISE, KALMAN_MEASUREMENT_NOISE,
+)
+
+
+class MovingAverageFilter:
+    """Média móvel com soma acumulada (O(1) por frame)."""
+
+    def __init__(self, frames=SMOOTHING_FRAMES):
+        self.frames = frames
+        self.reset()
+
+    def reset(self):
+        self._xs = deque(maxlen=self.frames)
+        self._ys = deque(maxlen=self.frames)
+        self._sx = 0.0
+        self._sy = 0.0
+        self._last = None
+
+    def update(self, x, y, t, lead=0.0):
+        if len(self._xs) == self.frames:
+            self._sx -= self._xs[0]
+            self._sy -= self._ys[0]
+        self._xs.append(x)
+        self._ys.append(y)
+        self._sx += x
+        self._sy += y
+        n = len(self._xs)
+        ax, ay = self._sx / n, self._sy / n
+        last, self._last = self._last, (ax, ay, t)
+        if lead > 0 and last is not None and t > last[2]:
+            # velocidade a partir da média do frame anterior
+            dt = t - last[2]
+            ax += (ax - last[0]) / dt * lead
+            ay += (ay - last[1]) / dt * lead
+        return ax, ay
+
+
+class _LowPass:
+    __slots__ = ("value", "initialized")
+
+    def __init__(self):
+        self.value = 0.0
+        self.initialized = False
+
+    def filter(self, x, alpha):
+        if not self.initialized:
+            self.value = x
+            self.initialized = True
+        else:
+            self.value = alpha * x + (1.0 - alpha) * self.value
+        return self.value
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class _OneEuroAxis:
+    def __init__(self, min_cutoff, beta, d_cutoff):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x = _LowPass()
+        self.dx = _LowPass()
+        self.prev = None
+
+    def update(self, x, dt):
+        if self.prev is None:
+            self.prev = x
+            self.dx.filter(0.0, 1.0)
+            return self.x.filter(x, 1.0)
+        dx = (x - self.prev) / dt
+        self.prev = x
+        edx = self.dx.filter(dx, _alpha(self.d_cutoff, dt))
+        cutoff = self.min_cutoff + self.beta * abs(edx)
+        return self.x.filter(x, _alpha(cutoff, dt))
+
+
+class OneEuroFilter:
+    """One Euro Filter (Casiez et al., 2012) em 2D."""
+
+    def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA, d_cutoff=ONE_EURO_D_CUTOFF):
+        self.params = (min_cutoff, beta, d_cutoff)
+        self.reset()
+
+    def reset(self):
+        self._ax = _OneEuroAxis(*self.params)
+        self._ay = _OneEuroAxis(*self.params)
+        self._t = None
+
+    def update(self, x, y, t, lead=0.0):
+        dt = t - self._t if self._t is not None else 0.0
+        if dt <= 0:
+            dt = 1.0 / 30  # timestamps repetidos: assume 30 fps
+        self._t = t
+        fx = self._ax.update(x, dt)
+        fy = self._ay.update(y, dt)
+        if lead > 0:
+            fx += self._ax.dx.value * lead
+            fy += self._ay.dx.value * lead
+        return fx, fy
+
+
+class _KalmanAxis:
+    """Estado [posição, velocidade] com covariância 2x2 em escalares."""
+
+    def __init__(self, q, r):
+        self.q = q
+        self.r = r
+        self.initialized = False
+
+    def update(self, z, dt):
+        if not self.initialized:
+            self.p, self.v = z, 0.0
+            self.p00, self.p01, self.p11 = self.r, 0.0, 1e4
+            self.initialized = True
+            return self.p
+        # predição
+        p = self.p + self.v * dt
+        dt2 = dt * dt
+        q = self.q
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt2 * dt2 / 4
+        p01 = self.p01 + dt * self.p11 + q * dt2 * dt / 2
+        p11 = self.p11 + q * dt2
+        # correção
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        y = z - p
+        self.p = p + k0 * y
+        self.v = self.v + k1 * y
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return self.p
+
+
+class KalmanFilter:
+    """Kalman de velocidade constante, um por eixo."""
+
+    def __init__(self, process_noise=KALMAN_PROCESS_NOISE, measurement_noise=KALMAN_MEASUREMENT_NOISE):
+        self.params = (process_noise, measurement_noise)
+        self.reset()
+
+    def reset(self):
+        self._ax = _KalmanAxis(*self.params)
+        self._ay = _KalmanAxis(*self.params)
+        self._t = None
+
+    def update(self, x, y, t, lead=0.0):
+        dt = t - self._t if self._t is not None else 0.0
+        if dt <= 0:
+            dt = 1.0 / 30
+        self._t = t
+        fx = self._ax.update(x, dt)
+        fy = self._ay.update(y, dt)
+        if lead > 0:
+            fx += self._ax.v * lead
+            fy += self._ay.v * lead
+        return fx, fy
+
+
+FILTERS = {
+    "average": MovingAverageFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanFilter,
+}
+
+
+def create_filter(name, **kwargs):
+    if name not in FILTERS:
+        raise ValueError(f"Filtro inválido: {name} (use {', '.join(FILTERS)})")
+    return FILTERS[name](**kwargs)
@@ -0,0 +1,54 @@
+"""
+frames.py - Buffers de frame pré-alocados ♻️
+--------------------------------------------
+`BufferPool` mantém um anel de arrays por (shape, dtype) para usar como
+`dst=` em cv2.read/flip/resize/cvtColor, evitando alocar um frame novo
+a cada etapa. Cada thread deve ter o seu pool (sem locks).
+
+O anel precisa ser maior que o número de pacotes em voo no pipeline
+(filas de profundidade 1 + um item em cada estágio), por isso
+FRAME_POOL_SIZE = 8 por padrão.
+"""
+
+import numpy as np
+
+from config import FRAME_POOL_SIZE
+
+
+class BufferPool:
+    def __init__(self, size=FRAME_POOL_SIZE):
+        self.size = size
+        self._rings = {}
+        self.allocations = 0   # buffers criados (estabiliza após os primeiros frames)
+
+    def get(self, shape, dtype=np.uint8):
+        """Próximo buffer do anel para `shape`/`dtype` (conteúdo indefinido)."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = [[], 0]
+        buffers, i = ring
+        if len(buffers) < self.size:
+            buf = np.empty(shape, dtype=dtype)
+            buffers.append(buf)
+            self.allocations += 1
+        else:
+            buf = buffers[i]
+        ring[1] = (i + 1) % self.size
+        return buf
+
+    def clear(self):
+        self._rings.clear()
+
+
+def mirror_landmarks(hands):
+    """Espelha x dos landmarks normalizados (in-place), no lugar de flipar a imagem."""
+    for lm in hands:
+        for p in lm:
+            p.x = 1.0 - p.x
+
+
+def mirror_roi(roi, frame_w):
+    """ROI (x0, y0, w, h) da imagem original -> coordenadas espelhadas."""
+    x0, y0, rw, rh = roi
+    return frame_w - (x0 + rw), y0, rw, rh
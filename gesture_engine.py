@@ -0,0 +1,149 @@
+"""
+gesture_engine.py - Motor declarativo de gestos 🧩
+-------------------------------------------------
+Cada gesto é um `GestureRule`: padrão de dedos (up/down) + predicado
+extra sobre `HandFeatures`, com histerese (condição de entrada mais
+estrita que a de permanência), debounce em frames e prioridade.
+
+As regras são compiladas uma vez numa tabela indexada pelo código de
+5 bits dos dedos: a cada frame só as regras candidatas daquele código
+são avaliadas, numa única passada. Dentro de um mesmo `group` só um
+gesto fica ativo (o de maior prioridade), então gestos conflitantes
+não disparam juntos.
+
+`step()` devolve eventos (regra, fase, frames ativos), fase em
+"enter" | "hold" | "exit"; quem executa as ações é o GestureController.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from config import GESTURE_DEBOUNCE, GESTURE_RELEASE
+
+ENTER, HOLD, EXIT = "enter", "hold", "exit"
+NUM_CODES = 32   # 5 dedos -> 2^5 combinações up/down
+_BITS = np.array([1, 2, 4, 8, 16])
+
+
+@dataclass(frozen=True)
+class GestureRule:
+    name: str
+    fingers: str                            # polegar..mínimo: "1" up, "0" down, "?" tanto faz
+    hold_fingers: Optional[str] = None      # padrão para continuar ativo (None = fingers)
+    enter: Optional[Callable] = None        # f(features, escala) -> bool, para entrar
+    hold: Optional[Callable] = None         # idem, para continuar ativo (None = enter)
+    group: str = "pose"                     # no máximo um gesto ativo por grupo
+    priority: int = 0
+    debounce: int = GESTURE_DEBOUNCE        # frames seguidos de `enter` para ativar
+    release: int = GESTURE_RELEASE          # frames seguidos sem `hold` para desativar
+    on_enter: Optional[str] = None          # ação de GESTURE_ACTIONS disparada ao entrar
+    on_exit: Optional[str] = None           # ação de GESTURE_ACTIONS disparada ao sair
+    handler: Optional[str] = None           # método do GestureController: handler(fase, f, ...)
+    hud: Optional[tuple] = None             # (texto, y, escala, cor, espessura) enquanto ativo
+
+
+def pattern_codes(pattern):
+    """'?1000' -> array bool (NUM_CODES,) com os códigos de dedos que casam."""
+    if len(pattern) != 5 or set(pattern) - set("01?"):
+        raise ValueError(f"Padrão de dedos inválido: {pattern!r}")
+    codes = np.arange(NUM_CODES)
+    match = np.ones(NUM_CODES, dtype=bool)
+    for i, c in enumerate(pattern):
+        if c != "?":
+            match &= ((codes >> i) & 1) == int(c)
+    return match
+
+
+def finger_code(states):
+    """Estados [polegar..mínimo] -> código de 5 bits."""
+    return int(_BITS @ states)
+
+
+class GestureEngine:
+    def __init__(self, rules):
+        self.rules = sorted(rules, key=lambda r: -r.priority)
+        self.groups = list(dict.fromkeys(r.group for r in self.rules))
+        group_of = {g: i for i, g in enumerate(self.groups)}
+        self._group = [group_of[r.group] for r in self.rules]
+
+        # tabela de despacho: código dos dedos -> por grupo, regras candidatas (prioridade desc.)
+        enter_masks = [pattern_codes(r.fingers) for r in self.rules]
+        self._hold_masks = [pattern_codes(r.hold_fingers or r.fingers) for r in self.rules]
+        self._table = [
+            [tuple(i for i, r in enumerate(self.rules) if self._group[i] == g and enter_masks[i][code])
+             for g in range(len(self.groups))]
+            for code in range(NUM_CODES)
+        ]
+
+        self._active = [None] * len(self.groups)    # índice da regra ativa por grupo
+        self._frames = [0] * len(self.groups)       # frames com a regra ativa
+        self._missed = [0] * len(self.groups)       # frames seguidos sem `hold`
+        self._streak = [0] * len(self.rules)        # frames seguidos com `enter`
+        self._seen = [-1] * len(self.rules)         # último frame em que `enter` passou
+        self._frame = 0
+
+    @property
+    def active(self):
+        """Nomes dos gestos ativos, por grupo."""
+        return {self.groups[g]: self.rules[i].name for g, i in enumerate(self._active) if i is not None}
+
+    def _entering(self, i, f, scale):
+        rule = self.rules[i]
+        if rule.enter is not None and not rule.enter(f, scale):
+            return False
+        self._streak[i] = self._streak[i] + 1 if self._seen[i] == self._frame - 1 else 1
+        self._seen[i] = self._frame
+        return self._streak[i] >= rule.debounce
+
+    def _holding(self, i, code, f, scale):
+        rule = self.rules[i]
+        if not self._hold_masks[i][code]:
+            return False
+        check = rule.hold or rule.enter
+        return check is None or check(f, scale)
+
+    def step(self, f, scale=1.0):
+        """Avalia um frame (features já calculadas). Retorna [(regra, fase, frames)]."""
+        self._frame += 1
+        code = finger_code(f.states)
+        events = []
+        for g, candidates in enumerate(self._table[code]):
+            cur = self._active[g]
+            held = cur is not None and self._holding(cur, code, f, scale)
+            # durante a tolerância de `release` o gesto ativo continua bloqueando o grupo
+            blocking = held or (cur is not None and self._missed[g] + 1 < self.rules[cur].release)
+            winner = None
+            for i in candidates:
+                # o gesto ativo só é trocado por outro de prioridade maior
+                if blocking and (i == cur or self.rules[i].priority <= self.rules[cur].priority):
+                    break
+                if self._entering(i, f, scale):
+                    winner = i
+                    break
+
+            if winner is not None:
+                if cur is not None:
+                    events.append((self.rules[cur], EXIT, self._frames[g]))
+                self._active[g], self._frames[g], self._missed[g] = winner, 1, 0
+                events.append((self.rules[winner], ENTER, 1))
+            elif cur is not None:
+                self._missed[g] = 0 if held else self._missed[g] + 1
+                if self._missed[g] >= self.rules[cur].release:
+                    events.append((self.rules[cur], EXIT, self._frames[g]))
+                    self._active[g] = None
+                else:
+                    self._frames[g] += 1
+                    events.append((self.rules[cur], HOLD, self._frames[g]))
+        return events
+
+    def reset(self):
+        """Encerra todos os gestos ativos (mão sumiu, pausa). Retorna os eventos de saída."""
+        events = []
+        for g, cur in enumerate(self._active):
+            if cur is not None:
+                events.append((self.rules[cur], EXIT, self._frames[g]))
+                self._active[g] = None
+        self._streak = [0] * len(self.rules)
+        return events
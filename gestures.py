@@ -0,0 +1,310 @@
+"""
+gestures.py - Lógica de gestos 🖐️
+---------------------------------
+Traduz os landmarks do MediaPipe em ações (GESTURE_ACTIONS) e em
+instruções de HUD (formato em hud.py). Não acessa câmera nem janela,
+então pode rodar em qualquer thread do pipeline.
+
+Os gestos ficam na tabela GESTURE_RULES (fim do arquivo), avaliada
+pelo gesture_engine.GestureEngine; para um gesto novo basta uma regra.
+"""
+
+import time
+
+import numpy as np
+
+from calibration import CalibrationMap, Calibrator, desktop_monitors
+from config import (
+    CURSOR_FILTER, CALIB_PATH, PREDICT_LATENCY, MAX_PREDICTION, FLICKER_FRAMES, POSE_MIN_VOTES,
+    CLICK_DIST, RELEASE_DIST, RIGHT_CLICK_DIST, RIGHT_RELEASE_DIST, NORMALIZE_BY_HAND, PALM_REF_PX, INACTIVITY_TIMEOUT, SENSITIVITY, DOUBLE_CLICK_MAX_INTERVAL, SCROLL_SENSITIVITY,
+)
+from features import HandFeatures, THUMB, INDEX, MIDDLE
+from filters import create_filter
+from gesture_engine import GestureEngine, GestureRule, ENTER, HOLD, EXIT
+from metrics import REGISTRY
+from poses import PoseClassifier
+from trajectory import TrajectoryRecognizer, palm_center
+
+
+class GestureController:
+    """Máquina de estados dos gestos (click, arrastar, scroll, ...)."""
+
+    def __init__(self, actions, screen_size, sensitivity=SENSITIVITY, cursor_filter=CURSOR_FILTER,
+                 rules=None, trajectories=None, poses=None, calibration=None):
+        self.actions = actions
+        self.screen_w, self.screen_h = screen_size
+        self.sensitivity = sensitivity
+        self.paused = False
+
+        # suavização do cursor (filters.py)
+        self.filter_name = cursor_filter
+        self.cursor_filter = create_filter(cursor_filter)
+        self.latency = 0.0
+
+        # estado
+        self.clicando = False
+        self.ultimo_movimento = time.time()
+        self.last_pinch_time = 0
+        self.last_scroll_y = None
+        # câmera -> área de trabalho (todos os monitores): LUT salva ou mapeamento padrão
+        self.calibration = (CalibrationMap.load(CALIB_PATH, desktop_monitors(screen_size))
+                            if calibration is None else calibration)
+        self.calibrator = None
+        self._calib_request = False
+        self.features = HandFeatures()
+        # gestos dinâmicos: templates carregados uma vez (TEMPLATES_PATH + sintéticos)
+        self.trajectories = TrajectoryRecognizer() if trajectories is None else trajectories
+        self._palm = np.zeros(2)
+        # poses gravadas pelo usuário (poses.py): uma regra por pose, k-NN uma vez por frame
+        self.poses = PoseClassifier.load() if poses is None else poses
+        self.pose, self.pose_votes = None, 0.0
+
+        # gestos: tabela compilada uma vez; handlers resolvidos aqui, não por frame
+        rules = GESTURE_RULES if rules is None else rules
+        self.engine = GestureEngine(list(rules) + self._pose_rules())
+        self._handlers = {r.name: getattr(self, r.handler) for r in self.engine.rules if r.handler}
+
+    def _pose_rules(self):
+        # prioridade acima das poses fixas: a pose treinada é mais específica
+        return [
+            GestureRule(name, "?????", priority=50, on_enter=name,
+                        enter=lambda f, s, name=name: self.pose == name and self.pose_votes >= POSE_MIN_VOTES,
+                        hold=lambda f, s, name=name: self.pose == name,
+                        hud=(f"✌️ {name}", 320, 0.7, (255, 150, 50), 2))
+            for name in self.poses.names
+        ]
+
+    # calibragem: pedida por outra thread (comando); a rotina começa no próximo frame
+    def recalibrate(self):
+        self._calib_request = True
+        print("🎯 Calibrando: aponte o indicador para cada canto indicado pelo cursor e segure")
+
+    def _fire(self, name, *args):
+        REGISTRY.inc(f'triggers{{action="{name}"}}')
+        try:
+            self.actions[name](*args)
+        except Exception:
+            pass
+
+    # Função utilitária para invocar ação de scroll com dx/dy
+    def do_scroll(self, delta_y):
+        # maior delta -> mais scroll. Ajuste SCROLL_SENSITIVITY
+        # pyautogui.scroll expects positive integers to scroll up.
+        steps = int(delta_y * SCROLL_SENSITIVITY)
+        if steps != 0:
+            self.actions["scroll"](0, steps)
+
+    def map_to_screen(self, raw_x, raw_y, w, h):
+        """Converte um ponto da imagem (px) para coordenadas de tela."""
+        # sem calibração a sensibilidade define a região útil do frame; calibrado,
+        # a região vem dos cantos e a sensibilidade só ajusta em relação ao padrão
+        gain = self.sensitivity / SENSITIVITY if self.calibration.calibrated else self.sensitivity
+        return self.calibration.map(raw_x / w, raw_y / h, gain)
+
+    def clamp(self, x, y):
+        return self.calibration.clamp(x, y)
+
+    def update(self, hands, w, h, now=None, latency=0.0):
+        """
+        Processa um frame. `hands` é `result.hand_landmarks` (pode ser
+        vazio); `latency` é a idade do frame (s), usada para projetar o
+        cursor. Retorna a lista de instruções de HUD.
+        """
+        now = time.time() if now is None else now
+        self.latency = latency or 0.0
+        hud = []
+
+        if self.paused:
+            hud.append(("text", "⏸️ PAUSADO (pressione 'p' para continuar)", (10, 30),
+                        0.7, (0, 200, 200), 2))
+            # trajetória interrompida pela pausa não é gesto: o EXIT do reset não classifica nada
+            self.trajectories.reset()
+            self._dispatch(self.engine.reset(), now=now)
+            return hud
+
+        if not hands:
+            # mão não detectada: encerra gestos ativos (solta um arraste em andamento)
+            self._dispatch(self.engine.reset(), now=now)
+            if self.calibrator is not None:
+                self.calibrator.lost()
+            if now - self.ultimo_movimento > INACTIVITY_TIMEOUT:
+                hud.append(("text", "⏸️ Mão não detectada - aguardando...", (10, 30),
+                            0.8, (0, 0, 255), 2))
+            else:
+                hud.append(("text", "🔍 Procurando mão...", (10, 30),
+                            0.8, (255, 255, 0), 2))
+            return hud
+
+        self.ultimo_movimento = now
+        if self._calib_request:
+            self._calib_request = False
+            self.calibrator = Calibrator(self.calibration.monitors)
+            self.trajectories.reset()
+            self._dispatch(self.engine.reset(), now=now)
+            self.actions["move"](*self.calibrator.target)
+        if self.calibrator is not None:
+            self._calibrate(hands[0], w, h, now, hud)
+            return hud
+        for lm in hands:
+            self._update_hand(lm, w, h, now, hud)
+        return hud
+
+    def _hand_scale(self, f):
+        # pinch em pixels depende da distância da mão à câmera
+        if NORMALIZE_BY_HAND and f.palm_scale > 0:
+            return f.palm_scale / PALM_REF_PX
+        return 1.0
+
+    def _update_hand(self, lm, w, h, now, hud):
+        t0 = time.perf_counter()
+        f = self.features.compute(lm, w, h)
+        if len(self.poses):
+            self.pose, self.pose_votes, _ = self.poses.predict(f)
+        t0 = REGISTRY.timed("features", t0)
+
+        # uma passada pela tabela de gestos (gesture_engine.py)
+        self._dispatch(self.engine.step(f, self._hand_scale(f)), f, w, h, now, hud)
+
+        # HUD: desenha pontos importantes
+        idx_tip, thumb_tip = f.tip_px(INDEX), f.tip_px(THUMB)
+        hud.append(("circle", idx_tip, 8, (0, 255, 255)))
+        hud.append(("circle", thumb_tip, 8, (0, 200, 0)))
+        hud.append(("circle", f.tip_px(MIDDLE), 6, (255, 100, 0)))
+        hud.append(("line", idx_tip, thumb_tip, (255, 255, 0), 2))
+        REGISTRY.timed("gesture", t0)
+
+    def _calibrate(self, lm, w, h, now, hud):
+        f = self.features.compute(lm, w, h)
+        x, y = f.tip_px(INDEX)
+        cal = self.calibrator
+        if cal.step(x / w, y / h, now):
+            if cal.done:
+                try:
+                    self.calibration = cal.result()
+                except ValueError as e:
+                    print(f"⚠️ Calibração descartada: {e}")
+                else:
+                    self.calibration.save(CALIB_PATH)
+                    self.cursor_filter.reset()
+                    print(f"🎯 Calibração salva em {CALIB_PATH}")
+                self.calibrator = None
+                return
+            self.actions["move"](*cal.target)
+        hud.append(("text", f"🎯 CALIBRANDO {cal.describe()}", (10, 30), 0.7, (0, 200, 255), 2))
+        hud.append(("text", "aponte o indicador para o cursor e segure parado", (10, 60), 0.6, (0, 200, 255), 1))
+        hud.append(("circle", (int(x), int(y)), 8 + int(16 * cal.progress(now)), (0, 200, 255)))
+
+    def _dispatch(self, events, f=None, w=0, h=0, now=0.0, hud=None):
+        for rule, phase, frames in events:
+            if phase == ENTER and rule.on_enter:
+                self._fire(rule.on_enter)
+            elif phase == EXIT:
+                if rule.on_exit:
+                    self._fire(rule.on_exit)
+                # gesto que some em <= FLICKER_FRAMES frames: provável falso positivo
+                if frames <= FLICKER_FRAMES:
+                    REGISTRY.inc(f'false_triggers{{action="{rule.name}"}}')
+            if rule.handler:
+                self._handlers[rule.name](phase, f, w, h, now, hud)
+            if rule.hud and phase != EXIT and hud is not None:
+                text, y, size, color, thickness = rule.hud
+                hud.append(("text", text, (10, y), size, color, thickness))
+
+    # === HANDLERS (fase "enter" | "hold" | "exit") ===
+    def _move(self, phase, f, w, h, now, hud):
+        if phase == EXIT:
+            return
+        # convert index tip x (imagem) para coordenadas de tela
+        idx_tip = f.tip_px(INDEX)
+        mouse_x, mouse_y = self.map_to_screen(idx_tip[0], idx_tip[1], w, h)
+        # suaviza e projeta pela latência do pipeline
+        lead = min(self.latency, MAX_PREDICTION) if PREDICT_LATENCY else 0.0
+        smooth_x, smooth_y = self.cursor_filter.update(mouse_x, mouse_y, now, lead)
+        self.actions["move"](*self.clamp(smooth_x, smooth_y))
+
+    def _pinch(self, phase, f, w, h, now, hud):
+        hud = hud if hud is not None else []
+        if phase == ENTER:
+            # checar intervalo para duplo clique
+            if now - self.last_pinch_time < DOUBLE_CLICK_MAX_INTERVAL:
+                self._fire("pinch_left_double")
+                hud.append(("text", "⚡ DUplo Clique", (10, 80), 0.9, (0, 255, 0), 2))
+                self.last_pinch_time = 0
+            else:
+                # começar clique/arrastar
+                self._fire("pinch_left")
+                self.clicando = True
+                self.last_pinch_time = now
+                hud.append(("text", "🟢 PINCH - CLICANDO/ARRASTANDO", (10, 80), 0.7, (0, 255, 0), 2))
+        elif phase == HOLD:
+            if self.clicando:
+                # já clicando -> mantém mouseDown (arrastar)
+                hud.append(("text", "🟢 ARRASTANDO", (10, 80), 0.7, (0, 255, 0), 2))
+        elif self.clicando:
+            # soltou o pinch (ou a mão sumiu no meio do arraste)
+            self._fire("pinch_left_up")
+            self.clicando = False
+            hud.append(("text", "🔴 SOLTOU", (10, 80), 0.7, (0, 100, 255), 2))
+
+    def _trajectory(self, phase, f, w, h, now, hud):
+        if phase == ENTER:
+            self.trajectories.reset()
+        if phase != EXIT:
+            # centro da palma em frações da largura (x e y na mesma escala)
+            x, y = palm_center(f, out=self._palm)
+            self.trajectories.push(x / w, y / w)
+            return
+        t0 = time.perf_counter()
+        name, dist = self.trajectories.match()
+        REGISTRY.timed("trajectory", t0)
+        if name is not None:
+            self._fire(name)
+            if hud is not None:
+                hud.append(("text", f"〰️ {name} ({dist:.2f})", (10, 280), 0.7, (255, 200, 0), 2))
+
+    def _scroll(self, phase, f, w, h, now, hud):
+        if phase == EXIT:
+            self.last_scroll_y = None
+            return
+        # track movimento vertical do ponto médio dos dois dedos
+        mid_y = int((f.tip_px(INDEX)[1] + f.tip_px(MIDDLE)[1]) / 2)
+        if self.last_scroll_y is not None:
+            dy = self.last_scroll_y - mid_y  # mover a mão pra cima = dy positivo -> scroll up
+            self.do_scroll(dy / 20.0)  # normaliza um pouco
+        self.last_scroll_y = mid_y
+
+
+# === TABELA DE GESTOS ===
+# Dedos: polegar, indicador, médio, anelar, mínimo ("?" = tanto faz).
+# Grupos independentes: "pointer" (cursor), "click" (pinch) e "pose";
+# dentro de "pose" vence a maior prioridade. Distâncias em px na escala
+# de referência da mão (NORMALIZE_BY_HAND).
+GESTURE_RULES = [
+    # 1 dedo (index) -> mover cursor
+    GestureRule("move", "?1000", hold_fingers="?10??", group="pointer", debounce=1,
+                handler="_move", hud=("✋ MOVER", 30, 0.8, (200, 200, 0), 2)),
+    # pinch index+thumb -> left click / drag (solta só acima de RELEASE_DIST)
+    GestureRule("pinch_left", "?????", group="click", debounce=1, release=1,
+                enter=lambda f, s: f.dist(THUMB, INDEX) < CLICK_DIST * s,
+                hold=lambda f, s: f.dist(THUMB, INDEX) < RELEASE_DIST * s,
+                handler="_pinch"),
+    # 2 dedos (index+middle up) -> modo rolagem
+    GestureRule("scroll", "?110?", priority=10, debounce=1,
+                handler="_scroll", hud=("↕️ MODO ROLAGEM", 120, 0.8, (180, 180, 0), 2)),
+    # two-finger pinch (index+middle bem próximos) -> clique direito
+    GestureRule("right_click", "?11??", priority=20,
+                enter=lambda f, s: f.dist(INDEX, MIDDLE) < RIGHT_CLICK_DIST * s,
+                hold=lambda f, s: f.dist(INDEX, MIDDLE) < RIGHT_RELEASE_DIST * s,
+                on_enter="pinch_right_click", hud=("🔘 CLIQUE DIREITO", 160, 0.7, (150, 50, 255), 2)),
+    # 3 dedos abertos -> middle click
+    GestureRule("three_fingers", "?1110", priority=30,
+                on_enter="three_fingers", hud=("🟣 3 DEDOS - MIDDLE CLICK", 200, 0.7, (200, 100, 200), 2)),
+    # 4 dedos (polegar dobrado) -> desenha uma trajetória; ao soltar, DTW contra os
+    # templates (swipe_left/right/up/down, circle_cw/ccw, ...). Prioridade acima de
+    # five_open para o polegar escapando no meio do movimento não abrir o menu.
+    GestureRule("trajectory", "01111", hold_fingers="?1111", priority=45, release=3,
+                handler="_trajectory", hud=("〰️ TRAJETÓRIA", 280, 0.7, (255, 200, 0), 2)),
+    # 5 dedos abertos -> ação especial (ex: abrir start)
+    GestureRule("five_open", "11111", priority=40,
+                on_enter="five_open", hud=("⭐ 5 DEDOS - AÇÃO ESPECIAL", 240, 0.7, (100, 255, 100), 2)),
+]
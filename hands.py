@@ -0,0 +1,194 @@
+"""
+hands.py - Várias mãos com identidade estável 🙌
+-----------------------------------------------
+O MediaPipe devolve as mãos de cada frame sem identidade (a ordem pode
+trocar) e o rótulo Left/Right oscila. O `HandTracker` associa cada
+detecção à trilha mais próxima do frame anterior (centro da palma) e
+decide o lado por votação ao longo dos frames.
+
+O `MultiHandController` tem um GestureController por papel (HAND_ROLES):
+por padrão a mão direita controla o cursor (default_gesture_actions) e a
+esquerda dispara atalhos (left_hand_actions). Cada um tem seu próprio
+motor de gestos, filtros e estado de clique.
+"""
+
+import itertools
+import time
+from collections import Counter
+
+import numpy as np
+
+from config import HAND_MATCH_DIST, HAND_TRACK_TIMEOUT, HAND_ROLES
+from gestures import GestureController
+from trajectory import PALM
+
+
+def hand_center(lm):
+    """Centro da palma normalizado (x, y) de um array (21, 3) ou landmarks do MediaPipe."""
+    if isinstance(lm, np.ndarray):
+        c = lm[PALM, :2].mean(axis=0)
+        return float(c[0]), float(c[1])
+    pts = [lm[i] for i in PALM]
+    return sum(p.x for p in pts) / len(pts), sum(p.y for p in pts) / len(pts)
+
+
+def hand_label(categories, mirrored=False):
+    """
+    Rótulo Left/Right de `result.handedness[i]`. O modelo supõe imagem
+    espelhada (selfie); com `mirrored=True` a imagem não foi flipada e o
+    rótulo vem trocado.
+    """
+    if not categories:
+        return None
+    label = categories[0].category_name
+    if mirrored:
+        label = {"Left": "Right", "Right": "Left"}.get(label, label)
+    return label
+
+
+class HandTrack:
+    def __init__(self, track_id, center, now):
+        self.id = track_id
+        self.center = center
+        self.last_seen = now
+        self.votes = Counter()
+        self.landmarks = None
+
+    @property
+    def label(self):
+        return self.votes.most_common(1)[0][0] if self.votes else None
+
+
+class HandTracker:
+    """Associa detecções a trilhas pelo centro da palma (guloso, poucas mãos)."""
+
+    def __init__(self, max_dist=HAND_MATCH_DIST, timeout=HAND_TRACK_TIMEOUT):
+        self.max_dist = max_dist
+        self.timeout = timeout
+        self.tracks = {}
+        self._ids = itertools.count(1)
+
+    def update(self, hands, handedness=None, now=0.0, mirrored=False):
+        """Retorna as trilhas vistas neste frame (com `.landmarks` preenchido)."""
+        handedness = handedness or [None] * len(hands)
+        centers = [hand_center(lm) for lm in hands]
+        pairs = sorted(
+            (np.hypot(c[0] - t.center[0], c[1] - t.center[1]), i, t.id)
+            for i, c in enumerate(centers) for t in self.tracks.values()
+        )
+        assigned, used = {}, set()
+        for dist, i, tid in pairs:
+            if dist > self.max_dist:
+                break
+            if i in assigned or tid in used:
+                continue
+            assigned[i] = tid
+            used.add(tid)
+
+        seen = []
+        for i, lm in enumerate(hands):
+            tid = assigned.get(i)
+            if tid is None:
+                tid = next(self._ids)
+                self.tracks[tid] = HandTrack(tid, centers[i], now)
+            track = self.tracks[tid]
+            track.center, track.last_seen, track.landmarks = centers[i], now, lm
+            label = hand_label(handedness[i], mirrored)
+            if label is not None:
+                track.votes[label] += 1
+            seen.append(track)
+
+        for tid in [t.id for t in self.tracks.values() if now - t.last_seen > self.timeout]:
+            del self.tracks[tid]
+        return seen
+
+
+class HandSelector:
+    """
+    Uma mão por frame para o GestureController de mão única quando chegam
+    várias detecções (ex.: --cameras 0,1 vê a mesma mão duas vezes):
+    segue a trilha escolhida enquanto ela existir, senão a mais antiga.
+    """
+
+    def __init__(self):
+        self.tracker = HandTracker()
+        self.current = None
+
+    def select(self, hands, now=0.0):
+        tracks = self.tracker.update(hands, now=now)
+        if not tracks:
+            return []
+        track = next((t for t in tracks if t.id == self.current), None) or min(tracks, key=lambda t: t.id)
+        self.current = track.id
+        return [track.landmarks]
+
+
+class MultiHandController:
+    """
+    Um GestureController por papel. Expõe `paused`, `sensitivity`,
+    `filter_name` e `recalibrate` como o GestureController, para os
+    comandos de main.apply_command valerem para as duas mãos.
+    """
+
+    def __init__(self, role_actions, screen_size, roles=HAND_ROLES, **kwargs):
+        self.roles = roles
+        self.controllers = {role: GestureController(actions, screen_size, **kwargs)
+                            for role, actions in role_actions.items()}
+        self.primary = self.controllers[next(iter(role_actions))]
+        self.tracker = HandTracker()
+
+    @property
+    def paused(self):
+        return self.primary.paused
+
+    @paused.setter
+    def paused(self, value):
+        for c in self.controllers.values():
+            c.paused = value
+
+    @property
+    def sensitivity(self):
+        return self.primary.sensitivity
+
+    @sensitivity.setter
+    def sensitivity(self, value):
+        for c in self.controllers.values():
+            c.sensitivity = value
+
+    @property
+    def filter_name(self):
+        return self.primary.filter_name
+
+    def recalibrate(self):
+        # só a mão principal calibra; o resultado é copiado para as outras em `update`
+        self.primary.recalibrate()
+
+    def update(self, hands, w, h, now=None, latency=0.0, handedness=None, mirrored=False):
+        now = time.time() if now is None else now
+        tracks = self.tracker.update(hands, handedness, now, mirrored)
+        # uma mão por papel: a trilha mais antiga com aquele lado vence
+        by_role = {}
+        for track in sorted(tracks, key=lambda t: t.id):
+            role = self.roles.get(track.label)
+            if role in self.controllers and role not in by_role:
+                by_role[role] = track
+        # sem rótulo (ex.: replay sem handedness): ocupa os papéis livres, em ordem
+        free = [r for r in self.controllers if r not in by_role]
+        for track in sorted(tracks, key=lambda t: t.id):
+            if free and track not in by_role.values() and track.label is None:
+                by_role[free.pop(0)] = track
+
+        for c in self.controllers.values():
+            c.calibration = self.primary.calibration
+        hud = []
+        for i, (role, controller) in enumerate(self.controllers.items()):
+            track = by_role.get(role)
+            out = controller.update([track.landmarks] if track else [], w, h, now, latency)
+            if i and not track:
+                continue   # só a mão principal mostra "Procurando mão..."
+            for op in out:
+                if op[0] == "text" and i:
+                    # textos da segunda mão na metade direita da tela
+                    op = (op[0], f"[{role}] {op[1]}", (op[2][0] + w // 2, op[2][1])) + op[3:]
+                hud.append(op)
+        return hud
@@ -0,0 +1,103 @@
+"""
+hud.py - HUD desacoplado do pipeline 🖼️
+---------------------------------------
+O `HudRenderer` roda em thread própria, na taxa HUD_FPS, e desenha só
+o último pacote publicado pela thread principal. Teclas da janela viram
+comandos em control.ControlInput. Em --headless nada disso é criado.
+
+HUD: lista de tuplas geradas pelo GestureController:
+  ("text", texto, (x, y), escala, cor, espessura)
+  ("circle", (x, y), raio, cor)
+  ("line", (x1, y1), (x2, y2), cor, espessura)
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from config import HUD_FPS
+from control import KEY_COMMANDS
+from frames import BufferPool, mirror_roi
+from metrics import REGISTRY
+
+WINDOW_NAME = "Gesture Control - Robust"
+
+
+def draw_hud(frame, hud):
+    """Desenha no frame as instruções geradas pelo GestureController."""
+    for op in hud:
+        kind = op[0]
+        if kind == "text":
+            _, text, org, scale, color, thickness = op
+            cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        elif kind == "circle":
+            _, center, radius, color = op
+            cv2.circle(frame, center, radius, color, -1)
+        elif kind == "line":
+            _, p1, p2, color, thickness = op
+            cv2.line(frame, p1, p2, color, thickness)
+
+
+class HudRenderer(threading.Thread):
+    """
+    `publish(pkt)` só troca a referência do último pacote (barato para a
+    thread principal). `status(pkt)` devolve as linhas de rodapé e é
+    chamado aqui, na taxa do HUD.
+    """
+
+    def __init__(self, control, status=None, fps=HUD_FPS):
+        super().__init__(name="hud", daemon=True)
+        self.control = control
+        self.status = status
+        self.interval = 1.0 / fps
+        self._latest = None
+        self._stop_event = threading.Event()
+        self._pool = BufferPool(size=1)  # HUD desenhado sempre no mesmo buffer
+        self.frames = 0
+
+    def publish(self, pkt):
+        self._latest = pkt
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        self.join(timeout)
+
+    def render(self, pkt):
+        frame = self._pool.get(pkt.frame.shape)
+        if pkt.mirrored:
+            # espelhamento só para exibição: landmarks/HUD já estão espelhados
+            cv2.flip(pkt.frame, 1, dst=frame)
+        else:
+            np.copyto(frame, pkt.frame)
+        draw_hud(frame, pkt.hud)
+        if pkt.roi is not None:
+            roi = mirror_roi(pkt.roi, frame.shape[1]) if pkt.mirrored else pkt.roi
+            x0, y0, rw, rh = roi
+            cv2.rectangle(frame, (x0, y0), (x0 + rw, y0 + rh), (90, 90, 90), 1)
+        if self.status is not None:
+            # mostra configurações atuais em tela (de baixo para cima)
+            for i, line in enumerate(self.status(pkt)):
+                cv2.putText(frame, line, (10, frame.shape[0] - 10 - 25 * i),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (220, 220, 220), 1)
+        return frame
+
+    def run(self):
+        shown = None
+        try:
+            while not self._stop_event.is_set():
+                t0 = time.perf_counter()
+                pkt = self._latest
+                if pkt is not None and pkt is not shown:
+                    cv2.imshow(WINDOW_NAME, self.render(pkt))
+                    REGISTRY.timed("render", t0)
+                    shown = pkt
+                    self.frames += 1
+                # waitKey também faz o ritmo do HUD
+                wait_ms = max(1, int((self.interval - (time.perf_counter() - t0)) * 1000))
+                key = cv2.waitKey(wait_ms) & 0xFF
+                if key in KEY_COMMANDS:
+                    self.control.put(KEY_COMMANDS[key])
+        finally:
+            cv2.destroyAllWindows()
@@ -8,314 +8,301 @@
 # 5 dedos = abrir menu iniciar (Windows). Teclas:
 #   ESC = sair
 #   p   = pausar/resumir detecção
-#   c   = recalibrar (central region)
+#   c   = calibrar (cantos dos monitores, calibration.py)
 #   + / - = ajustar sensibilidade
 #
-# Ajuste as constantes no bloco CONFIG conforme preferir.
+# Ajuste as constantes no bloco CONFIG (config.py) conforme preferir.
+#
+# O loop roda em pipeline (pipeline.py): captura, inferência e gestos em
+# threads separadas com filas de profundidade 1. O HUD (hud.py) roda em
+# outra thread, numa taxa menor; com --headless não há janela e o
+# controle vem do stdin ou de um socket local (control.py).
+#
+# Métricas por estágio (metrics.py): --metrics-jsonl / --metrics-port,
+# ou DEBUG = True para um resumo periódico no terminal.
+#
+# Várias mãos (hands.py): --hands 2 (direita = cursor, esquerda = atalhos).
+# Várias câmeras (farm.py): --cameras 0,1, um detector por processo.
+#
+# Inicialização (startup.py): câmera e modelo abrem em paralelo, o modelo é
+# aquecido num frame preto e o tempo de cada fase é impresso no início.
 
-import cv2
-import numpy as np
-import pyautogui
 import time
-from collections import deque
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-from mediapipe import Image, ImageFormat
-
-# === CONFIGURAÇÕES ===
-DEBUG = False
-SMOOTHING_FRAMES = 6
-CLICK_DIST = 35          # distancia (px) para considerar pinch = click
-RELEASE_DIST = 55        # distancia para soltar clique
-MOVE_DURATION = 0        # 0 para mover instantâneo
-INACTIVITY_TIMEOUT = 8   # segundos para mensagem "pausado"
-SENSITIVITY = 1.6        # multiplicador da posição do cursor
-DOUBLE_CLICK_MAX_INTERVAL = 0.35  # segundos
-SCROLL_SENSITIVITY = 8   # quanto rola por unidade de movimento
-MODEL_PATH = "hand_landmarker.task"  # seu modelo
-
-# Mapeamento de gestos -> ações (padrões)
-# Você pode alterar: 'five_open' por qualquer função que chame pyautogui
-def default_gesture_actions():
-    return {
-        "pinch_left": lambda: pyautogui.mouseDown(),                # começar arrastar / clicar
-        "pinch_left_up": lambda: pyautogui.mouseUp(),               # soltar arrastar
-        "pinch_left_click": lambda: pyautogui.click(),              # click simples
-        "pinch_left_double": lambda: pyautogui.doubleClick(),       # duplo click
-        "pinch_right_click": lambda: pyautogui.click(button="right"),
-        "three_fingers": lambda: pyautogui.click(button="middle"),
-        "five_open": lambda: pyautogui.press("win"),                # abrir menu iniciar no Windows
-        "scroll": lambda dx, dy: pyautogui.scroll(int(dy)),        # dy positivo = scroll up
-    }
-
-GESTURE_ACTIONS = default_gesture_actions()
-
-# === SETUP MEDIAPIPE ===
-BaseOptions = python.BaseOptions
-VisionRunningMode = vision.RunningMode
-HandLandmarker = vision.HandLandmarker
-HandLandmarkerOptions = vision.HandLandmarkerOptions
-
-options = HandLandmarkerOptions(
-    base_options=BaseOptions(model_asset_path=MODEL_PATH),
-    running_mode=VisionRunningMode.IMAGE,
-    num_hands=1
+
+T_START = time.perf_counter()   # início dos imports (relatório de inicialização)
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from actuation import (
+    Actuator, BACKENDS, create_backend, default_gesture_actions, left_hand_actions, launcher_actions,
+)
+from control import ControlInput
+from config import (
+    QUEUE_DEPTH, CAMERA_INDEX, RUNNING_MODE, CURSOR_FILTER, ACTUATION_BACKEND, IDLE_ENABLED,
+    MIRROR_LANDMARKS, HUD_FPS, CONTROL_PORT, METRICS_PORT, DEBUG, NUM_HANDS, GESTURE_COMMANDS,
 )
-detector = HandLandmarker.create_from_options(options)
-
-screen_w, screen_h = pyautogui.size()
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("❌ Erro: não foi possível acessar a webcam.")
-    exit()
-
-print("✅ Webcam conectada. Gestos ativos.")
-print("Teclas: ESC sair | p pausar | c recalibrar | + / - ajuste sensibilidade\n")
-
-# === HELPERS ===
-def distancia(p1, p2):
-    return np.linalg.norm(np.array(p1) - np.array(p2))
-
-# determina quais dedos estão "up"
-# landmarks: lista de landmarks com atributos .x, .y (normalized)
-def fingers_up(landmarks, img_w, img_h):
-    # tip indices
-    tips = [4, 8, 12, 16, 20]
-    pip = [3, 6, 10, 14, 18]  # use "pip" or ip joint for comparison
-    states = []
-    # para polegar, comparar em x (pois polegar abre lateralmente). Depende de mão.
-    # Como a imagem foi flipada (espelhada), tentaremos inferir pela posição relativa do polegar.
-    # Simples heurística: se tip.x < pip.x -> polegar "aberto" (apontando pra esquerda na imagem espelhada)
-    for i, t in enumerate(tips):
-        tip = landmarks[t]
-        base = landmarks[pip[i]]
-        if i == 0:
-            # polegar
-            states.append(tip.x < base.x)  # True = aberto
+from farm import DetectorFarm
+from filters import FILTERS
+from gestures import GestureController
+from hands import HandSelector, MultiHandController
+from hud import HudRenderer
+from metrics import REGISTRY, MetricsExporter
+from pipeline import Pipeline, FrameSource
+from power import PowerScheduler, PoweredCapture, NO_HANDS
+from recorder import LandmarkRecorder
+from startup import StartupTimer, load_camera_cache, load_detector, open_camera
+
+# nomes dos modos de detector.RUNNING_MODES, sem importar o mediapipe antes da hora
+RUNNING_MODES = ("image", "video", "live_stream")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gesture Mouse Controller")
+    parser.add_argument("--mode", choices=list(RUNNING_MODES), default=RUNNING_MODE,
+                        help="modo do HandLandmarker (padrão: %(default)s)")
+    parser.add_argument("--no-roi", dest="roi", action="store_false",
+                        help="envia o frame inteiro ao detector (sem recorte da mão)")
+    parser.add_argument("--flip-image", dest="mirror_landmarks", action="store_false",
+                        default=MIRROR_LANDMARKS,
+                        help="flipa cada frame em vez de espelhar só os landmarks")
+    parser.add_argument("--filter", choices=list(FILTERS), default=CURSOR_FILTER,
+                        help="filtro de suavização do cursor (padrão: %(default)s)")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=ACTUATION_BACKEND,
+                        help="backend de mouse/teclado (padrão: %(default)s)")
+    parser.add_argument("--no-idle", dest="idle", action="store_false", default=IDLE_ENABLED,
+                        help="não entra no modo econômico quando a mão some")
+    parser.add_argument("--headless", action="store_true",
+                        help="sem janela/HUD; controle via stdin ou --control-port")
+    parser.add_argument("--hud-fps", type=float, default=HUD_FPS,
+                        help="taxa de atualização do HUD (padrão: %(default)s)")
+    parser.add_argument("--control-port", type=int, default=CONTROL_PORT,
+                        help="porta TCP local para comandos (0 = desligado)")
+    parser.add_argument("--record", metavar="ARQUIVO.npy",
+                        help="grava os landmarks para replay/benchmark (bench.py)")
+    parser.add_argument("--metrics-jsonl", metavar="ARQUIVO.jsonl",
+                        help="grava um snapshot das métricas a cada METRICS_INTERVAL s")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="porta local do endpoint Prometheus /metrics (0 = desligado)")
+    parser.add_argument("--hands", type=int, default=NUM_HANDS,
+                        help="mãos rastreadas; com 2, a esquerda dispara atalhos (padrão: %(default)s)")
+    parser.add_argument("--cameras", default=str(CAMERA_INDEX),
+                        help="índices das câmeras separados por vírgula (padrão: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def apply_command(controller, name, arg=None):
+    """Aplica um comando (teclado, stdin ou socket). Retorna False para sair."""
+    if name == "quit":
+        print("👋 Encerrando...")
+        return False
+    elif name == "pause":
+        controller.paused = not controller.paused
+        print("⏸️ Pausado" if controller.paused else "▶️ Retomado")
+    elif name == "recalibrate":
+        # cantos de cada monitor -> homografia/LUT salva em CALIB_PATH (calibration.py)
+        controller.recalibrate()
+    elif name == "sens+":
+        controller.sensitivity += 0.1
+        print(f"🔧 Sensibilidade: {controller.sensitivity:.2f}")
+    elif name == "sens-":
+        controller.sensitivity = max(0.3, controller.sensitivity - 0.1)
+        print(f"🔧 Sensibilidade: {controller.sensitivity:.2f}")
+    elif name == "sens":
+        controller.sensitivity = max(0.3, arg)
+        print(f"🔧 Sensibilidade: {controller.sensitivity:.2f}")
+    return True
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    timer = StartupTimer(T_START)
+    timer.mark("imports")
+    cameras = [int(c) for c in args.cameras.split(",")]
+    detector = cap = farm = None
+
+    # === INICIALIZAÇÃO: câmera e modelo em paralelo com o backend de atuação ===
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+        if len(cameras) > 1:
+            # um HandLandmarker por câmera, cada um no seu processo (aquecido no worker)
+            farm_job = pool.submit(timer.run, "câmeras", lambda: DetectorFarm(
+                cameras, mode=args.mode, roi=args.roi, num_hands=args.hands).start())
         else:
-            # dedos: comparando y (na imagem, y menor = dedo erguido)
-            states.append(tip.y < base.y)
-    return states  # [thumb, index, middle, ring, pinky] -> booleans
-
-# smooth queue
-pos_x = deque(maxlen=SMOOTHING_FRAMES)
-pos_y = deque(maxlen=SMOOTHING_FRAMES)
-
-# estado
-clicando = False
-paused = False
-ultimo_movimento = time.time()
-last_pinch_time = 0
-last_pinched = False
-last_left_click_time = 0
-last_scroll_y = None
-calib_offset = (0, 0)
-sensitivity = SENSITIVITY
-
-# calibragem: define offset (centro neutro) com a mão em posição desejada
-def recalibrate(center_x, center_y):
-    global calib_offset, pos_x, pos_y
-    calib_offset = (center_x, center_y)
-    pos_x.clear()
-    pos_y.clear()
-    print(f"🔧 Recalibrado para offset {calib_offset}")
-
-# Função utilitária para invocar ação de scroll com dx/dy
-def do_scroll(delta_y):
-    # maior delta -> mais scroll. Ajuste SCROLL_SENSITIVITY
-    # pyautogui.scroll expects positive integers to scroll up.
-    steps = int(delta_y * SCROLL_SENSITIVITY)
-    if steps != 0:
-        GESTURE_ACTIONS["scroll"](0, steps)
-
-# === LOOP PRINCIPAL ===
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        continue
-
-    frame = cv2.flip(frame, 1)  # espelhar para comportamento tipo espelho
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    mp_image = Image(image_format=ImageFormat.SRGB, data=rgb)
-    result = detector.detect(mp_image)
-    h, w, _ = frame.shape
-    now = time.time()
-
-    if paused:
-        cv2.putText(frame, "⏸️ PAUSADO (pressione 'p' para continuar)", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 200), 2)
-        last_scroll_y = None
+            # aquece na resolução da última execução, se conhecida
+            cached = load_camera_cache().get(str(cameras[0]), {})
+            shape = (cached.get("height", 480), cached.get("width", 640), 3)
+            model_job = pool.submit(load_detector, timer, shape,
+                                    mode=args.mode, roi=args.roi, num_hands=args.hands)
+            camera_job = pool.submit(timer.run, "câmera", open_camera, cameras[0])
+
+        # Mapeamento de gestos -> ações: ver actuation.default_gesture_actions
+        with timer.phase("atuação"):
+            actuator = Actuator(create_backend(args.backend)).start()
+            gesture_actions = default_gesture_actions(actuator)
+            # gestos que abrem/fecham apps pelo serviço compartilhado (commands.py)
+            gesture_actions.update(launcher_actions(GESTURE_COMMANDS))
+            screen_w, screen_h = actuator.backend.size()
+
+        if len(cameras) > 1:
+            try:
+                farm = farm_job.result()
+            except RuntimeError as e:
+                print(f"❌ Erro: {e}")
+                actuator.stop()
+                exit()
+        else:
+            cap, cam_info, from_cache = camera_job.result()
+            if cap is None:
+                print("❌ Erro: não foi possível acessar a webcam.")
+                # o modelo pode ainda estar carregando: espera e fecha antes de sair
+                model_job.cancel()
+                if not model_job.cancelled() and model_job.exception() is None:
+                    model_job.result().close()
+                actuator.stop()
+                exit()
+            detector = model_job.result()
+            print(f"📷 Câmera {cameras[0]}: {cam_info['backend']} {cam_info['width']}x{cam_info['height']}"
+                  f" @ {cam_info['fps']:.0f} fps{' (cache)' if from_cache else ''}")
+
+    # tempo até o primeiro movimento do cursor (métrica de kiosk): marcado uma vez
+    move = gesture_actions["move"]
+
+    def first_move(*a):
+        gesture_actions["move"] = move
+        print(f"⏱️ Primeiro movimento do cursor: {timer.mark('1º movimento'):.2f} s")
+        return move(*a)
+
+    gesture_actions["move"] = first_move
+
+    print(f"✅ {len(cameras)} câmera(s) conectada(s). Gestos ativos (modo {args.mode}, {args.hands} mão(s)).")
+    print("Teclas: ESC sair | p pausar | c recalibrar | + / - ajuste sensibilidade")
+    print("(também via stdin: pause, recalibrate, sens+, sens-, sens <valor>, quit)\n")
+
+    if args.hands > 1:
+        controller = MultiHandController(
+            {"right": gesture_actions, "left": {**left_hand_actions(actuator), **launcher_actions(GESTURE_COMMANDS)}},
+            (screen_w, screen_h), cursor_filter=args.filter,
+        )
+    else:
+        controller = GestureController(gesture_actions, (screen_w, screen_h), cursor_filter=args.filter)
+    # a fazenda junta as mãos de todas as câmeras: com uma mão só, escolhe uma por frame
+    selector = HandSelector() if farm is not None and args.hands == 1 else None
+    recorder = LandmarkRecorder(args.record) if args.record else None
+    # o modo econômico depende da captura no processo principal (uma câmera)
+    power = PowerScheduler() if args.idle and farm is None else None
+
+    # === ESTÁGIOS ===
+    if farm is not None:
+        source, source_pool = farm, farm.pool
     else:
-        if result.hand_landmarks:
-            ultimo_movimento = now
-            for hand_landmarks in result.hand_landmarks:
-                lm = hand_landmarks
-                # converter landmarks normalizados para coordenadas de imagem
-                lms = [(int(pt.x * w), int(pt.y * h)) for pt in lm]
-                # Pega pontos relevantes
-                idx_tip = lms[8]
-                thumb_tip = lms[4]
-                mid_tip = lms[12]
-
-                # detectar dedos up via lógica simples (usa normalized coords)
-                # precisamos da versão normalizada para fingers_up
-                normalized = lm
-                fstates = fingers_up(normalized, w, h)  # [thumb, index, middle, ring, pinky]
-
-                # DISTÂNCIAS
-                d_thumb_index = distancia(idx_tip, thumb_tip)
-                d_index_middle = distancia(idx_tip, mid_tip)
-
-                # === MAPEAMENTO DE GESTOS ===
-                # 1 dedo (index) -> mover cursor
-                if fstates[1] and not any([fstates[2], fstates[3], fstates[4]]):
-                    # mover
-                    # convert index tip x (imagem) para coordenadas de tela
-                    raw_x = idx_tip[0]
-                    raw_y = idx_tip[1]
-                    # ajuste sensibilidade e calibragem
-                    # normaliza em relação ao frame e aplica multiplicador
-                    mouse_x = np.interp(raw_x, (0, w), (0, screen_w * sensitivity)) - calib_offset[0]
-                    mouse_y = np.interp(raw_y, (0, h), (0, screen_h * sensitivity)) - calib_offset[1]
-                    # clamp
-                    mouse_x = min(max(mouse_x, 0), screen_w)
-                    mouse_y = min(max(mouse_y, 0), screen_h)
-                    # suaviza
-                    pos_x.append(mouse_x)
-                    pos_y.append(mouse_y)
-                    avg_x = np.mean(pos_x)
-                    avg_y = np.mean(pos_y)
-                    pyautogui.moveTo(avg_x, avg_y, duration=MOVE_DURATION)
-                    cv2.putText(frame, "✋ MOVER", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200, 200, 0), 2)
-                    last_scroll_y = None
-
-                # 1.1 pinch index+thumb -> left click / drag
-                if d_thumb_index < CLICK_DIST:
-                    # se não estava clicando, e pinch rápido recente -> double click
-                    if not clicando:
-                        # checar intervalo para duplo clique
-                        if now - last_pinch_time < DOUBLE_CLICK_MAX_INTERVAL:
-                            # duplo clique
-                            try:
-                                GESTURE_ACTIONS["pinch_left_double"]()
-                            except Exception:
-                                pass
-                            cv2.putText(frame, "⚡ DUplo Clique", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-                            last_pinch_time = 0
-                        else:
-                            # começar clique/arrastar
-                            try:
-                                GESTURE_ACTIONS["pinch_left"]()
-                            except Exception:
-                                pass
-                            clicando = True
-                            last_pinch_time = now
-                            cv2.putText(frame, "🟢 PINCH - CLICANDO/ARRASTANDO", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    else:
-                        # já clicando -> mantém mouseDown (arrastar)
-                        cv2.putText(frame, "🟢 ARRASTANDO", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                else:
-                    # se soltou o pinch
-                    if clicando:
-                        try:
-                            GESTURE_ACTIONS["pinch_left_up"]()
-                        except Exception:
-                            pass
-                        clicando = False
-                        cv2.putText(frame, "🔴 SOLTOU", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 100, 255), 2)
-
-                # 2 dedos (index+middle up) -> modo rolagem
-                if fstates[1] and fstates[2] and not fstates[3]:
-                    cv2.putText(frame, "↕️ MODO ROLAGEM", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (180, 180, 0), 2)
-                    # track movimento vertical do ponto médio dos dois dedos
-                    mid_x = int((idx_tip[0] + mid_tip[0]) / 2)
-                    mid_y = int((idx_tip[1] + mid_tip[1]) / 2)
-                    if last_scroll_y is None:
-                        last_scroll_y = mid_y
-                    else:
-                        dy = last_scroll_y - mid_y  # mover a mão pra cima = dy positivo -> scroll up
-                        do_scroll(dy / 20.0)  # normaliza um pouco
-                        last_scroll_y = mid_y
-                else:
-                    last_scroll_y = None
-
-                # two-finger pinch (index+middle bem próximos) -> clique direito
-                if fstates[1] and fstates[2] and distancia(idx_tip, mid_tip) < 40:
-                    # clique direito "instantâneo"
-                    cv2.putText(frame, "🔘 CLIQUE DIREITO", (10, 160), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (150, 50, 255), 2)
-                    # agir apenas quando detectar a transição (para não spam)
-                    if not last_pinched:
-                        try:
-                            GESTURE_ACTIONS["pinch_right_click"]()
-                        except Exception:
-                            pass
-                        last_pinched = True
-                else:
-                    last_pinched = False
-
-                # 3 dedos abertos -> middle click
-                if fstates[1] and fstates[2] and fstates[3] and not fstates[4]:
-                    cv2.putText(frame, "🟣 3 DEDOS - MIDDLE CLICK", (10, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 100, 200), 2)
-                    # trigger apenas na transição
-                    if not getattr(do_three_click := globals().get("_three_triggered", False), "value", False):
-                        try:
-                            GESTURE_ACTIONS["three_fingers"]()
-                        except Exception:
-                            pass
-                        globals()["_three_triggered"] = True
-                else:
-                    globals()["_three_triggered"] = False
-
-                # 5 dedos abertos -> ação especial (ex: abrir start)
-                if all(fstates):
-                    cv2.putText(frame, "⭐ 5 DEDOS - AÇÃO ESPECIAL", (10, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 255, 100), 2)
-                    # trigger na transição
-                    if not getattr(globals().get("_five_triggered", False), "value", False):
-                        try:
-                            GESTURE_ACTIONS["five_open"]()
-                        except Exception:
-                            pass
-                        globals()["_five_triggered"] = True
-                else:
-                    globals()["_five_triggered"] = False
-
-                # HUD: desenha pontos importantes
-                cv2.circle(frame, idx_tip, 8, (0, 255, 255), -1)
-                cv2.circle(frame, thumb_tip, 8, (0, 200, 0), -1)
-                cv2.circle(frame, mid_tip, 6, (255, 100, 0), -1)
-                cv2.line(frame, idx_tip, thumb_tip, (255, 255, 0), 2)
+        source = FrameSource(cap, flip=not args.mirror_landmarks)
+        source_pool = source.pool
+    if power is not None:
+        source = PoweredCapture(source, cap, power)
+
+    def infer(pkt):
+        if farm is not None:
+            return pkt   # inferência já feita nos workers
+        # em idle, só roda o HandLandmarker se o gate de movimento disparar
+        if power is not None and not power.should_infer(pkt.frame):
+            pkt.result = NO_HANDS
+            pkt.t_infer = time.time()
+            pkt.latency = pkt.t_infer - pkt.t_capture
+            return pkt
+        return detector.process(pkt)
 
+    def gesture(pkt):
+        h, w, _ = pkt.frame.shape
+        hands = pkt.result.hand_landmarks
+        if power is not None:
+            power.observe(bool(hands), pkt.t_infer)
+        if recorder is not None:
+            recorder.add(pkt.t_capture, w, h, hands)
+        if args.hands > 1:
+            pkt.hud = controller.update(hands, w, h, pkt.t_infer, pkt.latency,
+                                        handedness=pkt.result.handedness, mirrored=pkt.mirrored)
         else:
-            # mão não detectada
-            if now - ultimo_movimento > INACTIVITY_TIMEOUT:
-                cv2.putText(frame, "⏸️ Mão não detectada - aguardando...", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-            else:
-                cv2.putText(frame, "🔍 Procurando mão...", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
-
-    # mostra configurações atuais em tela
-    cv2.putText(frame, f"SENS: {sensitivity:.2f}  |  SMOOTH: {SMOOTHING_FRAMES}", (10, frame.shape[0]-10),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (220, 220, 220), 1)
-
-    cv2.imshow("Gesture Control - Robust", frame)
-
-    key = cv2.waitKey(1) & 0xFF
-    if key == 27:  # ESC
-        print("👋 Encerrando...")
-        break
-    elif key == ord('p'):
-        paused = not paused
-        print("⏸️ Pausado" if paused else "▶️ Retomado")
-    elif key == ord('c'):
-        # recalibra com centro da tela atual do cursor (usuário posiciona a mão no centro do frame e pressiona c)
-        recalibrate(0, 0)  # aqui usamos 0/0 pois já mapearmos absoluto; mantive placeholder
-    elif key == ord('+') or key == ord('='):
-        sensitivity += 0.1
-        print(f"🔧 Sensibilidade: {sensitivity:.2f}")
-    elif key == ord('-') or key == ord('_'):
-        sensitivity = max(0.3, sensitivity - 0.1)
-        print(f"🔧 Sensibilidade: {sensitivity:.2f}")
-
-cap.release()
-cv2.destroyAllWindows()
+            if selector is not None:
+                hands = selector.select(hands, pkt.t_infer)
+            pkt.hud = controller.update(hands, w, h, pkt.t_infer, pkt.latency)
+        pkt.t_gesture = time.time()
+        return pkt
+
+    pipeline = Pipeline(source, infer, gesture, depth=QUEUE_DEPTH)
+    if detector is not None:
+        # live_stream: o callback do MediaPipe entrega o resultado direto ao estágio de gestos
+        detector.on_result = pipeline.queues["inference"].put
+    pipeline.start()
+
+    # === MÉTRICAS ===
+    REGISTRY.add_collector(lambda: {
+        "dropped_frames": pipeline.dropped,
+        "actuation_queue_depth": actuator.depth,
+        "power_idle": int(power is not None and power.idle),
+    })
+    exporter = None
+    if args.metrics_jsonl or args.metrics_port or DEBUG:
+        exporter = MetricsExporter(jsonl_path=args.metrics_jsonl, port=args.metrics_port)
+        exporter.start()
+
+    # === HUD (thread própria) E CONTROLE ===
+    control = ControlInput(port=args.control_port).start()
+
+    def status(pkt):
+        power_state = power.state.upper() if power is not None else "ACTIVE"
+        return [
+            f"SENS: {controller.sensitivity:.2f}  |  FILTRO: {controller.filter_name}  |  {power_state}",
+            f"LAT: {pkt.latency * 1000:.0f}ms  |  DROP: {pipeline.dropped}  |  FILA: {actuator.depth}",
+        ]
+
+    hud = None
+    if not args.headless:
+        hud = HudRenderer(control, status, fps=args.hud_fps)
+        hud.start()
+
+    # === LOOP PRINCIPAL (saída do pipeline + comandos) ===
+    try:
+        running = True
+        while running:
+            if pipeline.error is not None:
+                raise pipeline.error
+            if actuator.error is not None:
+                raise actuator.error
+
+            pkt = pipeline.get(timeout=0.05)
+            if pkt is not None and "1º frame" not in timer.marks:
+                timer.mark("1º frame")
+                timer.report()
+            if pkt is not None and hud is not None:
+                hud.publish(pkt)
+
+            for name, arg in control.poll():
+                running = apply_command(controller, name, arg) and running
+    finally:
+        if hud is not None:
+            hud.stop()
+        if exporter is not None:
+            exporter.stop()
+        control.stop()
+        pipeline.stop()
+        stats = pipeline.stats()
+        actuator.stop()
+        print(f"📊 Frames descartados: {pipeline.dropped} {stats['dropped']}")
+        print(f"🖱️ Atuação: {actuator.stats()}")
+        if farm is not None:
+            print(f"♻️ Buffers alocados: {source_pool.allocations} | frames descartados nas câmeras: {farm.dropped}")
+        else:
+            print(f"♻️ Buffers alocados: captura={source_pool.allocations} detector={detector.pool.allocations}")
+        if power is not None:
+            print(f"💤 Inferências puladas em idle: {power.skipped} | despertares: {power.wakeups}")
+        if recorder is not None:
+            recorder.close()
+        if farm is not None:
+            farm.close()
+        else:
+            detector.close()
+            cap.release()
+
+
+if __name__ == "__main__":
+    main()
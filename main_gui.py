@@ -1,12 +1,14 @@
 import flet as ft
-import speech_recognition as sr
-from commands import run_command
+from commands import run_command, serve
+from voice import VoicePipeline
 
 def main(page: ft.Page):
     page.title = "Clap Assistant Pro"
     page.theme_mode = "dark"
     page.window_width = 500
     page.window_height = 600
+    # a GUI hospeda o serviço de lançamento; palmas (vshandle.py) e gestos viram clientes
+    serve()
 
     output = ft.Text("👋 Pronto para receber comandos.")
     command_box = ft.TextField(label="Digite um comando (ex: abrir vscode)", width=400, autofocus=True)
@@ -23,21 +25,35 @@ def main(page: ft.Page):
             command_box.value = ""
             page.update()
 
+    # escuta contínua em segundo plano: VAD corta as falas e o texto vem da thread de voz
+    voice_states = {"ouvindo": "🎙️ Ouvindo...", "falando": "🗣️ Falando...", "reconhecendo": "⏳ Reconhecendo..."}
+
+    def on_voice_text(cmd):
+        output.value = f"🎧 Você disse: {cmd}"
+        page.update()
+        execute_command(cmd)
+
+    def on_voice_state(state):
+        if state == "parado":
+            voice_button.text = "🎤 Falar"
+            output.value = f"❌ Erro: {voice.error}" if voice.error else "🔇 Microfone desligado."
+        else:
+            output.value = voice_states[state]
+        page.update()
+
+    voice = VoicePipeline(on_voice_text, on_voice_state)
+
     def handle_voice_command(e):
-        recognizer = sr.Recognizer()
-        with sr.Microphone() as source:
-            output.value = "🎙️ Ouvindo..."
-            page.update()
-            audio = recognizer.listen(source)
-        try:
-            cmd = recognizer.recognize_google(audio, language="pt-BR")
-            output.value = f"🎧 Você disse: {cmd}"
-            page.update()
-            execute_command(cmd)
-        except Exception as err:
-            output.value = f"❌ Erro: {err}"
+        if voice.running:
+            voice.stop(wait=False)   # o estado "parado" chega pela thread de voz
+        else:
+            voice.error = None
+            voice.start()
+            voice_button.text = "🔇 Parar"
             page.update()
 
+    voice_button = ft.ElevatedButton("🎤 Falar", on_click=handle_voice_command)
+
     page.add(
         ft.Column(
             [
@@ -46,7 +62,7 @@ def main(page: ft.Page):
                 ft.Row(
                     [
                         ft.ElevatedButton("Enviar", on_click=handle_text_command),
-                        ft.ElevatedButton("🎤 Falar", on_click=handle_voice_command),
+                        voice_button,
                     ],
                     alignment=ft.MainAxisAlignment.CENTER,
                 ),
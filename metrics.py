@@ -0,0 +1,242 @@
+"""
+metrics.py - Instrumentação por estágio e exportação de métricas 📈
+------------------------------------------------------------------
+Cada estágio do loop registra sua duração em `REGISTRY`:
+  capture, preprocess, inference, features, gesture, actuation, render
+em histogramas logarítmicos estilo HDR (erro relativo ~3%) com janela
+deslizante (METRICS_WINDOW segundos), além de contadores (frames
+descartados, gatilhos de gesto, gatilhos "relâmpago" = prováveis falsos
+positivos) e do score de lateralidade (Left/Right) das mãos.
+
+Exportação:
+  --metrics-jsonl ARQ   -> uma linha JSON a cada METRICS_INTERVAL segundos
+  --metrics-port PORTA  -> texto no formato Prometheus em 127.0.0.1:PORTA/metrics
+  DEBUG = True          -> resumo periódico no terminal
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import DEBUG, METRICS_INTERVAL, METRICS_WINDOW
+
+STAGES = ("capture", "preprocess", "inference", "features", "gesture", "actuation", "render")
+
+_SUB_BITS = 5
+_HALF = 1 << (_SUB_BITS - 1)
+_NUM_BUCKETS = 64 * _HALF
+
+
+def _bucket(v):
+    """Índice do bucket log-linear (2^_SUB_BITS sub-buckets por potência de 2)."""
+    if v < (1 << _SUB_BITS):
+        return v
+    e = v.bit_length() - _SUB_BITS
+    return min(e * _HALF + (v >> e), _NUM_BUCKETS - 1)
+
+
+def _bucket_value(i):
+    """Limite inferior do bucket `i`."""
+    if i < (1 << _SUB_BITS):
+        return i
+    e = i // _HALF - 1
+    return (i - e * _HALF) << e
+
+
+class RollingHistogram:
+    """
+    Histograma HDR simplificado com janela deslizante: `windows` fatias
+    de `window / windows` segundos. `scale` converte o valor para inteiro
+    (1e6 = segundos -> µs; 1000 = confiança 0-1 -> milésimos).
+    """
+
+    def __init__(self, window=METRICS_WINDOW, windows=6, scale=1e6):
+        self.scale = scale
+        self.slice = window / windows
+        self._slices = [[0] * _NUM_BUCKETS for _ in range(windows)]
+        self._current = 0
+        self._slice_start = time.monotonic()
+        self.count = 0    # cumulativos (Prometheus)
+        self.sum = 0.0
+
+    def _rotate(self, now):
+        elapsed = now - self._slice_start
+        if elapsed < self.slice:
+            return
+        if elapsed >= self.slice * len(self._slices):
+            # muito tempo sem amostras: zera tudo de uma vez
+            for counts in self._slices:
+                counts[:] = [0] * _NUM_BUCKETS
+            self._slice_start = now
+            return
+        while now - self._slice_start >= self.slice:
+            self._current = (self._current + 1) % len(self._slices)
+            self._slices[self._current][:] = [0] * _NUM_BUCKETS
+            self._slice_start += self.slice
+
+    def record(self, value, now=None):
+        self._rotate(time.monotonic() if now is None else now)
+        self._slices[self._current][_bucket(max(0, int(value * self.scale)))] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentiles(self, qs=(0.5, 0.95, 0.99)):
+        self._rotate(time.monotonic())
+        merged = [sum(col) for col in zip(*self._slices)]
+        total = sum(merged)
+        out = {}
+        if total == 0:
+            return {q: 0.0 for q in qs}, 0
+        for q in qs:
+            target, acc = q * total, 0
+            for i, c in enumerate(merged):
+                acc += c
+                if acc >= target:
+                    out[q] = _bucket_value(i) / self.scale
+                    break
+        return out, total
+
+
+class Metrics:
+    """Registro global de histogramas, contadores e gauges (thread-safe)."""
+
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self._collectors = []
+
+    def observe(self, name, value, scale=1e6):
+        if not self.enabled:
+            return
+        with self._lock:
+            h = self.histograms.get(name)
+            if h is None:
+                h = self.histograms[name] = RollingHistogram(scale=scale)
+            h.record(value)
+
+    def timed(self, name, t0):
+        """Registra `perf_counter() - t0` em `name` e devolve o instante atual."""
+        t1 = time.perf_counter()
+        self.observe(name, t1 - t0)
+        return t1
+
+    def inc(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def add_collector(self, fn):
+        """`fn()` -> dict de gauges lido na exportação (ex.: filas do pipeline)."""
+        self._collectors.append(fn)
+
+    def snapshot(self):
+        for fn in self._collectors:
+            try:
+                self.gauges.update(fn())
+            except Exception:
+                pass
+        with self._lock:
+            hist = {}
+            for name, h in self.histograms.items():
+                p, n = h.percentiles()
+                hist[name] = {"n": n, "p50": p[0.5], "p95": p[0.95], "p99": p[0.99],
+                              "count": h.count, "sum": h.sum}
+            return {
+                "t": time.time(),
+                "histograms": hist,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+            }
+
+    def prometheus(self):
+        """Texto no formato de exposição do Prometheus."""
+        snap = self.snapshot()
+        lines = []
+        for name, h in snap["histograms"].items():
+            metric = f"gesture_{name}" + ("_seconds" if name in STAGES else "")
+            lines.append(f"# TYPE {metric} summary")
+            for q, key in ((0.5, "p50"), (0.95, "p95"), (0.99, "p99")):
+                lines.append(f'{metric}{{quantile="{q}"}} {h[key]:.6g}')
+            lines.append(f"{metric}_sum {h['sum']:.6g}")
+            lines.append(f"{metric}_count {h['count']}")
+        typed = set()
+        for kind, suffix, values in (("counter", "_total", snap["counters"]), ("gauge", "", snap["gauges"])):
+            for name, v in sorted(values.items()):
+                # nomes podem trazer labels: 'triggers{action="five_open"}'
+                base, _, labels = name.partition("{")
+                metric = f"gesture_{base}{suffix}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} {kind}")
+                    typed.add(metric)
+                lines.append(f"{metric}{{{labels} {v}" if labels else f"{metric} {v}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Metrics()
+
+
+class MetricsExporter(threading.Thread):
+    """Grava JSON lines, imprime o resumo (DEBUG) e/ou serve /metrics."""
+
+    def __init__(self, registry=REGISTRY, jsonl_path=None, port=0,
+                 interval=METRICS_INTERVAL, debug=DEBUG):
+        super().__init__(name="metrics", daemon=True)
+        self.registry = registry
+        self.jsonl_path = jsonl_path
+        self.interval = interval
+        self.debug = debug
+        self._stop_event = threading.Event()
+        self._server = self._make_server(port) if port else None
+
+    def _make_server(self, port):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📈 Métricas em http://127.0.0.1:{port}/metrics")
+        return server
+
+    def dump(self):
+        snap = self.registry.snapshot()
+        if self.jsonl_path:
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(snap) + "\n")
+        if self.debug:
+            parts = [f"{name}={h['p50'] * 1000:.1f}/{h['p95'] * 1000:.1f}ms"
+                     for name, h in snap["histograms"].items() if name in STAGES]
+            print("📈 p50/p95 " + "  ".join(parts))
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.dump()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self.jsonl_path or self.debug:
+            self.dump()
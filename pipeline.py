@@ -0,0 +1,207 @@
+"""
+pipeline.py - Pipeline em estágios para o loop de gestos 🧵
+----------------------------------------------------------
+Captura, inferência e gestos/atuação rodam em threads separadas,
+ligadas por filas limitadas (profundidade 1 por padrão). Cada fila
+guarda apenas o item mais recente: se o estágio seguinte estiver
+atrasado, o frame antigo é descartado e contado em `dropped`.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import cv2
+
+from config import QUEUE_DEPTH
+from frames import BufferPool
+from metrics import REGISTRY
+
+
+@dataclass
+class FramePacket:
+    """Frame que atravessa o pipeline, com timestamps de cada estágio."""
+    seq: int
+    t_capture: float
+    frame: Any
+    result: Any = None
+    t_infer: Optional[float] = None
+    latency: Optional[float] = None   # captura -> resultado da inferência (s)
+    roi: Optional[tuple] = None       # (x0, y0, w, h) enviado ao detector
+    mirrored: bool = False            # imagem NÃO flipada; landmarks já espelhados em x
+    hud: list = field(default_factory=list)
+    t_gesture: Optional[float] = None
+
+
+class LatestQueue:
+    """Fila limitada que descarta o item mais antigo quando cheia."""
+
+    def __init__(self, maxsize: int = QUEUE_DEPTH):
+        self._items = deque()
+        self._maxsize = max(1, maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """Retorna o próximo item ou None se expirar/fechar."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Stage(threading.Thread):
+    """
+    Estágio do pipeline. Sem `inbox` funciona como fonte (chama `fn()`
+    em loop); com `inbox` consome itens e chama `fn(item)`. Resultados
+    diferentes de None seguem para `outbox`.
+    """
+
+    def __init__(self, name: str, fn: Callable, stop_event: threading.Event,
+                 inbox: Optional[LatestQueue] = None,
+                 outbox: Optional[LatestQueue] = None):
+        super().__init__(name=name, daemon=True)
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.error = None
+        self.processed = 0
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                if self.inbox is None:
+                    item = self.fn()
+                else:
+                    item = self.inbox.get(timeout=0.1)
+                    if item is None:
+                        continue
+                    item = self.fn(item)
+                if item is None:
+                    continue
+                self.processed += 1
+                if self.outbox is not None:
+                    self.outbox.put(item)
+        except Exception as e:
+            # propaga o erro para a thread principal via Pipeline.error
+            self.error = e
+            self.stop_event.set()
+
+
+class Pipeline:
+    """
+    Encadeia estágios: captura -> inferência -> gestos -> saída.
+
+    `capture()` deve retornar um FramePacket (ou None se a leitura
+    falhar); `infer(pkt)` e `gesture(pkt)` recebem e devolvem o pacote.
+    A thread principal consome os pacotes prontos com `get()`.
+    """
+
+    def __init__(self, capture: Callable, infer: Callable, gesture: Callable,
+                 depth: int = QUEUE_DEPTH):
+        self.stop_event = threading.Event()
+        self.queues = {
+            "capture": LatestQueue(depth),
+            "inference": LatestQueue(depth),
+            "output": LatestQueue(depth),
+        }
+        self.stages = [
+            Stage("capture", capture, self.stop_event,
+                  outbox=self.queues["capture"]),
+            Stage("inference", infer, self.stop_event,
+                  inbox=self.queues["capture"], outbox=self.queues["inference"]),
+            Stage("gesture", gesture, self.stop_event,
+                  inbox=self.queues["inference"], outbox=self.queues["output"]),
+        ]
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def stop(self, timeout: float = 1.0):
+        self.stop_event.set()
+        for q in self.queues.values():
+            q.close()
+        for stage in self.stages:
+            stage.join(timeout)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        return self.queues["output"].get(timeout)
+
+    @property
+    def error(self):
+        for stage in self.stages:
+            if stage.error is not None:
+                return stage.error
+        return None
+
+    @property
+    def dropped(self) -> int:
+        """Total de frames descartados por estarem velhos."""
+        return sum(q.dropped for q in self.queues.values())
+
+    def stats(self) -> dict:
+        return {
+            "dropped": {name: q.dropped for name, q in self.queues.items()},
+            "processed": {s.name: s.processed for s in self.stages},
+        }
+
+
+class FrameSource:
+    """
+    Envolve cv2.VideoCapture e gera FramePackets numerados. Lê direto em
+    buffers do pool; com `flip=False` a imagem não é espelhada (o
+    detector espelha os landmarks) e o pacote sai com `mirrored=True`.
+    """
+
+    def __init__(self, cap, flip: bool = True, pool: Optional[BufferPool] = None):
+        self.cap = cap
+        self.flip = flip
+        self.pool = pool or BufferPool()
+        self._shape = None
+        self._scratch = None
+        self._seq = 0
+
+    def __call__(self) -> Optional[FramePacket]:
+        if self.flip:
+            # o flip copia para o pool, então a leitura pode usar sempre o mesmo buffer
+            buf = self._scratch
+        else:
+            buf = self.pool.get(self._shape) if self._shape is not None else None
+        t0 = time.perf_counter()
+        ret, frame = self.cap.read(buf)
+        REGISTRY.timed("capture", t0)
+        if not ret:
+            time.sleep(0.005)
+            return None
+        t = time.time()
+        self._shape = frame.shape  # muda se a resolução da câmera mudar
+        if self.flip:
+            self._scratch = frame
+            # espelhar para comportamento tipo espelho
+            frame = cv2.flip(frame, 1, dst=self.pool.get(frame.shape))
+        self._seq += 1
+        return FramePacket(seq=self._seq, t_capture=t, frame=frame, mirrored=not self.flip)
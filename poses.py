@@ -0,0 +1,233 @@
+"""
+poses.py - Poses estáticas treináveis (k-NN) ✌️
+-----------------------------------------------
+Alternativa às regras fixas de dedos up/down: cada pose vira um vetor
+invariante a rotação e a espelhamento (mão esquerda/direita) —
+distâncias 3D entre pontos da mão divididas pelo tamanho da palma e a
+curvatura de cada dedo — e é classificada por k-NN (PoseIndex).
+
+O usuário grava algumas amostras por pose com o recorder:
+  python main.py --record joinha.npy
+  python poses.py add joinha.npy --name thumbs_up [--start 1.0 --end 3.0]
+  python poses.py list
+  python poses.py bench
+
+Amostras e normas pré-calculadas ficam em POSES_PATH (.npz), prontas
+para consulta ao iniciar. Uma pose reconhecida dispara
+GESTURE_ACTIONS[nome] (ver gestures.GestureController).
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from config import POSES_PATH, POSE_K, POSE_MAX_DIST, POSE_TREE_MIN_SAMPLES
+from features import HandFeatures, WRIST, MIDDLE_MCP, TIPS, PIPS, MCPS
+
+_PAIRS_I, _PAIRS_J = np.triu_indices(5, k=1)
+POSE_SIZE = 20   # 5 pontas->pulso + 10 ponta->ponta + 5 curvaturas
+
+
+def invariant_vector(f, out=None):
+    """
+    Vetor de pose a partir de HandFeatures já calculadas (coordenadas 3D
+    em pixels). Só usa distâncias e ângulos internos da mão, então não
+    depende de rotação, posição, escala nem de qual mão é.
+    """
+    out = np.empty(POSE_SIZE, dtype=np.float32) if out is None else out
+    pts = f.pts
+    scale = float(np.linalg.norm(pts[MIDDLE_MCP] - pts[WRIST])) or 1.0
+    tips = pts[TIPS]
+    out[0:5] = np.linalg.norm(tips - pts[WRIST], axis=1) / scale
+    out[5:15] = np.linalg.norm(tips[_PAIRS_I] - tips[_PAIRS_J], axis=1) / scale
+    # curvatura: cosseno entre base->articulação e articulação->ponta (1 = dedo reto)
+    a = pts[PIPS] - pts[MCPS]
+    b = tips - pts[PIPS]
+    den = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    out[15:20] = np.einsum("ij,ij->i", a, b) / np.maximum(den, 1e-6)
+    return out
+
+
+class PoseIndex:
+    """
+    Índice k-NN sobre as amostras. Usa `scipy.spatial.cKDTree` quando o
+    SciPy está instalado e há amostras suficientes (POSE_TREE_MIN_SAMPLES);
+    senão, varredura vetorizada com as normas pré-calculadas
+    (|p - x|² = |p|² - 2 p.x + |x|², um único produto matriz-vetor), que
+    nas quantidades típicas (centenas de amostras) custa ~10-20 µs.
+    """
+
+    def __init__(self, samples, sq_norms=None, tree_min=POSE_TREE_MIN_SAMPLES):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sq_norms = (np.einsum("ij,ij->i", self.samples, self.samples)
+                         if sq_norms is None else sq_norms)
+        self.tree = None
+        if len(self.samples) >= tree_min:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                pass
+            else:
+                self.tree = cKDTree(self.samples)
+
+    def query(self, x, k=1):
+        """Índices e distâncias dos k vizinhos mais próximos (do mais perto ao mais longe)."""
+        k = min(k, len(self.samples))
+        if k == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        if self.tree is not None:
+            dist, idx = self.tree.query(x, k)
+            return np.atleast_1d(idx), np.atleast_1d(dist)
+        d = self.sq_norms - 2.0 * (self.samples @ x) + float(x @ x)
+        idx = np.argpartition(d, k - 1)[:k] if k < len(d) else np.arange(len(d))
+        idx = idx[np.argsort(d[idx])]
+        return idx, np.sqrt(np.maximum(d[idx], 0.0))
+
+
+class PoseClassifier:
+    """Amostras rotuladas + índice k-NN; `predict` -> (pose, fração de votos, distância)."""
+
+    def __init__(self, k=POSE_K, max_dist=POSE_MAX_DIST):
+        self.k = k
+        self.max_dist = max_dist
+        self.samples = np.zeros((0, POSE_SIZE), dtype=np.float32)
+        self.labels = np.zeros(0, dtype="<U32")
+        self.index = None
+        self._vec = np.empty(POSE_SIZE, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def names(self):
+        return sorted(set(self.labels.tolist()))
+
+    def add(self, name, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, POSE_SIZE)
+        self.samples = np.vstack([self.samples, vectors])
+        self.labels = np.concatenate([self.labels, np.full(len(vectors), name, dtype="<U32")])
+        self.index = None
+
+    def remove(self, name):
+        keep = self.labels != name
+        self.samples, self.labels, self.index = self.samples[keep], self.labels[keep], None
+        return int((~keep).sum())
+
+    def build(self, sq_norms=None):
+        self.index = PoseIndex(self.samples, sq_norms)
+        return self
+
+    def save(self, path=POSES_PATH):
+        if self.index is None:
+            self.build()
+        np.savez(path, samples=self.samples, labels=self.labels, sq_norms=self.index.sq_norms)
+
+    @classmethod
+    def load(cls, path=POSES_PATH, **kwargs):
+        """Carrega amostras e normas já calculadas (vazio se o arquivo não existir)."""
+        clf = cls(**kwargs)
+        if path and os.path.exists(path):
+            data = np.load(path)
+            clf.samples, clf.labels = data["samples"], data["labels"]
+            clf.build(data["sq_norms"])
+        return clf
+
+    def predict_vector(self, vec):
+        if not len(self.labels):
+            return None, 0.0, np.inf
+        if self.index is None:
+            self.build()
+        idx, dist = self.index.query(vec, self.k)
+        if dist[0] > self.max_dist:
+            return None, 0.0, float(dist[0])   # longe de qualquer amostra gravada
+        # voto entre os vizinhos dentro de max_dist (k pequeno: contagem simples)
+        labels = self.labels[idx[dist <= self.max_dist]].tolist()
+        best = max(set(labels), key=labels.count)
+        return best, labels.count(best) / len(idx), float(dist[0])
+
+    def predict(self, f):
+        """Classifica HandFeatures já calculadas."""
+        return self.predict_vector(invariant_vector(f, self._vec))
+
+
+def vectors_from_recording(path, start=None, end=None, step=2):
+    """Vetores de pose de uma gravação .npy (um a cada `step` frames com mão)."""
+    from recorder import replay_landmarks
+
+    f = HandFeatures()
+    out = []
+    for i, (t, w, h, hands) in enumerate(replay_landmarks(path)):
+        if i % step or not hands or (start is not None and t < start) or (end is not None and t > end):
+            continue
+        out.append(invariant_vector(f.compute(hands[0], w, h)).copy())
+    return np.asarray(out, dtype=np.float32).reshape(-1, POSE_SIZE)
+
+
+def bench(clf, n_queries=2000, seed=0):
+    """µs por classificação e por consulta k-NN (sobre as amostras gravadas, ou sintéticas)."""
+    rng = np.random.default_rng(seed)
+    if not len(clf):
+        clf.add("synthetic", rng.random((500, POSE_SIZE)))
+    t0 = time.perf_counter()
+    clf.build()
+    build_ms = (time.perf_counter() - t0) * 1000
+    noise = rng.normal(0, 0.02, (n_queries, POSE_SIZE))
+    queries = (clf.samples[rng.integers(len(clf), size=n_queries)] + noise).astype(np.float32)
+
+    t0 = time.perf_counter()
+    for q in queries:
+        clf.index.query(q, clf.k)
+    query_us = (time.perf_counter() - t0) / n_queries * 1e6
+
+    t0 = time.perf_counter()
+    for q in queries:
+        clf.predict_vector(q)
+    predict_us = (time.perf_counter() - t0) / n_queries * 1e6
+
+    kind = "cKDTree" if clf.index.tree is not None else "varredura vetorizada"
+    print(f"✌️ {len(clf)} amostras, {len(clf.names)} poses, k={clf.k} ({kind})")
+    print(f"   k-NN: {query_us:.1f} µs/consulta | classificação: {predict_us:.1f} µs | índice: {build_ms:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poses estáticas treináveis (k-NN)")
+    parser.add_argument("--poses", default=POSES_PATH, help="arquivo de amostras (.npz)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="adiciona amostras de uma gravação (recorder.py)")
+    add.add_argument("recording")
+    add.add_argument("--name", required=True)
+    add.add_argument("--start", type=float, help="início do trecho (timestamp da gravação)")
+    add.add_argument("--end", type=float, help="fim do trecho")
+    rm = sub.add_parser("remove", help="remove todas as amostras de uma pose")
+    rm.add_argument("name")
+    sub.add_parser("list", help="lista as poses gravadas")
+    sub.add_parser("bench", help="tempo de consulta do k-NN")
+    args = parser.parse_args(argv)
+
+    clf = PoseClassifier.load(args.poses)
+    if args.cmd == "add":
+        vectors = vectors_from_recording(args.recording, args.start, args.end)
+        if not len(vectors):
+            print("⚠️ Nenhum frame com mão no trecho — nada gravado.")
+            return
+        clf.add(args.name, vectors)
+        clf.save(args.poses)
+        print(f"💾 {len(vectors)} amostras de '{args.name}' salvas em {args.poses}")
+    elif args.cmd == "remove":
+        removed = clf.remove(args.name)
+        clf.save(args.poses)
+        print(f"🗑️ '{args.name}' removida ({removed} amostras)")
+    elif args.cmd == "list":
+        names, counts = np.unique(clf.labels, return_counts=True)
+        for name, n in zip(names, counts):
+            print(f"  {name:<20}{n:>6} amostras")
+        if not len(names):
+            print(f"📁 Nenhuma pose em {args.poses}")
+    else:
+        bench(clf)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+power.py - Modo de baixo consumo (idle) com gate de movimento 💤
+---------------------------------------------------------------
+Depois de INACTIVITY_TIMEOUT segundos sem mão, o scheduler entra em
+"idle": a captura cai para IDLE_FPS e IDLE_CAPTURE_SIZE, e o
+HandLandmarker só roda quando uma diferença de frames barata (imagem
+cinza reduzida) indica movimento. Assim que uma mão aparece, volta a
+"active" com taxa e resolução cheias.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from config import (
+    INACTIVITY_TIMEOUT, IDLE_FPS, IDLE_CAPTURE_SIZE,
+    MOTION_GRID, MOTION_PIXEL_THRESHOLD, MOTION_MIN_AREA,
+)
+
+ACTIVE, IDLE = "active", "idle"
+
+# resultado vazio usado quando a inferência é pulada
+NO_HANDS = SimpleNamespace(hand_landmarks=[], handedness=[])
+
+
+class MotionGate:
+    """Diferença entre frames em cinza reduzidos, com buffers reutilizados."""
+
+    def __init__(self, grid=MOTION_GRID, pixel_threshold=MOTION_PIXEL_THRESHOLD, min_area=MOTION_MIN_AREA):
+        gw, gh = grid
+        self.grid = grid
+        self.pixel_threshold = pixel_threshold
+        self.min_count = max(1, int(gw * gh * min_area))
+        self._small = np.zeros((gh, gw, 3), dtype=np.uint8)
+        self._gray = np.zeros((gh, gw), dtype=np.uint8)
+        self._prev = np.zeros((gh, gw), dtype=np.uint8)
+        self._diff = np.zeros((gh, gw), dtype=np.uint8)
+        self._has_prev = False
+
+    def reset(self):
+        self._has_prev = False
+
+    def check(self, frame):
+        """True se houve movimento desde o último frame verificado."""
+        cv2.resize(frame, self.grid, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if not self._has_prev:
+            self._prev[:] = self._gray
+            self._has_prev = True
+            return True
+        cv2.absdiff(self._gray, self._prev, dst=self._diff)
+        self._prev, self._gray = self._gray, self._prev
+        return np.count_nonzero(self._diff > self.pixel_threshold) >= self.min_count
+
+
+class PowerScheduler:
+    """Estado active/idle compartilhado pelos estágios de captura, inferência e gestos."""
+
+    def __init__(self, timeout=INACTIVITY_TIMEOUT, idle_fps=IDLE_FPS, idle_size=IDLE_CAPTURE_SIZE):
+        self.timeout = timeout
+        self.idle_interval = 1.0 / idle_fps
+        self.idle_size = idle_size
+        self.state = ACTIVE
+        self.gate = MotionGate()
+        self.last_hand = time.time()
+        self.skipped = 0          # inferências puladas em idle
+        self.wakeups = 0
+        self._lock = threading.Lock()
+
+    @property
+    def idle(self):
+        return self.state == IDLE
+
+    def observe(self, hand_present, now=None):
+        """Chamado pelo estágio de gestos a cada frame."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if hand_present:
+                self.last_hand = now
+                if self.state == IDLE:
+                    self.state = ACTIVE
+                    self.wakeups += 1
+                    print("▶️ Mão detectada - modo ativo")
+            elif self.state == ACTIVE and now - self.last_hand > self.timeout:
+                self.state = IDLE
+                self.gate.reset()
+                print("💤 Sem mão - modo econômico")
+
+    def should_infer(self, frame):
+        """Em idle, só libera a inferência quando o gate de movimento dispara."""
+        if self.state == ACTIVE:
+            return True
+        if self.gate.check(frame):
+            return True
+        self.skipped += 1
+        return False
+
+
+class PoweredCapture:
+    """
+    Fonte de frames do pipeline ciente do modo idle: limita o FPS e troca
+    a resolução da câmera nas transições (sempre na thread de captura).
+    """
+
+    def __init__(self, source, cap, power):
+        self.source = source
+        self.cap = cap
+        self.power = power
+        self.full_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self._applied = ACTIVE
+        self._last = 0.0
+
+    def _set_size(self, size):
+        w, h = size
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+
+    def __call__(self):
+        state = self.power.state
+        if state != self._applied:
+            self._set_size(self.power.idle_size if state == IDLE else self.full_size)
+            self._applied = state
+        if state == IDLE:
+            wait = self.power.idle_interval - (time.time() - self._last)
+            if wait > 0:
+                time.sleep(wait)
+        self._last = time.time()
+        return self.source()
@@ -0,0 +1,103 @@
+"""
+recorder.py - Gravação e replay de landmarks 📼
+-----------------------------------------------
+Grava o stream de `hand_landmarks` (21 pontos x, y, z) com timestamps
+em um .npy estruturado (um registro por frame), que pode ser lido via
+memory-map. O replay alimenta a lógica de gestos sem webcam, janela ou
+mouse real — útil para benchmarks e para comparar mudanças no mesmo input.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# registro por frame: timestamp, tamanho do frame, mão presente, 21 x (x, y, z)
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("size", "<u2", (2,)),
+    ("hand", "?"),
+    ("lm", "<f4", (NUM_LANDMARKS, 3)),
+])
+
+
+class LandmarkRecorder:
+    """Acumula frames em um buffer crescente e salva em .npy no `close()`."""
+
+    def __init__(self, path, capacity=4096):
+        self.path = path
+        self._buf = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._n = 0
+
+    def add(self, t, w, h, hands):
+        if self._n == len(self._buf):
+            self._buf = np.resize(self._buf, len(self._buf) * 2)
+        rec = self._buf[self._n]
+        rec["t"] = t
+        rec["size"] = (w, h)
+        rec["hand"] = bool(hands)
+        if hands:
+            lm = hands[0]
+            rec["lm"] = lm if isinstance(lm, np.ndarray) else [(p.x, p.y, p.z) for p in lm]
+        else:
+            rec["lm"] = 0
+        self._n += 1
+
+    def __len__(self):
+        return self._n
+
+    def close(self):
+        np.save(self.path, self._buf[:self._n])
+        print(f"💾 {self._n} frames gravados em {self.path}")
+
+
+def load_landmarks(path, mmap=True):
+    """Carrega uma gravação (memory-mapped por padrão)."""
+    data = np.load(path, mmap_mode="r" if mmap else None)
+    if data.dtype != RECORD_DTYPE:
+        raise ValueError(f"Arquivo {path} não é uma gravação de landmarks")
+    return data
+
+
+def replay_landmarks(path):
+    """
+    Gera (t, w, h, hands) para cada frame gravado. Cada mão é um array
+    (21, 3) normalizado, aceito direto por features.HandFeatures.
+    """
+    for rec in load_landmarks(path):
+        w, h = (int(v) for v in rec["size"])
+        hands = [rec["lm"]] if rec["hand"] else []
+        yield float(rec["t"]), w, h, hands
+
+
+def replay_video(path, detector, timer=None):
+    """
+    Passa um arquivo de vídeo pelo detector e gera (t, w, h, hands).
+    `timer` (opcional) recebe o tempo de cada estágio: decode,
+    preprocess e inference.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Não foi possível abrir o vídeo {path}")
+    try:
+        while True:
+            t0 = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            t1 = time.perf_counter()
+            frame = cv2.flip(frame, 1)
+            h, w = frame.shape[:2]
+            rgb, roi = detector.preprocess(frame)
+            t2 = time.perf_counter()
+            result = detector.postprocess(detector.detect(rgb), roi, w, h)
+            t3 = time.perf_counter()
+            if timer is not None:
+                timer.add("decode", t1 - t0)
+                timer.add("preprocess", t2 - t1)
+                timer.add("inference", t3 - t2)
+            yield cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, w, h, result.hand_landmarks
+    finally:
+        cap.release()
@@ -0,0 +1,98 @@
+"""
+roi.py - Recorte da mão (ROI) e resolução adaptativa 🔲
+-------------------------------------------------------
+Usa a bounding box dos landmarks do frame anterior (com margem) para
+recortar e reduzir a imagem enviada ao detector. Se a mão some, volta
+a procurar no frame inteiro em resolução baixa (SEARCH_WIDTH). Com
+`num_hands > 1`, enquanto houver menos mãos que isso, um frame a cada
+ROI_SEARCH_EVERY também vai inteiro: uma mão que entra longe do recorte
+não ficaria invisível até a primeira sumir.
+
+Os landmarks do recorte são convertidos de volta para coordenadas
+normalizadas do frame completo, então o resto do pipeline não muda.
+"""
+
+import cv2
+
+from config import ROI_MARGIN, ROI_INPUT_SIZE, ROI_MIN_SIZE, SEARCH_WIDTH, ROI_SEARCH_EVERY
+
+
+class RoiTracker:
+    def __init__(self, margin=ROI_MARGIN, input_size=ROI_INPUT_SIZE,
+                 min_size=ROI_MIN_SIZE, search_width=SEARCH_WIDTH, num_hands=1, search_every=ROI_SEARCH_EVERY):
+        self.margin = margin
+        self.input_size = input_size
+        self.min_size = min_size
+        self.search_width = search_width
+        self.num_hands = num_hands
+        self.search_every = search_every
+        self.box = None   # (x0, y0, x1, y1) em pixels do frame
+        self.search = False   # próximo frame vai inteiro mesmo com ROI
+        self._missing = 0     # frames seguidos com menos de num_hands mãos
+        self._frame_size = None
+
+    def prepare(self, frame, pool=None):
+        """
+        Retorna (imagem para o detector, roi). `roi` = (x0, y0, w, h) da
+        região usada, em pixels do frame. Com `pool` (frames.BufferPool)
+        a redução escreve num buffer reutilizado.
+        """
+        fh, fw = frame.shape[:2]
+        if (fw, fh) != self._frame_size:
+            # resolução da câmera mudou (ex.: modo econômico): a ROI antiga não vale
+            self.box = None
+        if self.box is None or self.search:
+            region, roi = frame, (0, 0, fw, fh)
+            target = self.search_width
+        else:
+            x0, y0, x1, y1 = self.box
+            region, roi = frame[y0:y1, x0:x1], (x0, y0, x1 - x0, y1 - y0)
+            target = self.input_size
+
+        rh, rw = region.shape[:2]
+        scale = target / max(rw, rh)
+        if roi[2:] != (fw, fh) or scale < 1.0:
+            # recorte sempre sai com input_size x input_size (um único buffer no pool)
+            size = (max(1, int(rw * scale)), max(1, int(rh * scale)))
+            dst = pool.get((size[1], size[0]) + region.shape[2:]) if pool is not None else None
+            region = cv2.resize(region, size, dst=dst, interpolation=cv2.INTER_AREA)
+        return region, roi
+
+    @staticmethod
+    def remap(hands, roi, frame_w, frame_h):
+        """Converte landmarks normalizados do recorte para o frame (in-place)."""
+        x0, y0, rw, rh = roi
+        if (x0, y0, rw, rh) == (0, 0, frame_w, frame_h):
+            return
+        sx, sy = rw / frame_w, rh / frame_h
+        ox, oy = x0 / frame_w, y0 / frame_h
+        for lm in hands:
+            for p in lm:
+                p.x = ox + p.x * sx
+                p.y = oy + p.y * sy
+                p.z = p.z * sx
+
+    def update(self, hands, frame_w, frame_h):
+        """Atualiza a ROI a partir dos landmarks (já no frame) ou volta à busca."""
+        self._frame_size = (frame_w, frame_h)
+        self._missing = self._missing + 1 if len(hands) < self.num_hands else 0
+        self.search = self.num_hands > 1 and self._missing > 0 and self._missing % self.search_every == 0
+        if not hands:
+            self.box = None
+            return
+        xs = [p.x for lm in hands for p in lm]
+        ys = [p.y for lm in hands for p in lm]
+        bx0, bx1 = min(xs) * frame_w, max(xs) * frame_w
+        by0, by1 = min(ys) * frame_h, max(ys) * frame_h
+
+        # quadrado centrado na mão, com margem; nas bordas é deslocado para
+        # dentro do frame (em vez de cortado) para manter o formato fixo
+        side = max(bx1 - bx0, by1 - by0) * (1 + 2 * self.margin)
+        side = int(min(max(side, self.min_size), frame_w, frame_h))
+        if side < 2:
+            self.box = None
+            return
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0 = int(min(max(0, cx - side / 2), frame_w - side))
+        y0 = int(min(max(0, cy - side / 2), frame_h - side))
+        self.box = (x0, y0, x0 + side, y0 + side)
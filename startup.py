@@ -0,0 +1,170 @@
+"""
+startup.py - Inicialização rápida ⏱️
+-----------------------------------
+O tempo até o primeiro movimento do cursor é dominado por três coisas
+independentes: abrir a câmera, carregar o modelo e a primeira inferência
+(inicialização do grafo do MediaPipe). Aqui:
+
+  - `open_camera` tenta o backend/resolução/FPS que funcionaram da última
+    vez (CAMERA_CACHE_PATH) antes de negociar de novo;
+  - `load_detector` importa o mediapipe, cria o HandLandmarker e faz uma
+    inferência de aquecimento num frame preto;
+  - `StartupTimer` mede cada fase (inclusive as que rodam em paralelo) e
+    os marcos (primeiro frame, primeiro movimento) e publica tudo como
+    gauges `startup_seconds{phase=...}` em metrics.py.
+
+main.py roda câmera e modelo em threads enquanto cria o backend de atuação.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import cv2
+
+from config import CAMERA_CACHE_PATH
+from metrics import REGISTRY
+
+# backends do OpenCV tentados em ordem numa câmera sem cache (CAP_ANY por último)
+if sys.platform.startswith("win"):
+    CAMERA_APIS = [cv2.CAP_DSHOW, cv2.CAP_MSMF]   # MSMF costuma levar segundos para abrir
+elif sys.platform == "darwin":
+    CAMERA_APIS = [cv2.CAP_AVFOUNDATION]
+else:
+    CAMERA_APIS = [cv2.CAP_V4L2]
+
+
+class StartupTimer:
+    """Fases (início, fim) e marcos relativos a `t0` (perf_counter do início do processo)."""
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.phases = {}
+        self.marks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases[name] = (start - self.t0, end - self.t0)
+            REGISTRY.set_gauge(f'startup_seconds{{phase="{name}"}}', end - start)
+
+    def run(self, name, fn, *args, **kwargs):
+        """`fn(*args, **kwargs)` medido como a fase `name` (para ThreadPoolExecutor.submit)."""
+        with self.phase(name):
+            return fn(*args, **kwargs)
+
+    def mark(self, name):
+        """Marco (uma vez só): segundos desde t0."""
+        with self._lock:
+            if name in self.marks:
+                return self.marks[name]
+            t = self.marks[name] = time.perf_counter() - self.t0
+        REGISTRY.set_gauge(f'startup_seconds{{phase="{name}"}}', t)
+        return t
+
+    def report(self):
+        """Uma linha por fase (início -> fim) e os marcos, em ordem de tempo."""
+        lines = ["⏱️ Inicialização:"]
+        for name, (start, end) in sorted(self.phases.items(), key=lambda kv: kv[1][0]):
+            lines.append(f"   {name:<12}{(end - start) * 1000:7.0f} ms   ({start:.2f}s -> {end:.2f}s)")
+        for name, t in sorted(self.marks.items(), key=lambda kv: kv[1]):
+            lines.append(f"   {name:<12}{t:7.2f} s")
+        print("\n".join(lines))
+
+
+# === CÂMERA ===
+def load_camera_cache(path=CAMERA_CACHE_PATH):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_camera_cache(index, info, path=CAMERA_CACHE_PATH):
+    if not path:
+        return
+    cache = load_camera_cache(path)
+    cache[str(index)] = info
+    try:
+        with open(path, "w") as fp:
+            json.dump(cache, fp, indent=2)
+    except OSError:
+        pass
+
+
+def _negotiated(cap, frame):
+    h, w = frame.shape[:2]
+    return {
+        "api": int(cap.get(cv2.CAP_PROP_BACKEND)),
+        "backend": cap.getBackendName(),
+        "width": w,
+        "height": h,
+        "fps": float(cap.get(cv2.CAP_PROP_FPS)),
+    }
+
+
+def _try_open(index, api, info=None):
+    """Abre com o backend `api`; com `info`, pede a mesma resolução/FPS se vierem diferentes."""
+    cap = cv2.VideoCapture(index, api)
+    if not cap.isOpened():
+        cap.release()
+        return None, None
+    if info is not None:
+        # set() pode renegociar o formato (lento): só quando o padrão difere do cache
+        if (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) != (info["width"], info["height"]):
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, info["width"])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, info["height"])
+        if info.get("fps") and abs(cap.get(cv2.CAP_PROP_FPS) - info["fps"]) > 0.5:
+            cap.set(cv2.CAP_PROP_FPS, info["fps"])
+    ret, frame = cap.read()
+    if not ret:
+        cap.release()
+        return None, None
+    return cap, frame
+
+
+def open_camera(index, cache_path=CAMERA_CACHE_PATH):
+    """
+    Abre a câmera `index`. Retorna (cap, info, veio_do_cache); cap é None
+    se nenhum backend funcionou. `info` (backend, resolução, FPS) é salvo
+    no cache para a próxima inicialização.
+    """
+    cached = load_camera_cache(cache_path).get(str(index))
+    if cached is not None:
+        cap, frame = _try_open(index, cached["api"], cached)
+        if cap is not None:
+            info = _negotiated(cap, frame)
+            if info != cached:
+                save_camera_cache(index, info, cache_path)
+            return cap, info, True
+    for api in CAMERA_APIS + [cv2.CAP_ANY]:
+        cap, frame = _try_open(index, api)
+        if cap is not None:
+            info = _negotiated(cap, frame)
+            save_camera_cache(index, info, cache_path)
+            return cap, info, False
+    return None, None, False
+
+
+# === MODELO ===
+def load_detector(timer, warmup_shape=(480, 640, 3), **kwargs):
+    """Importa o mediapipe, cria o HandDetector e aquece com um frame preto."""
+    with timer.phase("modelo"):
+        from detector import HandDetector
+
+        detector = HandDetector(**kwargs)
+    with timer.phase("warm-up"):
+        detector.warmup(warmup_shape)
+    return detector
@@ -0,0 +1,42 @@
+from actuation import Actuator, NullBackend
+
+
+def test_moves_coalesce_between_other_events():
+    backend = NullBackend()
+    actuator = Actuator(backend)
+    actuator.move(1, 1)
+    actuator.move(2, 2)
+    actuator.submit("down", "left")
+    actuator.move(3, 3)
+    actuator.move(4, 4)
+    actuator.submit("up", "left")
+    assert actuator.coalesced == 2
+    assert actuator.depth == 4
+
+    actuator.start()
+    actuator.stop()
+    assert backend.events == [("move", 2, 2), ("down", "left"), ("move", 4, 4), ("up", "left")]
+
+
+def test_stop_drains_pending_events():
+    backend = NullBackend()
+    actuator = Actuator(backend)
+    actuator.submit("down", "left")
+    actuator.move(5, 5)
+    actuator.submit("up", "left")
+    # parada pedida antes de a thread consumir qualquer evento
+    actuator.stop()
+    actuator.start()
+    actuator.stop()
+    assert backend.events == [("down", "left"), ("move", 5, 5), ("up", "left")]
+    assert actuator.depth == 0
+    assert actuator.applied == 3
+
+
+def test_unthreaded_applies_immediately():
+    backend = NullBackend()
+    actuator = Actuator(backend, threaded=False)
+    actuator.move(1, 2)
+    actuator.submit("click", "right")
+    assert backend.events == [("move", 1, 2), ("click", "right", 1)]
+    assert backend.counts["click"] == 1
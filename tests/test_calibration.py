@@ -0,0 +1,56 @@
+import numpy as np
+
+import gestures
+from actuation import Actuator, NullBackend, default_gesture_actions
+from calibration import CalibrationMap, monitor_corners
+
+MONITORS = [(0, 0, 1920, 1080), (1920, 0, 1280, 1024)]
+INDEX_TIP = 8
+
+
+def failsafe_points(monitors):
+    """Cantos exatos de cada monitor (FAILSAFE_POINTS do pyautogui)."""
+    pts = set()
+    for x, y, w, h in monitors:
+        pts |= {(x, y), (x + w - 1, y), (x, y + h - 1), (x + w - 1, y + h - 1)}
+    return pts
+
+
+def hand_at(x, y):
+    lm = np.zeros((21, 3))
+    lm[:, 0], lm[:, 1] = x, y + 0.1
+    lm[INDEX_TIP, :2] = x, y
+    return lm
+
+
+def test_targets_are_inside_the_corners():
+    targets = {tuple(p) for p in monitor_corners(MONITORS).astype(int).tolist()}
+    assert not targets & failsafe_points(MONITORS)
+
+
+def test_full_calibration_never_moves_to_a_corner(tmp_path, monkeypatch):
+    monkeypatch.setattr(gestures, "CALIB_PATH", str(tmp_path / "calibration.npz"))
+    backend = NullBackend(screen_size=(3200, 1080))
+    actuator = Actuator(backend, threaded=False)
+    controller = gestures.GestureController(default_gesture_actions(actuator), backend.size(),
+                                            calibration=CalibrationMap(MONITORS))
+    controller.recalibrate()
+
+    now, fps = 0.0, 30
+    for _ in range(1000):
+        # a mão aponta para o alvo atual: câmera = mapeamento afim da área de trabalho
+        tx, ty = controller.calibrator.target if controller.calibrator else (0, 0)
+        controller.update([hand_at(0.2 + 0.6 * tx / 3200, 0.2 + 0.6 * ty / 1080)], 640, 480, now)
+        now += 1 / fps
+        if controller.calibrator is None and controller.calibration.calibrated:
+            break
+
+    assert controller.calibration.calibrated
+    assert (tmp_path / "calibration.npz").exists()
+    assert actuator.error is None
+    moves = [(round(e[1]), round(e[2])) for e in backend.events if e[0] == "move"]
+    assert len(moves) == 4 * len(MONITORS)
+    assert not set(moves) & failsafe_points(MONITORS)
+    # o ajuste usa os alvos mostrados: o centro de cada alvo volta (a menos da zona morta) perto dele
+    x, y = controller.calibration.map(0.2 + 0.6 * 1600 / 3200, 0.2 + 0.6 * 540 / 1080, 1.0)
+    assert abs(x - 1600) < 40 and abs(y - 540) < 40
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+
+import pytest
+
+import commands
+from commands import CommandIndex, LauncherService, normalize
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CommandIndex()
+
+
+def test_normalize_strips_accents_and_punctuation():
+    assert normalize("Abre o Código, por favor!") == ["abre", "o", "codigo", "por", "favor"]
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("abrir vscode", ("open", "vscode", False)),
+    ("abre o visual studio code", ("open", "vscode", False)),
+    ("fechar bloco de notas", ("close", "notepad", False)),
+    ("fechar tudo", ("close", None, True)),
+    # erros de digitação / reconhecimento de voz
+    ("abre o crome", ("open", "browser", False)),
+    ("abrri o navegadr", ("open", "browser", False)),
+    ("fechr o vscod", ("close", "vscode", False)),
+])
+def test_parse(index, command, expected):
+    assert index.parse(command) == expected
+
+
+def test_weak_phrase_word_is_not_enough(index):
+    # "studio" é só 1/3 de "visual studio code"
+    assert index.parse("abrir studio") == ("open", None, False)
+
+
+def test_unknown_words_do_not_match(index):
+    assert index.parse("qual a previsão do tempo") == (None, None, False)
+
+
+def test_unknown_close_target_is_not_everything(index):
+    assert index.parse("fechar spotify") == ("close", None, False)
+
+
+@pytest.fixture
+def service():
+    service = LauncherService()
+    procs = {name: subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+             for name in ("vscode", "notepad")}
+    for name, proc in procs.items():
+        service.procs[name].append(proc)
+    yield service, procs
+    for proc in procs.values():
+        proc.kill()
+        proc.wait()
+
+
+def test_unknown_close_target_closes_nothing(service):
+    service, procs = service
+    assert service.run("fechar spotify").startswith("❓")
+    assert service.run("fecha a aba").startswith("❓")
+    assert all(proc.poll() is None for proc in procs.values())
+
+
+def test_close_all_only_with_everything(service):
+    service, procs = service
+    assert service.run("fechar tudo") == "🧹 Aplicações encerradas!"
+    for proc in procs.values():
+        proc.wait(5)
+
+
+def test_close_never_touches_untracked_processes(monkeypatch):
+    class Foreign:
+        pid = 4242
+        terminated = False
+
+        def terminate(self):
+            self.terminated = True
+
+    foreign = Foreign()
+    monkeypatch.setattr(commands, "find_processes", lambda app: [foreign])
+    service = LauncherService()
+    assert service.run("fechar navegador") == "🧹 Navegador não foi aberto pelo assistente."
+    assert not foreign.terminated
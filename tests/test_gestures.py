@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from actuation import Actuator, NullBackend, default_gesture_actions
+from calibration import CalibrationMap
+from features import MCPS, PIPS, TIPS
+from gestures import GestureController
+from poses import PoseClassifier
+
+
+class FakeTrajectories:
+    """Qualquer trajetória com pontos suficientes vira "circle_ccw" (win+d)."""
+
+    def __init__(self):
+        self.points = []
+
+    def reset(self):
+        self.points = []
+
+    def push(self, x, y):
+        self.points.append((x, y))
+
+    def match(self):
+        return ("circle_ccw", 0.1) if len(self.points) >= 3 else (None, np.inf)
+
+
+def four_fingers(cx, cy):
+    """Indicador..mínimo esticados (ponta acima da articulação), polegar dobrado."""
+    lm = np.zeros((21, 3))
+    lm[:, 0], lm[:, 1] = cx, cy + 0.1
+    lm[MCPS, 1] = cy + 0.05
+    lm[PIPS, 1] = cy
+    lm[TIPS, 1] = cy - 0.1
+    lm[TIPS[0], :2] = cx + 0.05, cy + 0.05   # polegar: ponta à direita da articulação
+    lm[PIPS[0], 0] = cx
+    return lm
+
+
+@pytest.fixture
+def controller():
+    backend = NullBackend()
+    actuator = Actuator(backend, threaded=False)
+    controller = GestureController(default_gesture_actions(actuator), backend.size(),
+                                   calibration=CalibrationMap([(0, 0, 1920, 1080)]),
+                                   trajectories=FakeTrajectories(), poses=PoseClassifier())
+    return controller, backend
+
+
+def hold_pose(controller, frames=12):
+    now = 0.0
+    for i in range(frames):
+        controller.update([four_fingers(0.3 + 0.02 * i, 0.5)], 640, 480, now)
+        now += 1 / 30
+    return now
+
+
+def hotkeys(backend):
+    return [e for e in backend.events if e[0] == "hotkey"]
+
+
+def test_trajectory_fires_when_the_pose_ends(controller):
+    controller, backend = controller
+    now = hold_pose(controller)
+    for _ in range(5):
+        controller.update([], 640, 480, now)
+        now += 1 / 30
+    assert hotkeys(backend) == [("hotkey", "win", "d")]
+
+
+def test_pause_during_trajectory_fires_nothing(controller):
+    controller, backend = controller
+    now = hold_pose(controller)
+    controller.paused = True
+    controller.update([four_fingers(0.6, 0.5)], 640, 480, now)
+    assert hotkeys(backend) == []
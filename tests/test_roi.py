@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from roi import RoiTracker
+
+
+def hand(cx, cy, size=0.1):
+    return [SimpleNamespace(x=cx + dx, y=cy + dy, z=0.0)
+            for dx, dy in np.random.default_rng(0).uniform(-size / 2, size / 2, (21, 2))]
+
+
+def inputs(tracker, frames, hands):
+    """Região (x0, y0, w, h) enviada ao detector em cada frame."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    rois = []
+    for _ in range(frames):
+        _, roi = tracker.prepare(frame)
+        rois.append(roi)
+        tracker.update(hands, 640, 480)
+    return rois
+
+
+def test_single_hand_stays_on_the_crop():
+    rois = inputs(RoiTracker(num_hands=1, search_every=5), 30, [hand(0.3, 0.5)])
+    assert rois[0] == (0, 0, 640, 480)
+    assert all(roi != (0, 0, 640, 480) for roi in rois[1:])
+
+
+def test_missing_second_hand_triggers_periodic_full_frame():
+    rois = inputs(RoiTracker(num_hands=2, search_every=5), 31, [hand(0.3, 0.5)])
+    full = [i for i, roi in enumerate(rois) if roi == (0, 0, 640, 480)]
+    assert full == [0, 5, 10, 15, 20, 25, 30]
+
+
+def test_both_hands_tracked_stop_searching():
+    tracker = RoiTracker(num_hands=2, search_every=5)
+    rois = inputs(tracker, 20, [hand(0.2, 0.5), hand(0.8, 0.5)])
+    assert all(roi != (0, 0, 640, 480) for roi in rois[1:])
+    # o recorte cobre as duas mãos
+    x0, y0, w, h = rois[-1]
+    assert x0 <= 0.15 * 640 and x0 + w >= 0.85 * 640
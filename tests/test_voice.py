@@ -0,0 +1,62 @@
+import numpy as np
+
+from voice import VOICE_BLOCK, VOICE_RATE, SPEECH_END, StubRecognizer, VoicePipeline
+
+
+def scene(bursts, seconds=8.0, rate=VOICE_RATE, seed=0):
+    """Ruído baixo + falas sintéticas (tom com sílabas) em (início, duração)."""
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0, 0.003, int(seconds * rate)).astype(np.float32)
+    for start, dur in bursts:
+        i, n = int(start * rate), int(dur * rate)
+        t = np.arange(n) / rate
+        audio[i:i + n] += (0.2 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 3 * t) > -0.8)).astype(np.float32)
+    return audio
+
+
+def blocks(audio, block=VOICE_BLOCK):
+    n = len(audio) // block
+    tail = int(SPEECH_END * VOICE_RATE / block) + 1
+    return list(audio[:n * block].reshape(n, block)) + [np.zeros(block, dtype=np.float32)] * tail
+
+
+def run(audio, on_text, texts=None):
+    states = []
+    voice = VoicePipeline(on_text, states.append, recognizer=StubRecognizer(texts=texts))
+    voice.process(blocks(audio))
+    return voice, states
+
+
+def test_each_utterance_is_recognized_once():
+    got = []
+    _, states = run(scene([(1.0, 0.8), (3.0, 1.2), (5.5, 0.5)]), got.append,
+                    texts=["abrir vscode", "abrir navegador", "fechar tudo"])
+    assert got == ["abrir vscode", "abrir navegador", "fechar tudo"]
+    assert states == ["falando", "reconhecendo", "ouvindo"] * 3
+
+
+def test_utterance_length_includes_preroll_and_hangover():
+    got = []
+    run(scene([(2.0, 1.0)]), got.append)
+    assert len(got) == 1
+    seconds = float(got[0].split()[2].rstrip("s>"))
+    assert 1.0 < seconds < 1.0 + 0.3 + SPEECH_END + 0.2
+
+
+def test_noise_only_produces_nothing():
+    got = []
+    run(scene([]), got.append)
+    assert got == []
+
+
+def test_on_text_error_does_not_stop_listening():
+    got = []
+
+    def on_text(text):
+        got.append(text)
+        if len(got) == 1:
+            raise RuntimeError("serviço fora do ar")
+
+    voice, _ = run(scene([(1.0, 0.8), (3.0, 0.8)]), on_text, texts=["um", "dois"])
+    assert got == ["um", "dois"]
+    assert isinstance(voice.error, RuntimeError)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from vshandle import (BLOCK_SIZE, CLAP_COOLDOWN, SAMPLERATE, ClapListener, ClapPatterns, OnsetDetector, replay,
+                      synthetic_scene)
+
+
+def detect(audio, rate=SAMPLERATE):
+    detector = OnsetDetector(rate)
+    n = len(audio) // BLOCK_SIZE
+    claps = []
+    for i, block in enumerate(audio[:n * BLOCK_SIZE].reshape(n, BLOCK_SIZE)):
+        clap = detector.step(block, (i + 1) * BLOCK_SIZE / rate)
+        if clap is not None:
+            claps.append(clap)
+    return np.asarray(claps)
+
+
+def test_onsets_match_synthetic_claps_and_ignore_distractions():
+    audio, truth = synthetic_scene(seconds=30.0, seed=1)
+    claps = detect(audio)
+    assert len(claps) == len(truth)
+    # onset até ~1 bloco depois do início real da palma
+    assert np.all(np.abs(claps - truth) <= 0.05 + BLOCK_SIZE / SAMPLERATE)
+
+
+def test_silence_has_no_claps():
+    rng = np.random.default_rng(0)
+    assert len(detect(rng.normal(0, 0.003, SAMPLERATE * 3).astype(np.float32))) == 0
+
+
+def test_patterns_group_by_gap():
+    patterns = ClapPatterns({1: "a", 2: "b", 3: "c"}, gap_min=0.1, gap_max=0.7)
+    assert patterns.push(1.0) is None
+    assert patterns.push(1.03) is None       # eco: mesma palma
+    assert patterns.push(1.4) is None
+    assert patterns.poll(1.9) is None        # ainda dentro de gap_max
+    assert patterns.poll(2.2) == 2
+    assert patterns.push(5.0) is None
+    assert patterns.push(5.3) is None
+    assert patterns.push(5.6) == 3           # padrão mais longo dispara sem esperar
+    assert patterns.push(8.0) is None
+    assert patterns.push(9.0) == 1           # a palma de 8.0 fechou sozinha
+
+
+def test_listener_dispatches_with_cooldown():
+    audio, truth = synthetic_scene(seconds=30.0, seed=1)
+    actions = []
+    listener = ClapListener(patterns={1: "abrir vscode", 2: "abrir navegador"}, dispatch=False,
+                            on_event=lambda kind, t, value: kind == "action" and actions.append((t, value)))
+    replay(audio, SAMPLERATE, listener)
+    assert actions
+    assert all(cmd in ("abrir vscode", "abrir navegador") for _, cmd in actions)
+    times = [t for t, _ in actions]
+    assert all(b - a >= CLAP_COOLDOWN for a, b in zip(times, times[1:]))
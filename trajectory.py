@@ -0,0 +1,288 @@
+"""
+trajectory.py - Gestos dinâmicos (swipes, círculos) por DTW 〰️
+-------------------------------------------------------------
+Enquanto a pose de trajetória está ativa (4 dedos, polegar dobrado) o
+centro da palma vai para um anel de tamanho fixo (TRAJECTORY_BUFFER).
+Ao soltar a pose, a trajetória é reamostrada (TRAJECTORY_POINTS),
+normalizada (posição e escala) e comparada aos templates com DTW:
+
+  - banda de Sakoe-Chiba (DTW_WINDOW)
+  - LB_Keogh com envelopes pré-calculados descarta templates sem rodar o DTW
+  - early abandoning: o DTW para assim que passa da melhor distância
+
+Templates padrão (sintéticos): swipe_left/right/up/down, circle_cw/ccw.
+Templates próprios vêm de gravações do recorder (main.py --record):
+  python trajectory.py add gravacao.npy --name swipe_left [--start 1.2 --end 2.0]
+  python trajectory.py list
+  python bench.py --dtw 48     # matches/s com N templates
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from config import (
+    TRAJECTORY_BUFFER, TRAJECTORY_POINTS, TRAJECTORY_MIN_FRAMES, TRAJECTORY_MIN_EXTENT,
+    DTW_WINDOW, DTW_THRESHOLD, TEMPLATES_PATH,
+)
+from features import HandFeatures, WRIST, MCPS
+
+PALM = np.r_[WRIST, MCPS[1:]]   # pulso + bases dos dedos -> centro da palma
+
+
+def palm_center(f, out=None):
+    """Centro da palma em pixels (x, y) a partir de HandFeatures já calculadas."""
+    return np.mean(f.pts[PALM, :2], axis=0, out=out)
+
+
+class TrajectoryBuffer:
+    """Anel pré-alocado de pontos (x, y); `push` não aloca."""
+
+    def __init__(self, size=TRAJECTORY_BUFFER):
+        self.data = np.zeros((size, 2), dtype=np.float64)
+        self.size = size
+        self.head = 0
+        self.count = 0
+
+    def push(self, x, y):
+        self.data[self.head] = (x, y)
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def clear(self):
+        self.head = self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def ordered(self):
+        """Pontos do mais antigo ao mais novo."""
+        if self.count < self.size:
+            return self.data[:self.count]
+        return np.roll(self.data, -self.head, axis=0)
+
+
+def normalize(points, n=TRAJECTORY_POINTS):
+    """
+    Reamostra por comprimento de arco em `n` pontos, centraliza e divide
+    pela maior extensão (mantém a proporção: swipe horizontal continua
+    horizontal). Retorna (trajetória (n, 2), extensão original).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    seg = np.hypot(*np.diff(points, axis=0).T)
+    arc = np.r_[0.0, np.cumsum(seg)]
+    if arc[-1] <= 0:
+        return np.zeros((n, 2)), 0.0
+    s = np.linspace(0.0, arc[-1], n)
+    out = np.column_stack([np.interp(s, arc, points[:, 0]), np.interp(s, arc, points[:, 1])])
+    out -= out.mean(axis=0)
+    extent = float(np.ptp(points, axis=0).max())
+    out /= max(float(np.ptp(out, axis=0).max()), 1e-9)
+    return out, extent
+
+
+def envelope(template, r):
+    """Envelope (superior, inferior) de LB_Keogh com janela r, por dimensão."""
+    padded = np.pad(template, ((r, r), (0, 0)), mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * r + 1, axis=0)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+def lb_keogh(query, upper, lower):
+    """Contribuição de cada ponto da query fora do envelope (soma = lower bound do DTW)."""
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return (above * above + below * below).sum(axis=-1)
+
+
+def dtw_distance(q, c, r, best=np.inf, lb_suffix=None):
+    """
+    DTW (custo = distância euclidiana ao quadrado, banda r). Abandona e
+    retorna inf se o custo parcial + lower bound do restante passar de `best`.
+    """
+    n = len(q)
+    cost = ((q[:, None, :] - c[None, :, :]) ** 2).sum(axis=-1).tolist()
+    inf = float("inf")
+    prev = [0.0] + [inf] * n
+    for i in range(n):
+        cur = [inf] * (n + 1)
+        row = cost[i]
+        lo, hi = max(0, i - r), min(n, i + r + 1)
+        row_min = inf
+        for j in range(lo, hi):
+            v = row[j] + min(prev[j], prev[j + 1], cur[j])
+            cur[j + 1] = v
+            if v < row_min:
+                row_min = v
+        rest = lb_suffix[i + 1] if lb_suffix is not None else 0.0
+        if row_min + rest > best:
+            return inf
+        prev = cur
+    return prev[n]
+
+
+def builtin_templates(n=TRAJECTORY_POINTS):
+    """Templates sintéticos em coordenadas de imagem (y para baixo, já espelhado)."""
+    t = np.linspace(0.0, 1.0, n)
+    zero = np.zeros(n)
+    a = np.linspace(0.0, 2 * np.pi, n)
+    raw = {
+        "swipe_right": np.column_stack([t, zero]),
+        "swipe_left": np.column_stack([-t, zero]),
+        "swipe_down": np.column_stack([zero, t]),
+        "swipe_up": np.column_stack([zero, -t]),
+        # começa em cima; com y para baixo, sen/cos assim giram no sentido horário na tela
+        "circle_cw": np.column_stack([np.sin(a), -np.cos(a)]),
+        "circle_ccw": np.column_stack([-np.sin(a), -np.cos(a)]),
+    }
+    return {name: normalize(pts, n)[0] for name, pts in raw.items()}
+
+
+class TemplateLibrary:
+    """Templates normalizados (vários por nome) com envelopes LB_Keogh pré-calculados."""
+
+    def __init__(self, points=TRAJECTORY_POINTS, window=DTW_WINDOW):
+        self.points = points
+        self.r = max(1, int(round(window * points)))
+        self.names = []
+        self.templates = []
+        self.upper = []
+        self.lower = []
+        self._stacked = None   # envelopes empilhados (K, n, 2), refeitos após `add`
+
+    def add(self, name, trajectory, normalized=False):
+        traj = np.asarray(trajectory, dtype=np.float64)
+        if not normalized:
+            traj = normalize(traj, self.points)[0]
+        u, l = envelope(traj, self.r)
+        self.names.append(name)
+        self.templates.append(traj)
+        self.upper.append(u)
+        self.lower.append(l)
+        self._stacked = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def save(self, path=TEMPLATES_PATH):
+        np.savez(path, names=np.asarray(self.names), templates=np.asarray(self.templates))
+
+    @classmethod
+    def load(cls, path=TEMPLATES_PATH, builtin=True, **kwargs):
+        """Templates do arquivo (se existir) + os sintéticos."""
+        lib = cls(**kwargs)
+        if builtin:
+            for name, traj in builtin_templates(lib.points).items():
+                lib.add(name, traj, normalized=True)
+        if path and os.path.exists(path):
+            data = np.load(path)
+            for name, traj in zip(data["names"], data["templates"]):
+                lib.add(str(name), traj, normalized=True)
+        return lib
+
+    def match(self, query, threshold=DTW_THRESHOLD):
+        """
+        Melhor template para a query normalizada. Retorna (nome, distância
+        RMS, estatísticas) ou (None, inf, estatísticas).
+        """
+        n = len(query)
+        best = threshold * threshold * n   # custo total máximo aceito
+        best_i = None
+        stats = {"pruned": 0, "abandoned": 0, "full": 0}
+        if not self.names:
+            return None, np.inf, stats
+        if self._stacked is None:
+            self._stacked = (np.asarray(self.upper), np.asarray(self.lower))
+        # LB_Keogh de todos os templates numa operação; mais promissores primeiro (best cai rápido)
+        lbs = lb_keogh(query, *self._stacked)             # (K, n)
+        totals = lbs.sum(axis=1)
+        suffixes = np.cumsum(lbs[:, ::-1], axis=1)[:, ::-1]
+        for i in np.argsort(totals).tolist():
+            if totals[i] > best:
+                stats["pruned"] += len(self.names) - stats["abandoned"] - stats["full"]
+                break   # ordenado: os restantes também passam de `best`
+            suffix = suffixes[i].tolist() + [0.0]
+            d = dtw_distance(query, self.templates[i], self.r, best, suffix)
+            if d == np.inf:
+                stats["abandoned"] += 1
+                continue
+            stats["full"] += 1
+            if d <= best:
+                best, best_i = d, i
+        if best_i is None:
+            return None, np.inf, stats
+        return self.names[best_i], float(np.sqrt(best / n)), stats
+
+
+class TrajectoryRecognizer:
+    """Anel de posições + biblioteca de templates."""
+
+    def __init__(self, library=None, size=TRAJECTORY_BUFFER, threshold=DTW_THRESHOLD,
+                 min_frames=TRAJECTORY_MIN_FRAMES, min_extent=TRAJECTORY_MIN_EXTENT):
+        self.library = TemplateLibrary.load() if library is None else library
+        self.buffer = TrajectoryBuffer(size)
+        self.threshold = threshold
+        self.min_frames = min_frames
+        self.min_extent = min_extent
+
+    def reset(self):
+        self.buffer.clear()
+
+    def push(self, x, y):
+        self.buffer.push(x, y)
+
+    def match(self):
+        """Classifica a trajetória acumulada. Retorna (nome, distância) ou (None, inf)."""
+        if len(self.buffer) < self.min_frames:
+            return None, np.inf
+        query, extent = normalize(self.buffer.ordered(), self.library.points)
+        if extent < self.min_extent:
+            return None, np.inf   # mão praticamente parada
+        name, dist, _ = self.library.match(query, self.threshold)
+        return name, dist
+
+
+def trajectory_from_recording(path, start=None, end=None):
+    """Centro da palma (x, y em frações da largura do frame) de uma gravação .npy."""
+    from recorder import replay_landmarks
+
+    f = HandFeatures()
+    points = []
+    for t, w, h, hands in replay_landmarks(path):
+        if not hands or (start is not None and t < start) or (end is not None and t > end):
+            continue
+        f.compute(hands[0], w, h)
+        points.append(palm_center(f) / w)
+    return np.asarray(points)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Templates de gestos dinâmicos (DTW)")
+    parser.add_argument("--templates", default=TEMPLATES_PATH, help="arquivo de templates (.npz)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="adiciona um template a partir de uma gravação (recorder.py)")
+    add.add_argument("recording")
+    add.add_argument("--name", required=True)
+    add.add_argument("--start", type=float, help="início do trecho (timestamp da gravação)")
+    add.add_argument("--end", type=float, help="fim do trecho")
+    sub.add_parser("list", help="lista os templates")
+    args = parser.parse_args(argv)
+
+    lib = TemplateLibrary.load(args.templates, builtin=False)
+    if args.cmd == "add":
+        points = trajectory_from_recording(args.recording, args.start, args.end)
+        if len(points) < TRAJECTORY_MIN_FRAMES:
+            print(f"⚠️ Só {len(points)} frames com mão no trecho — nada gravado.")
+            return
+        lib.add(args.name, points)
+        lib.save(args.templates)
+        print(f"💾 Template '{args.name}' ({len(points)} frames) salvo em {args.templates}")
+    else:
+        builtin = builtin_templates(lib.points)
+        print(f"〰️ {len(builtin)} templates padrão: {', '.join(builtin)}")
+        print(f"📁 {len(lib)} em {args.templates}: {', '.join(lib.names) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+voice.py - Comandos de voz em segundo plano 🎙️
+----------------------------------------------
+O microfone é capturado o tempo todo enquanto a escuta está ligada: o
+callback de áudio só copia blocos para um anel (vshandle.AudioRing) e
+uma thread worker faz o resto:
+
+  - VAD por bloco (webrtcvad se instalado; senão energia com piso de
+    ruído adaptativo) corta as falas, com pré-roll e tolerância a pausas;
+  - cada fala é enviada em pedaços ao reconhecedor enquanto acontece
+    (backends com streaming, como o Vosk, já vão decodificando);
+  - o texto final vai para `on_text` — na GUI, run_command do serviço de
+    lançamento — sem passar pela thread da interface.
+
+Backends (VOICE_BACKEND): "vosk" (offline, VOICE_MODEL_PATH), "google"
+(speech_recognition, online) e "stub" (testes). "auto" usa o Vosk se o
+pacote e o modelo existirem, senão o Google. Os pacotes só são
+importados quando o backend é criado.
+
+  python voice.py                                   # microfone, imprime o texto
+  python voice.py --wav fala.wav --backend stub     # segmentação sobre um WAV
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from vshandle import AudioRing, read_wav
+
+# === CONFIGURAÇÕES ===
+VOICE_BACKEND = "auto"         # auto | vosk | google | stub
+VOICE_MODEL_PATH = "vosk-model-small-pt-0.3"   # pasta do modelo Vosk
+VOICE_LANGUAGE = "pt-BR"
+VOICE_RATE = 16000             # Hz (o que os reconhecedores esperam)
+VOICE_BLOCK = 480              # amostras por bloco (30 ms, tamanho aceito pelo webrtcvad)
+VOICE_RING_BLOCKS = 256        # ~7.7 s de folga entre callback e worker
+VAD_AGGRESSIVENESS = 2         # webrtcvad: 0 (permissivo) .. 3 (rigoroso)
+VAD_ENERGY_RATIO = 3.0         # VAD de energia: fala = RMS > piso de ruído * razão
+VAD_MIN_RMS = 0.01             # ... e acima deste mínimo absoluto
+SPEECH_START = 0.09            # segundos de fala seguidos para abrir uma fala
+SPEECH_END = 0.6               # segundos de silêncio para fechar a fala
+SPEECH_PREROLL = 0.3           # segundos antes do início incluídos na fala
+SPEECH_MAX = 10.0              # fala mais longa que isso é fechada à força
+
+
+def to_pcm16(audio):
+    """float32 -1..1 -> bytes PCM 16 bits (formato dos reconhecedores)."""
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+# === VAD ===
+class EnergyVAD:
+    """Fala = energia acima do piso de ruído (média lenta dos blocos sem fala)."""
+
+    def __init__(self, ratio=VAD_ENERGY_RATIO, min_rms=VAD_MIN_RMS):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.floor = min_rms / ratio
+
+    def __call__(self, block):
+        rms = float(np.sqrt(np.dot(block, block) / len(block)))
+        speech = rms > max(self.floor * self.ratio, self.min_rms)
+        if not speech:
+            self.floor += 0.05 * (rms - self.floor)
+        return speech
+
+
+class WebRtcVAD:
+    def __init__(self, rate=VOICE_RATE, aggressiveness=VAD_AGGRESSIVENESS):
+        import webrtcvad
+
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self.rate = rate
+
+    def __call__(self, block):
+        return self.vad.is_speech(to_pcm16(block), self.rate)
+
+
+def create_vad(rate=VOICE_RATE):
+    try:
+        return WebRtcVAD(rate)
+    except ImportError:
+        return EnergyVAD()
+
+
+# === RECONHECEDORES ===
+class Recognizer:
+    """
+    Interface: `start()` no início da fala, `feed(pcm16)` a cada pedaço,
+    `finish()` -> texto ("" se nada reconhecido). O padrão junta os
+    pedaços e chama `recognize` uma vez no fim.
+    """
+
+    def __init__(self, rate=VOICE_RATE):
+        self.rate = rate
+        self._chunks = []
+
+    def start(self):
+        self._chunks = []
+
+    def feed(self, pcm):
+        self._chunks.append(pcm)
+
+    def finish(self):
+        return self.recognize(b"".join(self._chunks))
+
+    def recognize(self, pcm):
+        raise NotImplementedError
+
+
+class VoskRecognizer(Recognizer):
+    """Offline, com streaming: decodifica enquanto a pessoa fala."""
+
+    def __init__(self, rate=VOICE_RATE, model_path=VOICE_MODEL_PATH):
+        super().__init__(rate)
+        from vosk import KaldiRecognizer, Model
+
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Modelo Vosk não encontrado em {model_path}")
+        self._model = Model(model_path)
+        self._factory = KaldiRecognizer
+        self._rec = None
+
+    def start(self):
+        self._rec = self._factory(self._model, self.rate)
+
+    def feed(self, pcm):
+        self._rec.AcceptWaveform(pcm)
+
+    def finish(self):
+        return json.loads(self._rec.FinalResult()).get("text", "")
+
+
+class GoogleRecognizer(Recognizer):
+    """speech_recognition + API do Google (online), como a versão anterior da GUI."""
+
+    def __init__(self, rate=VOICE_RATE, language=VOICE_LANGUAGE):
+        super().__init__(rate)
+        import speech_recognition as sr
+
+        self.sr = sr
+        self.language = language
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, pcm):
+        audio = self.sr.AudioData(pcm, self.rate, 2)
+        try:
+            return self._recognizer.recognize_google(audio, language=self.language)
+        except self.sr.UnknownValueError:
+            return ""
+
+
+class StubRecognizer(Recognizer):
+    """Para testes: devolve os textos dados, em ordem (ou a duração da fala)."""
+
+    def __init__(self, rate=VOICE_RATE, texts=None):
+        super().__init__(rate)
+        self.texts = list(texts or [])
+
+    def recognize(self, pcm):
+        if self.texts:
+            return self.texts.pop(0)
+        return f"<fala de {len(pcm) / 2 / self.rate:.2f}s>"
+
+
+RECOGNIZERS = {"vosk": VoskRecognizer, "google": GoogleRecognizer, "stub": StubRecognizer}
+
+
+def create_recognizer(name=VOICE_BACKEND, rate=VOICE_RATE, **kwargs):
+    if name == "auto":
+        try:
+            return VoskRecognizer(rate, **kwargs)
+        except (ImportError, FileNotFoundError):
+            return GoogleRecognizer(rate)
+    if name not in RECOGNIZERS:
+        raise ValueError(f"Backend de voz inválido: {name} (use auto, {', '.join(RECOGNIZERS)})")
+    return RECOGNIZERS[name](rate, **kwargs)
+
+
+# === SEGMENTAÇÃO ===
+class Segmenter:
+    """
+    Blocos + decisão do VAD -> eventos ("start" | "audio" | "end", pcm).
+    A fala começa após SPEECH_START s de fala (o pré-roll entra junto) e
+    termina após SPEECH_END s de silêncio ou SPEECH_MAX s.
+    """
+
+    def __init__(self, vad, rate=VOICE_RATE, block=VOICE_BLOCK):
+        block_s = block / rate
+        self.vad = vad
+        self.start_blocks = max(1, int(round(SPEECH_START / block_s)))
+        self.end_blocks = max(1, int(round(SPEECH_END / block_s)))
+        self.max_blocks = int(SPEECH_MAX / block_s)
+        self.preroll = []
+        self.preroll_blocks = int(SPEECH_PREROLL / block_s) + self.start_blocks
+        self.active = False
+        self.voiced = 0
+        self.silent = 0
+        self.length = 0
+
+    def push(self, block):
+        speech = self.vad(block)
+        pcm = to_pcm16(block)
+        events = []
+        if not self.active:
+            self.preroll.append(pcm)
+            del self.preroll[:-self.preroll_blocks]
+            self.voiced = self.voiced + 1 if speech else 0
+            if self.voiced >= self.start_blocks:
+                self.active, self.silent, self.length = True, 0, len(self.preroll)
+                events.append(("start", b""))
+                events.append(("audio", b"".join(self.preroll)))
+                self.preroll = []
+            return events
+        events.append(("audio", pcm))
+        self.length += 1
+        self.silent = 0 if speech else self.silent + 1
+        if self.silent >= self.end_blocks or self.length >= self.max_blocks:
+            self.active, self.voiced = False, 0
+            events.append(("end", b""))
+        return events
+
+
+# === PIPELINE ===
+class VoicePipeline:
+    """
+    Captura contínua + VAD + reconhecedor numa thread. `on_text(texto)` e
+    `on_state(estado)` ("ouvindo" | "falando" | "reconhecendo" | "parado")
+    são chamados na thread worker — quem atualiza UI não bloqueia nada.
+    """
+
+    def __init__(self, on_text, on_state=None, backend=VOICE_BACKEND, rate=VOICE_RATE, block=VOICE_BLOCK,
+                 recognizer=None):
+        self.on_text = on_text
+        self.on_state = on_state
+        self.backend = backend
+        self.rate = rate
+        self.block = block
+        self.recognizer = recognizer
+        self.ring = AudioRing(VOICE_RING_BLOCKS, block)
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            # anel novo: blocos da sessão anterior não voltam para o VAD
+            self.ring = AudioRing(VOICE_RING_BLOCKS, self.block)
+            self._thread = threading.Thread(target=self._run, name="voice", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join(2.0)
+
+    def _state(self, state):
+        if self.on_state is not None:
+            self.on_state(state)
+
+    def _run(self):
+        try:
+            import sounddevice as sd
+
+            # reconhecedor criado na thread: importar/carregar modelo não trava a GUI
+            if self.recognizer is None:
+                self.recognizer = create_recognizer(self.backend, self.rate)
+            ring = self.ring
+
+            def callback(indata, frames, time_info, status):
+                if status:
+                    ring.status_errors += 1
+                ring.write(indata, ring.written * self.block / self.rate)
+
+            with sd.InputStream(callback=callback, channels=1, samplerate=self.rate,
+                                blocksize=self.block, dtype="float32"):
+                self._state("ouvindo")
+                self.process(self._blocks())
+        except Exception as e:
+            self.error = e
+        finally:
+            self._state("parado")
+
+    def _blocks(self):
+        nap = self.block / self.rate / 2
+        while not self._stop.is_set():
+            if not self.ring.pending():
+                time.sleep(nap)
+                continue
+            yield self.ring.pop()[0]
+
+    def process(self, blocks):
+        """Consome blocos float32 (microfone ou arquivo) até acabarem."""
+        segmenter = Segmenter(create_vad(self.rate), self.rate, self.block)
+        rec = self.recognizer
+        for block in blocks:
+            for kind, pcm in segmenter.push(block):
+                if kind == "start":
+                    rec.start()
+                    self._state("falando")
+                elif kind == "audio":
+                    rec.feed(pcm)
+                else:
+                    self._state("reconhecendo")
+                    try:
+                        text = rec.finish().strip()
+                    except Exception as e:
+                        # rede/serviço fora do ar: perde esta fala, a escuta continua
+                        text = ""
+                        self.error = e
+                    if text:
+                        try:
+                            self.on_text(text)
+                        except Exception as e:
+                            # comando com erro: registra e continua escutando
+                            self.error = e
+                    self._state("ouvindo")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comandos de voz em segundo plano")
+    parser.add_argument("--backend", default=VOICE_BACKEND, choices=["auto"] + list(RECOGNIZERS))
+    parser.add_argument("--wav", help="processa um WAV (16 kHz) em vez do microfone")
+    args = parser.parse_args(argv)
+
+    def on_text(text):
+        print(f"🎧 {text}")
+
+    if args.wav:
+        audio, rate = read_wav(args.wav)
+        voice = VoicePipeline(on_text, backend=args.backend, rate=rate,
+                              recognizer=create_recognizer(args.backend, rate))
+        n = len(audio) // voice.block
+        # silêncio no fim fecha uma fala que termine junto com o arquivo
+        tail = int(SPEECH_END * rate / voice.block) + 1
+        voice.process(list(audio[:n * voice.block].reshape(n, voice.block))
+                      + [np.zeros(voice.block, dtype=np.float32)] * tail)
+        return
+    voice = VoicePipeline(on_text, on_state=lambda s: print(f"   [{s}]"), backend=args.backend).start()
+    try:
+        while voice.running:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        voice.stop()
+    if voice.error is not None:
+        print(f"❌ Erro: {voice.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,476 @@
 """
 clap_to_vscode.py - Assistente invisível de palmas 👏
 ----------------------------------------------------
-Abre o Visual Studio Code quando detectar uma palma.
-Roda em background, com logs leves e controle anti-duplicação.
+Abre o Visual Studio Code quando detectar uma palma (padrões com mais
+palmas, ex. duas seguidas, vão em CLAP_PATTERNS). Roda em background,
+com logs leves e controle anti-duplicação.
+As ações vão para o serviço de lançamento compartilhado (commands.py).
+
+O callback de áudio (thread de tempo real) só copia o bloco para um anel
+pré-alocado e avança um contador: sem alocar, sem locks, sem arquivo e
+sem subprocess. Uma thread worker lê o anel e faz a detecção:
+
+  - onset por fluxo espectral (aumento do espectro log entre blocos) com
+    limiar adaptativo (mediana recente * ONSET_MULT + ONSET_DELTA);
+  - confirmação de palma: energia acima de CLAP_MIN_RMS, fração de agudos
+    (CLAP_HF_RATIO) e queda rápida da energia (CLAP_DECAY_*) — fala,
+    música e ruído contínuo não decaem;
+  - padrões (CLAP_PATTERNS): n palmas com intervalo entre CLAP_GAP_MIN e
+    CLAP_GAP_MAX disparam a ação, numa thread separada.
+
+  python vshandle.py                          # microfone
+  python vshandle.py --replay gravacao.wav    # mesmo detector sobre um WAV
+  python vshandle.py --bench [--labels t.txt] # acurácia e latência (sintético ou WAV)
 """
 
-import sounddevice as sd
-import numpy as np
-import time
-import subprocess
+import argparse
 import os
-import psutil
+import tempfile
+import threading
+import time
+import wave
 from datetime import datetime
 
+import numpy as np
+
 # === CONFIGURAÇÕES ===
-CLAP_THRESHOLD = 0.28
-CLAP_COOLDOWN = 2.5
+CLAP_COOLDOWN = 2.5      # segundos entre duas ações
 SAMPLERATE = 44100
-CHUNK_DURATION = 0.1
-
-LOG_PATH = os.path.join(os.getenv("TEMP"), "clap_to_vscode_log.txt")
-VSCODE_PATHS = [
-    r"C:\Users\dippf\AppData\Local\Programs\Microsoft VS Code\Code.exe",
-    r"C:\Program Files\Microsoft VS Code\Code.exe",
-]
-
-# === EVITAR DUPLICAÇÃO ===
-for proc in psutil.process_iter(attrs=["pid", "cmdline"]):
-    cmdline = " ".join(proc.info.get("cmdline") or [])
-    if "clap_to_vscode" in cmdline and proc.pid != os.getpid():
-        print("⚠️ Já existe uma instância rodando.")
-        exit(0)
+BLOCK_SIZE = 512         # amostras por callback (~11.6 ms)
+RING_BLOCKS = 64         # blocos no anel callback -> worker (~0.74 s)
+ONSET_HISTORY = 0.5      # segundos de fluxo usados no limiar adaptativo
+ONSET_MULT = 3.0         # limiar = mediana do fluxo recente * ONSET_MULT + ONSET_DELTA
+ONSET_DELTA = 0.02
+CLAP_MIN_RMS = 0.02      # energia mínima do bloco da palma (áudio em -1..1)
+CLAP_HF_CUTOFF = 2000    # Hz - "agudos" para a fração abaixo
+CLAP_HF_RATIO = 0.3      # fração mínima da magnitude acima de CLAP_HF_CUTOFF
+CLAP_DECAY_TIME = 0.07   # segundos após o pico para conferir a queda
+CLAP_DECAY_RATIO = 0.4   # energia nesse ponto < pico * CLAP_DECAY_RATIO
+CLAP_GAP_MIN = 0.1       # intervalo mínimo entre palmas de um padrão (s)
+CLAP_GAP_MAX = 0.7       # intervalo máximo; depois disso o padrão termina
+CLAP_PATTERNS = {1: "abrir vscode"}  # nº de palmas -> comando (commands.py), ex.: {1: ..., 2: "abrir navegador"}
+
+LOG_PATH = os.path.join(os.getenv("TEMP") or tempfile.gettempdir(), "clap_to_vscode_log.txt")
+
 
 # === LOG ===
 def log(msg: str):
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(f"[{datetime.now():%H:%M:%S}] {msg}\n")
 
-log("🟢 Clap listener iniciado.")
 
-last_clap_time = 0
+def run_command(command):
+    """Envia o comando ao serviço de lançamento (hospeda-o se ninguém hospeda)."""
+    from commands import run_command as launcher
+
+    log(f"🚀 {launcher(command)}")
 
 
-def abrir_vscode():
-    """Tenta abrir o VSCode."""
-    for caminho in VSCODE_PATHS:
-        if os.path.exists(caminho):
-            subprocess.Popen([caminho])
-            log("🚀 VS Code aberto com sucesso.")
+# === ANEL CALLBACK -> WORKER ===
+class AudioRing:
+    """
+    Anel de blocos pré-alocado, um produtor (callback) e um consumidor
+    (worker). O produtor escreve o bloco e só depois avança `written`;
+    o consumidor só lê até `written`. Sem locks: cada contador tem um
+    único escritor (callback: written, bad_blocks, status_errors;
+    worker: read, overruns).
+    """
+
+    def __init__(self, blocks=RING_BLOCKS, block_size=BLOCK_SIZE):
+        self.data = np.zeros((blocks, block_size), dtype=np.float32)
+        self.times = np.zeros(blocks, dtype=np.float64)
+        self.blocks = blocks
+        self.block_size = block_size
+        self.written = 0
+        self.read = 0
+        self.overruns = 0       # blocos sobrescritos antes do worker ler
+        self.bad_blocks = 0     # blocos de tamanho inesperado (descartados no callback)
+        self.status_errors = 0  # flags de overflow/underflow do stream
+
+    def write(self, indata, t):
+        """Chamado no callback: cópia para memória já alocada e um incremento."""
+        i = self.written % self.blocks
+        if len(indata) != self.block_size:
+            self.bad_blocks += 1
             return
-    log("❌ VSCode não encontrado.")
+        np.copyto(self.data[i], indata[:, 0])
+        self.times[i] = t
+        self.written += 1
 
+    def pending(self):
+        """Blocos disponíveis ao worker (descarta os já sobrescritos)."""
+        behind = self.written - self.read
+        if behind > self.blocks:
+            self.overruns += behind - self.blocks
+            self.read = self.written - self.blocks
+        return self.written - self.read
 
-def callback(indata, frames, time_, status):
-    """Callback de áudio — detecta palmas."""
-    global last_clap_time
-    volume = np.linalg.norm(indata)
-    agora = time.time()
+    def pop(self):
+        """(bloco, t) mais antigo ainda não lido. O bloco é uma view do anel."""
+        i = self.read % self.blocks
+        self.read += 1
+        return self.data[i], self.times[i]
 
-    if volume > CLAP_THRESHOLD and (agora - last_clap_time) > CLAP_COOLDOWN:
-        last_clap_time = agora
-        log(f"👏 Palma detectada! Volume={volume:.3f}")
-        abrir_vscode()
 
+# === DETECÇÃO ===
+class OnsetDetector:
+    """
+    Fluxo espectral sobre janelas de 2 blocos (salto de 1 bloco) com
+    limiar adaptativo; cada onset candidato vira palma se a energia cair
+    rápido depois do pico. `step(bloco, t)` -> instante da palma ou None.
+    """
 
-def main():
-    log("🎧 Escutando microfone...")
+    def __init__(self, samplerate=SAMPLERATE, block_size=BLOCK_SIZE):
+        n = 2 * block_size
+        self.block_size = block_size
+        self.block_s = block_size / samplerate
+        self.window = np.hanning(n).astype(np.float32)
+        self.frame = np.zeros(n, dtype=np.float32)
+        self.hf_bin = int(CLAP_HF_CUTOFF * n / samplerate)
+        self.prev_log = np.zeros(n // 2 + 1, dtype=np.float32)
+        self.history = np.zeros(max(3, int(ONSET_HISTORY / self.block_s)), dtype=np.float32)
+        self.decay_blocks = max(1, int(round(CLAP_DECAY_TIME / self.block_s)))
+        self.refractory = CLAP_GAP_MIN / 2
+        self.blocks = 0
+        self.last_onset = -np.inf
+        self.candidate = None    # [t, energia de pico, blocos desde o pico]
+        self.flux = 0.0
+
+    def step(self, block, t):
+        # janela = bloco anterior + bloco atual (sem alocar: desloca no buffer)
+        bs = self.block_size
+        self.frame[:bs] = self.frame[bs:]
+        self.frame[bs:] = block
+        spec = np.abs(np.fft.rfft(self.frame * self.window))
+        log_spec = np.log1p(100.0 * spec)
+        flux = float(np.maximum(log_spec - self.prev_log, 0.0).mean())
+        self.prev_log = log_spec
+        rms = float(np.sqrt(np.dot(block, block) / bs))
+
+        threshold = float(np.median(self.history)) * ONSET_MULT + ONSET_DELTA
+        self.history[self.blocks % len(self.history)] = flux
+        self.blocks += 1
+        self.flux = flux
+
+        clap = None
+        if self.candidate is not None:
+            c = self.candidate
+            if rms > c[1]:
+                c[1] = rms            # ainda subindo: o pico é este bloco
+                c[2] = 0
+            else:
+                c[2] += 1
+                if c[2] >= self.decay_blocks:
+                    if rms < c[1] * CLAP_DECAY_RATIO:
+                        clap = c[0]
+                    self.candidate = None
+
+        if (self.candidate is None and flux > threshold and rms > CLAP_MIN_RMS
+                and t - self.last_onset > self.refractory):
+            total = float(spec.sum())
+            if total > 0 and float(spec[self.hf_bin:].sum()) / total >= CLAP_HF_RATIO:
+                self.last_onset = t
+                self.candidate = [t, rms, 0]
+        return clap
+
+
+class ClapPatterns:
+    """Agrupa palmas em padrões; `push(t)`/`poll(t)` -> nº de palmas do padrão concluído ou None."""
+
+    def __init__(self, patterns=CLAP_PATTERNS, gap_min=CLAP_GAP_MIN, gap_max=CLAP_GAP_MAX):
+        self.longest = max(patterns)
+        self.gap_min = gap_min
+        self.gap_max = gap_max
+        self.count = 0
+        self.last = -np.inf
+
+    def push(self, t):
+        gap = t - self.last
+        if gap < self.gap_min:
+            return None               # eco / mesma palma
+        done = self.poll(t)
+        self.count, self.last = self.count + 1, t
+        if self.count >= self.longest:
+            # padrão mais longo: dispara já, sem esperar CLAP_GAP_MAX
+            n, self.count = self.count, 0
+            return n
+        return done
+
+    def poll(self, now):
+        """Fecha o padrão em andamento se passou CLAP_GAP_MAX sem palma."""
+        if self.count and now - self.last > self.gap_max:
+            n, self.count = self.count, 0
+            return n
+        return None
+
+
+class ClapListener:
+    """Detector + padrões + despacho das ações (com cooldown)."""
+
+    def __init__(self, samplerate=SAMPLERATE, block_size=BLOCK_SIZE, patterns=CLAP_PATTERNS,
+                 run=run_command, on_event=None, dispatch=True):
+        self.detector = OnsetDetector(samplerate, block_size)
+        self.patterns = ClapPatterns(patterns)
+        self.pattern_commands = patterns
+        self.run = run
+        self.on_event = on_event      # on_event(tipo, t, valor) -> log, replay, benchmark
+        self.dispatch = dispatch
+        self.last_action = -np.inf
+
+    def feed(self, block, t):
+        clap = self.detector.step(block, t)
+        done = None
+        if clap is not None:
+            self._emit("clap", clap, self.detector.flux)
+            done = self.patterns.push(clap)
+        if done is None:
+            done = self.patterns.poll(t)
+        if done is not None:
+            self._pattern(done, t)
+
+    def _emit(self, kind, t, value):
+        if self.on_event is not None:
+            self.on_event(kind, t, value)
+
+    def _pattern(self, n, t):
+        command = self.pattern_commands.get(n)
+        self._emit("pattern", t, n)
+        if command is None or t - self.last_action < CLAP_COOLDOWN:
+            return
+        self.last_action = t
+        self._emit("action", t, command)
+        if self.dispatch:
+            # ida ao socket do serviço: fora da thread de detecção
+            threading.Thread(target=self.run, args=(command,), daemon=True).start()
+
+
+def worker(ring, listener, stop_event):
+    """Consome o anel; com o anel vazio dorme meio bloco (o callback não sinaliza nada)."""
+    nap = ring.block_size / SAMPLERATE / 2
+    while not stop_event.is_set():
+        if not ring.pending():
+            time.sleep(nap)
+            continue
+        block, t = ring.pop()
+        listener.feed(block, t)
+
+
+# === WAV ===
+def read_wav(path):
+    """WAV PCM -> (float32 mono em -1..1, taxa de amostragem)."""
+    with wave.open(path, "rb") as w:
+        rate, channels, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width in (2, 4):
+        dtype = np.int16 if width == 2 else np.int32
+        audio = np.frombuffer(raw, dtype=dtype).astype(np.float32) / np.iinfo(dtype).max
+    else:
+        raise ValueError(f"WAV de {8 * width} bits não suportado")
+    return audio.reshape(-1, channels).mean(axis=1), rate
+
+
+def replay(audio, rate, listener, block_size=BLOCK_SIZE):
+    """Alimenta o listener bloco a bloco (t = tempo do fim do bloco no arquivo)."""
+    n = len(audio) // block_size
+    blocks = audio[:n * block_size].reshape(n, block_size)
+    for i, block in enumerate(blocks):
+        listener.feed(block, (i + 1) * block_size / rate)
+    # fecha um padrão pendente no fim do arquivo
+    listener.feed(np.zeros(block_size, dtype=np.float32), n * block_size / rate + CLAP_GAP_MAX + 0.01)
+
+
+# === BENCHMARK ===
+def synthetic_scene(rate=SAMPLERATE, seconds=60.0, seed=0):
+    """
+    Áudio sintético com palmas (rajadas de ruído com decaimento rápido,
+    simples e duplas) e distrações: fala (harmônicos modulados), batidas
+    graves e ruído que liga e fica. Retorna (áudio, inícios das palmas).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate)
+    audio = rng.normal(0, 0.003, n).astype(np.float32)
+    claps = []
+
+    def clap(t0):
+        k = int(t0 * rate)
+        m = int(0.15 * rate)
+        env = np.exp(-np.arange(m) / (rate * rng.uniform(0.006, 0.015)))
+        burst = rng.normal(0, 1, m) * env * rng.uniform(0.2, 0.7)
+        # realce em 1-3 kHz (palma real não é ruído branco puro)
+        tone = np.sin(2 * np.pi * rng.uniform(1000, 2500) * np.arange(m) / rate) * env * 0.3
+        audio[k:k + m] += (burst + tone)[:n - k].astype(np.float32)
+        claps.append(t0)
+
+    def speech(t0, dur):
+        k, m = int(t0 * rate), int(dur * rate)
+        tt = np.arange(m) / rate
+        f0 = rng.uniform(100, 220)
+        voice = sum(np.sin(2 * np.pi * f0 * h * tt) / h for h in range(1, 8))
+        env = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * tt)   # sílabas
+        audio[k:k + m] += (0.15 * voice * env)[:n - k].astype(np.float32)
+
+    def thump(t0):
+        k, m = int(t0 * rate), int(0.3 * rate)
+        tt = np.arange(m) / rate
+        audio[k:k + m] += (0.6 * np.sin(2 * np.pi * 60 * tt) * np.exp(-tt / 0.05))[:n - k].astype(np.float32)
+
+    def fan(t0, dur):
+        k, m = int(t0 * rate), int(dur * rate)
+        audio[k:k + m] += rng.normal(0, 0.08, min(m, n - k)).astype(np.float32)
+
+    t = 1.0
+    while t < seconds - 3:
+        kind = rng.choice(["single", "double", "speech", "thump", "fan"])
+        if kind == "single":
+            clap(t)
+        elif kind == "double":
+            clap(t)
+            clap(t + rng.uniform(0.2, 0.5))
+        elif kind == "speech":
+            speech(t, rng.uniform(0.8, 1.6))
+        elif kind == "thump":
+            thump(t)
+        else:
+            fan(t, rng.uniform(1.0, 2.0))
+        t += rng.uniform(1.8, 2.6)
+    return np.clip(audio, -1, 1), np.asarray(claps)
+
+
+def bench(audio, rate, truth, tolerance=0.05):
+    """Precisão/recall das palmas, latência (onset real -> confirmação) e custo por bloco."""
+    n = len(audio) // BLOCK_SIZE
+    blocks = audio[:n * BLOCK_SIZE].reshape(n, BLOCK_SIZE)
+    detector = OnsetDetector(rate)
+    onsets, confirmed = [], []
+    t0 = time.perf_counter()
+    for i, block in enumerate(blocks):
+        t = (i + 1) * BLOCK_SIZE / rate   # o bloco só existe quando termina
+        clap = detector.step(block, t)
+        if clap is not None:
+            onsets.append(clap)
+            confirmed.append(t)
+    elapsed = time.perf_counter() - t0
+    onsets = np.asarray(onsets)
+
+    matched, latencies, used = 0, [], set()
+    for true_t in truth:
+        if not len(onsets):
+            break
+        j = int(np.argmin(np.abs(onsets - true_t)))
+        if j not in used and abs(onsets[j] - true_t) <= tolerance + BLOCK_SIZE / rate:
+            used.add(j)
+            matched += 1
+            latencies.append(confirmed[j] - true_t)
+    precision = matched / max(len(onsets), 1)
+    recall = matched / max(len(truth), 1)
+    lat = np.asarray(latencies) * 1000
+
+    patterns = []
+    # padrões de até 3 palmas só para contar o agrupamento (sem comandos)
+    replay(audio, rate, ClapListener(rate, patterns={1: None, 2: None, 3: None}, dispatch=False,
+                                     on_event=lambda kind, t, v: kind == "pattern" and patterns.append(v)))
+
+    print(f"👏 {len(truth)} palmas | detectadas {len(onsets)} | precisão {precision:.1%} | recall {recall:.1%}")
+    if len(lat):
+        print(f"   latência (onset -> detecção): p50 {np.percentile(lat, 50):.0f} ms"
+              f" | p95 {np.percentile(lat, 95):.0f} ms")
+    counts = {int(k): int(v) for k, v in zip(*np.unique(patterns, return_counts=True))}
+    print(f"   padrões (nº de palmas: vezes): {counts or '-'}")
+    print(f"   custo: {elapsed / n * 1e6:.0f} µs/bloco de {BLOCK_SIZE / rate * 1000:.1f} ms"
+          f" ({len(audio) / rate / elapsed:.0f}x tempo real)")
+    return precision, recall, lat
+
+
+# === MICROFONE ===
+def already_running():
+    """Outra instância deste script rodando? (psutil, se instalado)"""
     try:
-        with sd.InputStream(callback=callback, channels=1, samplerate=SAMPLERATE):
-            while True:
-                sd.sleep(int(CHUNK_DURATION * 1000))
-    except Exception as e:
-        log(f"❌ Erro: {e}")
-        time.sleep(3)
-        main()  # tenta reiniciar
+        import psutil
+    except ImportError:
+        return False
+    me = os.path.basename(__file__)
+    for proc in psutil.process_iter(attrs=["pid", "cmdline"]):
+        cmdline = " ".join(proc.info.get("cmdline") or [])
+        if (me in cmdline or "clap_to_vscode" in cmdline) and proc.pid != os.getpid():
+            return True
+    return False
+
+
+def listen():
+    import sounddevice as sd
+
+    ring = AudioRing()
+
+    def callback(indata, frames, time_info, status):
+        """Callback de áudio (tempo real): só copia para o anel."""
+        if status:
+            ring.status_errors += 1
+        # inputBufferAdcTime é 0 em várias host APIs (MME/DirectSound): o relógio é a contagem de blocos
+        ring.write(indata, ring.written * BLOCK_SIZE / SAMPLERATE)
+
+    def on_event(kind, t, value):
+        if kind == "clap":
+            log(f"👏 Palma detectada! (fluxo={value:.3f})")
+        elif kind == "action":
+            log(f"🎬 Padrão reconhecido -> {value}")
+
+    # tempos do callback vêm da contagem de amostras, o mesmo relógio usado pelos padrões
+    listener = ClapListener(on_event=on_event)
+    log("🎧 Escutando microfone...")
+    while True:
+        stop_event = threading.Event()
+        thread = threading.Thread(target=worker, args=(ring, listener, stop_event), daemon=True)
+        thread.start()
+        try:
+            with sd.InputStream(callback=callback, channels=1, samplerate=SAMPLERATE,
+                                blocksize=BLOCK_SIZE, dtype="float32"):
+                reported = (0, 0, 0)
+                while True:
+                    sd.sleep(1000)
+                    counts = (ring.overruns, ring.bad_blocks, ring.status_errors)
+                    if counts != reported:
+                        log(f"⚠️ Blocos perdidos: {counts[0]} | descartados: {counts[1]} | erros do stream: {counts[2]}")
+                        reported = counts
+        except Exception as e:
+            log(f"❌ Erro: {e}")
+            time.sleep(3)   # tenta reiniciar
+        finally:
+            stop_event.set()
+            thread.join(1.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assistente de palmas")
+    parser.add_argument("--replay", metavar="ARQUIVO.wav", help="roda o detector sobre um WAV e lista as palmas")
+    parser.add_argument("--launch", action="store_true", help="com --replay, executa as ações de verdade")
+    parser.add_argument("--bench", nargs="?", const="", metavar="ARQUIVO.wav",
+                        help="acurácia/latência: WAV com --labels, ou cena sintética")
+    parser.add_argument("--labels", help="inícios das palmas (s), um por linha, para --bench com WAV")
+    args = parser.parse_args(argv)
+
+    if args.bench is not None:
+        if args.bench:
+            audio, rate = read_wav(args.bench)
+            truth = np.loadtxt(args.labels, ndmin=1) if args.labels else np.zeros(0)
+        else:
+            rate = SAMPLERATE
+            audio, truth = synthetic_scene(rate)
+        bench(audio, rate, truth)
+        return
+    if args.replay:
+        audio, rate = read_wav(args.replay)
+        listener = ClapListener(rate, on_event=lambda kind, t, v: print(f"  {t:8.3f}s  {kind:<8} {v}"),
+                                dispatch=args.launch)
+        replay(audio, rate, listener)
+        return
+
+    if already_running():
+        print("⚠️ Já existe uma instância rodando.")
+        return
+    log("🟢 Clap listener iniciado.")
+    listen()
 
 
 if __name__ == "__main__":